@@ -1,12 +1,15 @@
 import os
 import socket
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import hou
 import sgtk
 
 import oom_sg_auth
 from oom_bootstrap import bootstrap
+from oom_houdini.oom_session import READY_ATTR
 
 print("[oom] Running Startup Script")
 
@@ -20,26 +23,10 @@ if not os.environ.get("SSL_CERT_FILE"):
 
 print(f"[oom] SHOTGUN_HOME set for {hostname}")
 
-# Get context from environment
-project_id = os.getenv("OOM_PROJECT_ID")
-shot_id = os.getenv("OOM_SHOT_ID")
-
-if not project_id or not shot_id:
-    print("[oom] Missing OOM_PROJECT_ID or OOM_SHOT_ID — skipping bootstrap.")
-else:
-    project_id = int(project_id)
-    shot_id = int(shot_id)
-
-    # Bootstrap
-    user = oom_sg_auth.oom_auth()
-    sg = user.create_sg_connection()
-    project = sg.find_one("Project", [["id", "is", project_id]], ["id"])
-    engine, tk, sg = bootstrap(project)
 
-    # set context from shot
-    context = tk.context_from_entity("Shot", shot_id)
-
-    # Query cut information from ShotGrid
+def _shot_cut_range(shot_id):
+    # Own connection: shotgun_api3 connections are not thread safe
+    sg = oom_sg_auth.oom_auth().create_sg_connection()
     shot = sg.find_one(
         "Shot",
         [["id", "is", shot_id]],
@@ -47,16 +34,75 @@ else:
     )
     cut_in = shot.get("sg_cut_in") if shot else None
     cut_out = shot.get("sg_cut_out") if shot else None
-    if cut_in is not None and cut_out is not None:
-        hou.playbar.setFrameRange(cut_in, cut_out)
-        hou.playbar.setPlaybackRange(cut_in, cut_out)
-        os.environ["CUT_IN"] = str(cut_in)
-        os.environ["CUT_OUT"] = str(cut_out)
-        print(f"[oom] Set playbar to cut range {cut_in}-{cut_out}")
-
-    # Store in Houdini session
-    hou.session.oom_engine = engine
-    hou.session.oom_context = context
-    hou.session.oom_tk = tk
-
-    print(f"[oom] Bootstrapped context for Shot ID {shot_id}")
+    if cut_in is None or cut_out is None:
+        return None
+    return cut_in, cut_out
+
+
+def _apply_cut_range(cut_in, cut_out):
+    hou.playbar.setFrameRange(cut_in, cut_out)
+    hou.playbar.setPlaybackRange(cut_in, cut_out)
+    print(f"[oom] Set playbar to cut range {cut_in}-{cut_out}")
+
+
+def _on_main_thread(fn, *args):
+    if hou.isUIAvailable():
+        import hdefereval
+
+        hdefereval.executeDeferred(lambda: fn(*args))
+    else:
+        fn(*args)
+
+
+def _bootstrap_session(project_id, shot_id, ready):
+    try:
+        # The project entity only needs type and id, and the cut range query
+        # does not depend on Toolkit, so both run alongside the bootstrap
+        project = {"type": "Project", "id": project_id}
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="oom-sg") as pool:
+            cut_future = pool.submit(_shot_cut_range, shot_id)
+            engine, tk, sg = pool.submit(bootstrap, project).result()
+            try:
+                cut_range = cut_future.result()
+            except Exception as e:
+                print(f"[oom] Failed to query cut range: {e}")
+                cut_range = None
+
+        # set context from shot
+        context = tk.context_from_entity("Shot", shot_id)
+
+        if cut_range:
+            os.environ["CUT_IN"] = str(cut_range[0])
+            os.environ["CUT_OUT"] = str(cut_range[1])
+            _on_main_thread(_apply_cut_range, *cut_range)
+
+        # Store in Houdini session
+        hou.session.oom_engine = engine
+        hou.session.oom_context = context
+        hou.session.oom_tk = tk
+
+        print(f"[oom] Bootstrapped context for Shot ID {shot_id}")
+        ready.set_result(context)
+    except Exception as e:
+        print(f"[oom] Bootstrap failed: {e}")
+        ready.set_exception(e)
+
+
+# Get context from environment
+project_id = os.getenv("OOM_PROJECT_ID")
+shot_id = os.getenv("OOM_SHOT_ID")
+
+if not project_id or not shot_id:
+    print("[oom] Missing OOM_PROJECT_ID or OOM_SHOT_ID — skipping bootstrap.")
+else:
+    # Bootstrap off the UI thread; oom_session helpers wait on this future
+    ready = Future()
+    setattr(hou.session, READY_ATTR, ready)
+    args = (int(project_id), int(shot_id), ready)
+    if hou.isUIAvailable():
+        threading.Thread(
+            target=_bootstrap_session, args=args, name="oom-bootstrap", daemon=True
+        ).start()
+        print("[oom] Bootstrapping ShotGrid in the background")
+    else:
+        _bootstrap_session(*args)
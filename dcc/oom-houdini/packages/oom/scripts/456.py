@@ -1,34 +1,100 @@
 import os
 import sys
+from concurrent.futures import TimeoutError as FutureTimeout
 from pathlib import Path
 from pprint import pformat
 
 import hou
-import sgtk
 
-from oom_bootstrap import bootstrap
+from oom_houdini.hip_snapshot import CONTEXT_PATH_ENV, apply_hip_context
+from oom_houdini.oom_session import SESSION_TIMEOUT, wait_ready
+
+# 123.py may still be bootstrapping on its thread, which can swap tk-core in
+# sys.modules; import sgtk and the bootstrap only once it has finished. This
+# runs on the UI thread, so the wait is bounded and a bootstrap that is still
+# going skips the context update instead of freezing Houdini.
+try:
+    wait_ready(SESSION_TIMEOUT)
+    BOOTSTRAP_READY = True
+except FutureTimeout:
+    BOOTSTRAP_READY = False
+
+if BOOTSTRAP_READY:
+    import sgtk
+
+    from oom_bootstrap import bootstrap
+    from oom_fs_sync import synchronize_if_changed
 
 print("[oom] Running Houdini load script")
 PROJECT_ROOT = "/mnt/RAID/Projects"
 LOCAL_STORAGE_CODE = "RAID"
 
 
+def _session_cache(name):
+    # This script runs in a fresh namespace on every load; hou.session persists
+    cache = getattr(hou.session, name, None)
+    if cache is None:
+        cache = {}
+        setattr(hou.session, name, cache)
+    return cache
+
+
+def _engine_project_id(engine):
+    if engine is None or sgtk.platform.current_engine() is not engine:
+        return None
+    try:
+        return engine.context.project["id"]
+    except Exception:
+        return None
+
+
+def _find_project(sg, project_name):
+    projects = _session_cache("oom_projects")
+    project = projects.get(project_name)
+    if project is None:
+        project = sg.find_one("Project", [["tank_name", "is", project_name]], ["id"])
+        # A miss is not cached so a project created later is still found
+        if project is not None:
+            projects[project_name] = project
+    return project
+
+
+def _cut_range(sg, shot_id):
+    """Shot cut range, looked up once per shot for the session."""
+    cut_ranges = _session_cache("oom_cut_ranges")
+    if shot_id not in cut_ranges:
+        shot = sg.find_one("Shot", [["id", "is", shot_id]], ["sg_cut_in", "sg_cut_out"])
+        cut_range = None
+        if shot and shot["sg_cut_in"] is not None and shot["sg_cut_out"] is not None:
+            cut_range = (shot["sg_cut_in"], shot["sg_cut_out"])
+        cut_ranges[shot_id] = cut_range
+    return cut_ranges[shot_id]
+
+
 def context_from_path(path, tk, engine, sg=None):
     if sg is None:
-        sg = tk.shotgun
+        if tk is not None:
+            sg = tk.shotgun
+        else:
+            import oom_sg_auth
+
+            sg = oom_sg_auth.oom_auth().create_sg_connection()
 
     project_name = Path(path).relative_to(PROJECT_ROOT).parts[0]
     print("Project_name:")
     print(project_name)
-    project = sg.find_one("Project", [["tank_name", "is", project_name]], ["id"])
+    project = _find_project(sg, project_name)
     if not project:
         raise RuntimeError(f"No SG project with tank_name='{project_name}'")
-    engine.destroy_engine()
-    sgtk.platform.engine.set_current_engine(None)
-    # sgtk.platform.current_engine().destroy()
-    # sgtk.platform.engine.set_current_engine(None)
-    engine, tk, sg = bootstrap(project)
-    tk.synchronize_filesystem_structure()
+    if _engine_project_id(engine) == project["id"]:
+        # Same project: the running engine only needs a context change
+        print(f"[oom] Reusing Toolkit engine for project {project_name}")
+    else:
+        if engine is not None:
+            engine.destroy_engine()
+            sgtk.platform.engine.set_current_engine(None)
+        engine, tk, sg = bootstrap(project)
+        synchronize_if_changed(tk, project)
     print(path)
     context = tk.context_from_path(path)
     if context.step is None or context.task is None:
@@ -84,14 +150,22 @@ try:
 
     # ── 2. Update context whenever a hip is (re)loaded ─────────────────
     hip_path = hou.hipFile.path()
-    if hip_path and os.path.exists(hip_path):
-        # bootstrap if no engine
+    context_path = os.environ.get(CONTEXT_PATH_ENV)
+    if context_path:
+        # Snapshot cook: $HIPFILE stays on the snapshot, while $HIP/$HIPNAME
+        # and the context follow the artist's file (also in work item hythons)
+        apply_hip_context(context_path)
+        hip_path = context_path
+    if not BOOTSTRAP_READY:
+        print(
+            f"[oom] ShotGrid bootstrap not ready after {SESSION_TIMEOUT:g}s — "
+            "context unchanged; reopen the hip once it finishes."
+        )
+    elif hip_path and os.path.exists(hip_path):
         if engine is None:
             print("[oom] Missing Toolkit session – bootstrapping tk‑shell")
-            # bootstrap
-            engine, tk, sg = bootstrap()
 
-        # start up new engine in current context
+        # start up (or reuse) the engine in the hip's context
         engine, tk, sg, context = context_from_path(hip_path, tk, engine)
         hou.session.oom_context = context
         hou.session.oom_tk = tk
@@ -126,17 +200,10 @@ try:
         # Pull cut‑range if present
         sg = tk.shotgun
         shot_id = context.entity.get("id") if context.entity else None
-        if shot_id:
-            shot = sg.find_one(
-                "Shot", [["id", "is", shot_id]], ["sg_cut_in", "sg_cut_out"]
-            )
-            if (
-                shot
-                and shot["sg_cut_in"] is not None
-                and shot["sg_cut_out"] is not None
-            ):
-                os.environ["CUT_IN"] = str(shot["sg_cut_in"])
-                os.environ["CUT_OUT"] = str(shot["sg_cut_out"])
+        cut_range = _cut_range(sg, shot_id) if shot_id else None
+        if cut_range:
+            os.environ["CUT_IN"] = str(cut_range[0])
+            os.environ["CUT_OUT"] = str(cut_range[1])
 
         print(f"[oom] Context updated from hip:\n  {hip_path}")
         print(f"[oom] Current step: {context.step}, task: {context.task}")
@@ -1,5 +1,6 @@
 from PySide6 import QtWidgets, QtCore
 import hou
+from oom_houdini.oom_session import session_context, session_tk
 import datetime
 
 
@@ -79,9 +80,9 @@ class OpenDialog(QtWidgets.QDialog):
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowStaysOnTopHint)
 
-        self.tk = hou.session.oom_tk
+        self.tk = session_tk()
         self.sg = self.tk.shotgun
-        self.context = hou.session.oom_context
+        self.context = session_context()
         self.project = self.context.project
         self.entity = self.context.entity
 
@@ -1,4 +1,5 @@
 import hou
+from oom_houdini.oom_session import session_context, session_tk
 from PySide6 import QtWidgets, QtCore
 from sgtk.context import Context
 import sgtk
@@ -14,9 +15,9 @@ class SaveDialog(QtWidgets.QDialog):
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowStaysOnTopHint)
 
-        self.tk = hou.session.oom_tk
+        self.tk = session_tk()
         self.sg = self.tk.shotgun
-        self.context = hou.session.oom_context
+        self.context = session_context()
         self.project = self.context.project
         self.entity = self.context.entity
 
@@ -1,11 +1,12 @@
 import hou
+from oom_houdini.oom_session import session_context, session_tk
 import os
 
 
 def sync_cut_range():
     try:
-        tk = hou.session.oom_tk
-        context = hou.session.oom_context
+        tk = session_tk()
+        context = session_context()
         sg = tk.shotgun
         entity = context.entity if context else None
         shot_id = entity.get("id") if entity else None
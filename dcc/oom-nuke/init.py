@@ -100,6 +100,7 @@ def _context_from_path(path, tk, engine, sg=None):
     import oom_sg_tk  # noqa: F401 ensures tk-core on sys.path
     import sgtk
     from oom_bootstrap import bootstrap
+    from oom_fs_sync import synchronize_if_changed
 
     if sg is None:
         sg = tk.shotgun
@@ -123,7 +124,7 @@ def _context_from_path(path, tk, engine, sg=None):
             except Exception:
                 pass
             engine, tk, sg = bootstrap(project)
-            tk.synchronize_filesystem_structure()
+            synchronize_if_changed(tk, project)
 
     # Build context directly from path
     context = tk.context_from_path(path)
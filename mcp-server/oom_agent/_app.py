@@ -50,7 +50,7 @@ Tools (14 total):
 - node_connect         — wire two nodes together
 - node_set_flags       — set display/render/bypass flags
 - cook_node            — cook a TOP/PDG node (session or agent mode)
-- farm_submit          — submit a TOP node cook to the Kubernetes farm
+- farm_submit(action)  — submit a TOP node cook to the Kubernetes farm / read its progress
 - cache(action)        — get_versions/refresh for OOM cache HDAs via ShotGrid
 - publish(action)      — list/load_latest published files for the current shot context
 - execute_code         — run arbitrary Python in the hython session
@@ -1,53 +1,168 @@
 """
-Oom context bootstrap helpers — delegates to OOM_PYTHON subprocess.
+Oom context bootstrap helpers — delegates to the OOM_PYTHON context service.
 
-Calls oom_context.main() via the python311 binary (OOM_PYTHON env var), which
-bootstraps sgtk and writes /tmp/oom.env. The MCP server process (python313)
-never imports sgtk or oom_bootstrap directly.
+Context resolution runs under the python311 binary (OOM_PYTHON env var). By
+default it goes through the resident oom_context_service, which is started
+on first use and keeps one ShotGrid connection plus the Toolkit instance of
+the most recently resolved project. A resolve for another project
+re-bootstraps Toolkit, which takes tens of seconds like a cold subprocess,
+so sessions that alternate between projects pay that on every switch
+(repeated queries are still answered from the oom_context cache). Set
+OOM_CONTEXT_SERVICE=0 to run oom_context.main() in a subprocess per call
+instead (its --json record is read from stdout). The MCP server process
+(python313) never imports sgtk or oom_bootstrap directly.
 """
 
 from __future__ import annotations
 
+import getpass
+import json
 import os
+import socket
 import subprocess
+import time
 from pathlib import Path
 from typing import Any, Optional
 
+from oom_agent.logging_config import get_logger
 
-def bootstrap_context(
+logger = get_logger(__name__)
+
+_SERVICE_START_TIMEOUT = 15.0
+
+
+def _service_enabled() -> bool:
+    value = os.environ.get("OOM_CONTEXT_SERVICE", "1").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+# Client for src/oom_context_service.py. This process cannot import it
+# (different interpreter, src/ not on the path), so the socket path,
+# liveness check, autostart and JSON-line framing below mirror that
+# module's socket_path, _socket_alive, _start_service and request. Change
+# both together; tests/test_context_service.py checks they agree.
+def _service_socket() -> Path:
+    configured = os.environ.get("OOM_CONTEXT_SERVICE_SOCKET", "").strip()
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return Path(base) / f"oom-context-{getpass.getuser()}.sock"
+
+
+def _service_alive(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+            return True
+        except OSError:
+            return False
+
+
+def _start_service(oom_python: str, oom_pythonpath: str, path: Path) -> None:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = oom_pythonpath
+    with open(path.with_suffix(".log"), "ab") as log:
+        subprocess.Popen(
+            [oom_python, "-m", "oom_context_service", "serve"],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + _SERVICE_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if _service_alive(path):
+            return
+        time.sleep(0.1)
+    raise ConnectionError(f"Context service did not start; see {path.with_suffix('.log')}")
+
+
+def _resolve_via_service(
+    oom_python: str,
+    oom_pythonpath: str,
     project_name: str,
-    sequence_name: Optional[str] = None,
-    shot_name: Optional[str] = None,
-) -> dict[str, Any]:
-    """Resolve SG/TK context via OOM_PYTHON subprocess and return runtime env metadata."""
-    oom_python = os.environ.get("OOM_PYTHON")
-    oom_pythonpath = os.environ.get("OOM_PYTHONPATH")
-    if not oom_python or not oom_pythonpath:
-        raise RuntimeError("OOM_PYTHON and OOM_PYTHONPATH must be set")
+    sequence_name: Optional[str],
+    shot_name: Optional[str],
+    timeout: float,
+) -> dict[str, str]:
+    path = _service_socket()
+    if not _service_alive(path):
+        _start_service(oom_python, oom_pythonpath, path)
+    payload = {
+        "command": "resolve",
+        "project": project_name,
+        "sequence": sequence_name if sequence_name and shot_name else None,
+        "shot": shot_name if sequence_name and shot_name else None,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        with sock.makefile("r") as replies:
+            line = replies.readline()
+    if not line:
+        raise ConnectionError("Context service closed the connection")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise RuntimeError(f"oom_context failed: {reply.get('error')}")
+    return {key: str(value) for key, value in reply["env"].items()}
 
-    # oom_context.parse_args supports 1 arg (project) or 3 args (project seq shot)
+
+def _resolve_via_subprocess(
+    oom_python: str,
+    oom_pythonpath: str,
+    project_name: str,
+    sequence_name: Optional[str],
+    shot_name: Optional[str],
+    timeout: float,
+) -> dict[str, str]:
+    # oom_context.parse_args supports 1 arg (project) or 3 args (project seq shot);
+    # --json prints the resolved record on stdout, so parallel calls share no file
     inline = "from oom_context import main; main()"
     if sequence_name and shot_name:
-        cmd = [oom_python, "-c", inline, project_name, sequence_name, shot_name]
+        cmd = [oom_python, "-c", inline, "--json", project_name, sequence_name, shot_name]
     else:
-        cmd = [oom_python, "-c", inline, project_name]
+        cmd = [oom_python, "-c", inline, "--json", project_name]
 
     env = os.environ.copy()
     env["PYTHONPATH"] = oom_pythonpath
 
-    ctx_timeout = float(os.environ.get("OOM_CONTEXT_TIMEOUT", "600"))
-    result = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=ctx_timeout)
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout)
     if result.returncode != 0:
         raise RuntimeError(f"oom_context failed: {result.stderr}")
 
-    # Parse /tmp/oom.env (lines like: export KEY="value")
-    env_vars: dict[str, str] = {}
-    env_file = Path("/tmp/oom.env")
-    if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            if line.startswith("export "):
-                key, _, value = line[7:].partition("=")
-                env_vars[key.strip()] = value.strip().strip('"')
+    try:
+        record = json.loads(result.stdout)
+    except ValueError as exc:
+        raise RuntimeError(f"oom_context returned invalid JSON: {exc}") from exc
+    return {key: str(value) for key, value in record["env"].items()}
+
+
+def bootstrap_context(
+    project_name: str,
+    sequence_name: Optional[str] = None,
+    shot_name: Optional[str] = None,
+) -> dict[str, Any]:
+    """Resolve SG/TK context via OOM_PYTHON and return runtime env metadata."""
+    oom_python = os.environ.get("OOM_PYTHON")
+    oom_pythonpath = os.environ.get("OOM_PYTHONPATH")
+    if not oom_python or not oom_pythonpath:
+        raise RuntimeError("OOM_PYTHON and OOM_PYTHONPATH must be set")
+
+    ctx_timeout = float(os.environ.get("OOM_CONTEXT_TIMEOUT", "600"))
+    args = (oom_python, oom_pythonpath, project_name, sequence_name, shot_name, ctx_timeout)
+    env_vars = None
+    if _service_enabled():
+        try:
+            env_vars = _resolve_via_service(*args)
+        except TimeoutError:
+            raise
+        except (OSError, ValueError) as exc:
+            # Service unreachable or crashed mid-request: fall back to a subprocess
+            logger.warning("Context service unavailable (%s); using subprocess", exc)
+    if env_vars is None:
+        env_vars = _resolve_via_subprocess(*args)
 
     paths: dict[str, str] = {}
     if "OOM_PROJECT_PATH" in env_vars:
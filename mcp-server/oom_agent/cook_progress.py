@@ -0,0 +1,72 @@
+"""
+Reader for the live progress files of headless PDG cooks.
+
+The controller publishes ``$HIP/pdgtemp_<cook_id>/progress.json`` while it
+cooks (src/oom_houdini/cook_progress.py). This process cannot import that
+module (src/ is not on the MCP server's path), so read_progress and
+format_progress below mirror it. Change both together;
+tests/test_cook_progress_reader.py checks they agree.
+
+Only progress files inside a ``pdgtemp_*`` cook directory are read, so the
+``farm_submit`` tool cannot be pointed at other files.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+
+PROGRESS_FILE = "progress.json"
+COOK_DIR_PREFIX = "pdgtemp_"
+
+
+def progress_file(path: str) -> Path:
+    """Resolve ``path`` (a progress file or its cook directory).
+
+    Raises ValueError unless it names ``pdgtemp_<cook_id>/progress.json``.
+    """
+    target = Path(path).expanduser()
+    if target.name != PROGRESS_FILE:
+        target = target / PROGRESS_FILE
+    # Resolve links and ".." before checking where the file really is
+    target = target.resolve()
+    cook_dir = target.parent.name
+    if (
+        target.name != PROGRESS_FILE
+        or not cook_dir.startswith(COOK_DIR_PREFIX)
+        or cook_dir == COOK_DIR_PREFIX
+    ):
+        raise ValueError(f"Not a cook progress file: {path}")
+    return target
+
+
+def read_progress(path: Path) -> Optional[dict]:
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _format_eta(seconds) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def format_progress(data: Optional[dict]) -> str:
+    if not data:
+        return "no progress published yet"
+    return (
+        f"{data.get('state', '?')}: {data.get('cooked', 0)}/{data.get('generated', 0)}"
+        f" cooked, {data.get('scheduled', 0)} scheduled,"
+        f" {data.get('failed', 0)} failed, eta {_format_eta(data.get('eta'))}"
+    )
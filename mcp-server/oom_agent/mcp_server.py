@@ -19,6 +19,7 @@ import oom_agent.tools.session  # noqa: F401
 import oom_agent.tools.scene  # noqa: F401
 import oom_agent.tools.nodes  # noqa: F401
 import oom_agent.tools.pipeline  # noqa: F401
+from oom_agent.tools.scene import list_scene_files
 
 
 # ============================================================================
@@ -126,14 +127,8 @@ async def list_scenes(project: str, sequence: str, shot: str) -> str:
         if not shot_path:
             return json.dumps({"error": "Could not resolve shot path"})
 
-        shot_root = Path(shot_path)
-        tasks_root = shot_root / "tasks"
-
-        scenes = []
-        for extension in ("*.hip", "*.hiplc", "*.hipnc"):
-            for hip_file in tasks_root.glob(f"*/houdini/{extension}"):
-                if hip_file.is_file():
-                    scenes.append(str(hip_file))
+        scene_files = await asyncio.to_thread(list_scene_files, Path(shot_path))
+        scenes = [item["path"] for item in scene_files]
 
         truncated = len(scenes) > _LIST_SCENES_LIMIT
         if truncated:
@@ -3,8 +3,10 @@
 These tools run pipeline code *inside* Houdini (via ``manager.execute()``)
 because they import ``oom_houdini`` modules that depend on ``hou``.
 
-The one exception is ``farm_submit``: ``submit_controller_job`` does not
+The one exception is ``farm_submit``: ``submit_controller`` does not
 import ``hou`` and runs fine in the MCP server's Python 3.13 environment.
+Its progress action reads cook progress files through
+``oom_agent.cook_progress``.
 """
 
 from __future__ import annotations
@@ -14,6 +16,7 @@ import time
 from typing import Any
 
 from oom_agent._app import mcp
+from oom_agent.cook_progress import format_progress, progress_file, read_progress
 from oom_agent.guardrails import log_error, log_success
 from oom_agent.logging_config import get_logger
 from oom_agent.tools._helpers import parse_remote_json, remote_exec, require_session
@@ -84,37 +87,78 @@ print(json.dumps({{"cook_result": "started"}}))
 
 @mcp.tool()
 async def farm_submit(
-    hip_path: str,
-    node_path: str,
+    hip_path: str = "",
+    node_path: str = "",
     gpu: bool = False,
+    action: str = "submit",
+    progress_path: str | None = None,
 ) -> dict[str, Any]:
     """
     Submit a TOP node cook to the farm via a Kubernetes controller job.
 
     Args:
-        hip_path: Absolute path to the HIP file
+        hip_path: Absolute path to the HIP file (required for submit)
         node_path: TOP node path to cook (e.g. "/obj/topnet1/cook_geo")
         gpu: Deprecated — service jobs do not request GPUs; always ignored
+        action: "submit" — submit the cook (default);
+                "progress" — read live progress of a submitted cook
+                    (requires progress_path)
+        progress_path: progress_path returned by a previous submit; only
+            pdgtemp_<cook_id>/progress.json files are read
 
     Returns:
-        success, job_name, and status message
+        For submit: success, message, cook_id and progress_path
+        For progress: state, generated/scheduled/cooked/failed counts, eta
+            (seconds) and a one-line summary
     """
     _ = gpu  # service jobs do not support GPU; accepted for API compat
+    if action == "progress":
+        if not progress_path:
+            return {
+                "success": False,
+                "error": "progress_path is required for action='progress'",
+            }
+        try:
+            target = progress_file(progress_path)
+        except ValueError as exc:
+            return {"success": False, "error": str(exc)}
+        data = read_progress(target)
+        if data is None:
+            return {
+                "success": True,
+                "state": "pending",
+                "summary": format_progress(None),
+            }
+        return {"success": True, **data, "summary": format_progress(data)}
+
+    if action != "submit":
+        return {
+            "success": False,
+            "error": f"Unknown action: {action!r}; use 'submit' or 'progress'",
+        }
+
     ok, err = require_session()
     if not ok:
         return err  # type: ignore[return-value]
 
     try:
-        from oom_houdini.submit_pdg_cook import submit_controller_job
+        from oom_houdini.submit_pdg_cook import submit_controller
     except ImportError as exc:
         return {"success": False, "error": f"submit_pdg_cook not available: {exc}"}
 
     try:
-        success, message = submit_controller_job(hip_path, node_path)
-        return {
-            "success": bool(success),
-            "message": str(message),
+        result = submit_controller(hip_path, node_path)
+        response: dict[str, Any] = {
+            "success": bool(result["ok"]),
+            "message": str(result["message"]),
         }
+        # Duplicate submissions point at the cook already running, which
+        # has no progress file of ours to poll
+        if result.get("progress_path"):
+            response.update(
+                cook_id=result["cook_id"], progress_path=result["progress_path"]
+            )
+        return response
     except Exception as exc:
         return {"success": False, "error": str(exc)}
 
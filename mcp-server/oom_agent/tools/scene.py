@@ -110,6 +110,30 @@ def _scene_info() -> dict[str, Any]:
     }
 
 
+def list_scene_files(shot_root: Path) -> list[dict[str, Any]]:
+    """Hip files in ``<shot>/tasks/*/houdini`` with their current size and mtime.
+
+    oom_houdini.hip_index is not importable here (src/ is not on the MCP
+    server's path), and callers sort on mtime, so every file is stat'ed.
+    """
+    scene_files = []
+    for extension in ("*.hip", "*.hiplc", "*.hipnc"):
+        for hip_file in (shot_root / "tasks").glob(f"*/houdini/{extension}"):
+            if not hip_file.is_file():
+                continue
+            stat = hip_file.stat()
+            scene_files.append(
+                {
+                    "path": str(hip_file),
+                    "name": hip_file.name,
+                    "step": hip_file.parent.parent.name,
+                    "size_bytes": stat.st_size,
+                    "modified_ts": stat.st_mtime,
+                }
+            )
+    return scene_files
+
+
 def _scene_list(max_results: int = 200) -> dict[str, Any]:
     manager = get_session_manager()
     state = manager.state
@@ -129,21 +153,7 @@ def _scene_list(max_results: int = 200) -> dict[str, Any]:
             "scenes": [],
         }
 
-    scene_files = []
-    for extension in ("*.hip", "*.hiplc", "*.hipnc"):
-        for hip_file in tasks_root.glob(f"*/houdini/{extension}"):
-            if not hip_file.is_file():
-                continue
-            stat = hip_file.stat()
-            scene_files.append(
-                {
-                    "path": str(hip_file),
-                    "name": hip_file.name,
-                    "step": hip_file.parent.parent.name,
-                    "size_bytes": stat.st_size,
-                    "modified_ts": stat.st_mtime,
-                }
-            )
+    scene_files = list_scene_files(shot_root)
 
     scene_files.sort(key=lambda item: float(item["modified_ts"]), reverse=True)
 
@@ -1,15 +1,112 @@
+import contextlib
+import hashlib
+import json
 import os
 import socket
 import sys
+import time
+from pathlib import Path
 
 # ruff: noqa: I001
 
-import oom_sg_auth
-from oom_bootstrap import bootstrap
+# Seconds a resolved context is reused before asking ShotGrid again
+DEFAULT_CONTEXT_TTL = 3600
 
 
-def main():
-    # Environment Setup
+def _context_cache_file(project_name, sequence_name, shot_name):
+    cache_dir = os.environ.get("OOM_CONTEXT_CACHE_DIR") or (
+        Path.home() / ".cache" / "oom" / "context"
+    )
+    key = "\0".join(
+        [
+            os.environ.get("SG_HOST", ""),
+            project_name,
+            sequence_name or "",
+            shot_name or "",
+        ]
+    )
+    return Path(cache_dir) / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+
+
+def load_cached_context(project_name, sequence_name=None, shot_name=None):
+    """Return the cached env values for this context, or None if stale/missing."""
+    ttl = float(os.environ.get("OOM_CONTEXT_TTL", DEFAULT_CONTEXT_TTL))
+    if ttl <= 0:
+        return None
+    try:
+        data = json.loads(
+            _context_cache_file(project_name, sequence_name, shot_name).read_text()
+        )
+    except (OSError, ValueError):
+        return None
+    if time.time() - float(data.get("resolved_at", 0)) > ttl:
+        return None
+    return data.get("env") or None
+
+
+def store_cached_context(project_name, sequence_name, shot_name, env):
+    cache_file = _context_cache_file(project_name, sequence_name, shot_name)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}")
+        tmp.write_text(json.dumps({"resolved_at": time.time(), "env": env}))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def write_env_file(env, env_file="/tmp/oom.env"):
+    with open(env_file, "w") as handle:
+        for key, value in env.items():
+            handle.write(f'export {key}="{value}"\n')
+    os.chmod(env_file, 0o777)
+
+
+def context_record(project_name, sequence_name, shot_name, env):
+    return {
+        "project": project_name,
+        "sequence": sequence_name,
+        "shot": shot_name,
+        "env": env,
+    }
+
+
+def write_json_output(record, path=None):
+    """Write ``record`` to ``path`` (atomically), or to stdout when path is None."""
+    text = json.dumps(record, indent=2) + "\n"
+    if path is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    target = Path(path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}")
+    tmp.write_text(text)
+    os.replace(tmp, target)
+
+
+def _json_output_arg(argv):
+    """Return (argv without --json, enabled, path); path None means stdout."""
+    rest = []
+    enabled = False
+    path = None
+    for arg in argv:
+        if arg == "--json":
+            enabled = True
+        elif arg.startswith("--json="):
+            enabled = True
+            path = arg.split("=", 1)[1] or None
+            if path == "-":
+                path = None
+        else:
+            rest.append(arg)
+    return rest, enabled, path
+
+
+class ContextError(RuntimeError):
+    """A project, sequence or shot name did not resolve in ShotGrid."""
+
+
+def setup_environment():
     hostname = socket.gethostname()
     os.environ["SHOTGUN_HOME"] = os.path.expanduser(f"~/.shotgun-{hostname}")
     ssl_cert = (
@@ -19,60 +116,71 @@ def main():
     )
     os.environ["SSL_CERT_FILE"] = ssl_cert
 
-    # Argument Parsing
-    def parse_args(argv):
-        arg_count = len(argv) - 1
 
-        if arg_count == 1:
-            return argv[1], None, None
+def resolve_project_path(tk_instance, project_entity):
+    tank_name = (project_entity.get("tank_name") or "").strip()
 
-        if arg_count == 3:
-            return argv[1], argv[2], argv[3]
+    if not tank_name:
+        return None
 
-        print("Usage: oom <Project> [<Sequence> <Shot>]")
-        sys.exit(1)
+    data_roots = tk_instance.pipeline_configuration.get_data_roots() or {}
 
-    def resolve_project_path(tk_instance, project_entity):
-        tank_name = (project_entity.get("tank_name") or "").strip()
+    for root_path in data_roots.values():
+        if not root_path:
+            continue
 
-        if not tank_name:
-            return None
+        normalized = os.path.normpath(root_path)
 
-        data_roots = tk_instance.pipeline_configuration.get_data_roots() or {}
+        if os.path.basename(normalized) == tank_name:
+            return normalized
 
-        for root_path in data_roots.values():
-            if not root_path:
-                continue
+        candidate = os.path.join(normalized, tank_name)
 
-            normalized = os.path.normpath(root_path)
+        if os.path.isdir(candidate):
+            return candidate
 
-            if os.path.basename(normalized) == tank_name:
-                return normalized
+        return candidate
 
-            candidate = os.path.join(normalized, tank_name)
+    return None
 
-            if os.path.isdir(candidate):
-                return candidate
 
-            return candidate
+def bootstrap_toolkit(project):
+    """Start tk-shell for ``project``; returns (engine, tk)."""
+    from oom_bootstrap import bootstrap
 
-        return None
+    engine, tk, _sg = bootstrap(project)
+    return engine, tk
 
-    project_name, sequence_name, shot_name = parse_args(sys.argv)
+
+def resolve_context(
+    project_name,
+    sequence_name=None,
+    shot_name=None,
+    refresh=False,
+    sg=None,
+    toolkit_for=bootstrap_toolkit,
+):
+    """Resolve names to the OOM_* env values and prepare the shot folders.
+
+    ``sg`` and ``toolkit_for`` let a long-lived caller reuse its ShotGrid
+    connection and Toolkit instances; ``toolkit_for(project)`` returns
+    (engine, tk) and engine may be None. Raises ContextError when a name
+    does not resolve.
+    """
+    from oom_fs_sync import ensure_filesystem_structure, synchronize_if_changed
 
     # ShotGrid Connection Setup
-    user = oom_sg_auth.oom_auth()
-    sg = user.create_sg_connection()
+    if sg is None:
+        import oom_sg_auth
+
+        user = oom_sg_auth.oom_auth()
+        sg = user.create_sg_connection()
 
     project = sg.find_one(
         "Project", [["name", "is", project_name]], ["id", "tank_name"]
     )
     if project is None:
-        print("Not a project")
-        sys.exit(1)
-
-    # Toolkit Bootstrap
-    engine, tk, sg = bootstrap(project)
+        raise ContextError("Not a project")
 
     # Context Resolution
     sequence = None
@@ -86,13 +194,11 @@ def main():
         )
 
         if sequence is None:
-            print("Not a sequence")
-            sys.exit(1)
+            raise ContextError("Not a sequence")
 
     if shot_name:
         if sequence is None:
-            print("Sequence name required when specifying a shot")
-            sys.exit(1)
+            raise ContextError("Sequence name required when specifying a shot")
 
         shot = sg.find_one(
             "Shot",
@@ -105,25 +211,28 @@ def main():
         )
 
         if shot is None:
-            print("Not a shot")
-            sys.exit(1)
+            raise ContextError("Not a shot")
+
+    # Toolkit Bootstrap
+    engine, tk = toolkit_for(project)
 
     # Context Application
-    if shot:
-        context = tk.context_from_entity("Shot", shot["id"])
-    else:
-        context = tk.context_from_entity("Project", project["id"])
+    if engine is not None:
+        if shot:
+            context = tk.context_from_entity("Shot", shot["id"])
+        else:
+            context = tk.context_from_entity("Project", project["id"])
 
-    engine.change_context(context)
-    print(engine)
+        engine.change_context(context)
+        print(engine)
 
-    # Filesystem Preparation
-    tk.synchronize_filesystem_structure()
+    # Filesystem Preparation (skipped when nothing changed; refresh forces it)
+    synchronize_if_changed(tk, project, force=refresh)
 
     if shot:
-        tk.create_filesystem_structure("Shot", shot["id"])
+        ensure_filesystem_structure(tk, "Shot", shot["id"], force=refresh)
     else:
-        tk.create_filesystem_structure("Project", project["id"])
+        ensure_filesystem_structure(tk, "Project", project["id"], force=refresh)
 
     # Path Resolution
     project_path = resolve_project_path(tk, project)
@@ -141,30 +250,87 @@ def main():
 
             shot_path = template.apply_fields(fields)
 
-    # Environment File Export
-    def write_env_file():
-        env_file = "/tmp/oom.env"
-        with open(env_file, "w") as handle:
-            handle.write(f'export OOM_PROJECT_ID="{project["id"]}"\n')
+    # Environment Values
+    env = {"OOM_PROJECT_ID": project["id"]}
+
+    if project_path:
+        env["OOM_PROJECT_PATH"] = project_path
+
+    if sequence:
+        env["OOM_SEQUENCE_ID"] = sequence["id"]
+
+    if shot:
+        env["OOM_SHOT_ID"] = shot["id"]
+
+        if shot_path:
+            env["OOM_SHOT_PATH"] = shot_path
+
+        cut_in = shot.get("sg_cut_in")
+        cut_out = shot.get("sg_cut_out")
+
+        if cut_in is not None and cut_out is not None:
+            env["CUT_IN"] = cut_in
+            env["CUT_OUT"] = cut_out
+
+    store_cached_context(project_name, sequence_name, shot_name, env)
+    return env
+
+
+def main():
+    """Resolve a context and export it.
+
+    By default the values go to /tmp/oom.env for the oom shell wrapper.
+    ``--json`` prints a JSON record to stdout instead and ``--json=PATH``
+    writes it to PATH, so concurrent resolutions do not share a file; in
+    JSON mode all other output goes to stderr.
+    """
+    argv, json_mode, json_path = _json_output_arg(sys.argv)
+    if json_mode and json_path is None:
+        # Keep stdout for the record alone
+        with contextlib.redirect_stdout(sys.stderr):
+            record = _main(argv, json_mode)
+        write_json_output(record)
+    else:
+        record = _main(argv, json_mode)
+        if json_mode:
+            write_json_output(record, json_path)
+        else:
+            # Environment File Export
+            write_env_file(record["env"])
+
+
+def _main(argv, json_mode):
+    # Environment Setup
+    setup_environment()
+
+    # Argument Parsing
+    def parse_args(argv):
+        argv = [arg for arg in argv if arg != "--refresh"]
+        arg_count = len(argv) - 1
 
-            if project_path:
-                handle.write(f'export OOM_PROJECT_PATH="{project_path}"\n')
+        if arg_count == 1:
+            return argv[1], None, None
 
-            if sequence:
-                handle.write(f'export OOM_SEQUENCE_ID="{sequence["id"]}"\n')
+        if arg_count == 3:
+            return argv[1], argv[2], argv[3]
 
-            if shot:
-                handle.write(f'export OOM_SHOT_ID="{shot["id"]}"\n')
+        print("Usage: oom [--refresh] [--json[=PATH]] <Project> [<Sequence> <Shot>]")
+        sys.exit(1)
 
-                if shot_path:
-                    handle.write(f'export OOM_SHOT_PATH="{shot_path}"\n')
+    project_name, sequence_name, shot_name = parse_args(argv)
 
-                cut_in = shot.get("sg_cut_in")
-                cut_out = shot.get("sg_cut_out")
+    # Cached Context (skips ShotGrid and Toolkit entirely)
+    refresh = "--refresh" in argv[1:]
+    if not refresh:
+        cached = load_cached_context(project_name, sequence_name, shot_name)
+        if cached:
+            print("[oom] Using cached context (pass --refresh to re-resolve)")
+            return context_record(project_name, sequence_name, shot_name, cached)
 
-                if cut_in is not None and cut_out is not None:
-                    handle.write(f'export CUT_IN="{cut_in}"\n')
-                    handle.write(f'export CUT_OUT="{cut_out}"\n')
-        os.chmod(env_file, 0o777)
+    try:
+        env = resolve_context(project_name, sequence_name, shot_name, refresh=refresh)
+    except ContextError as exc:
+        print(exc, file=sys.stderr if json_mode else sys.stdout)
+        sys.exit(1)
 
-    write_env_file()
+    return context_record(project_name, sequence_name, shot_name, env)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Resident ShotGrid/Toolkit context service.
+
+Resolving a context with ``oom_context`` in a fresh process authenticates,
+bootstraps Toolkit and imports tk-core every time, which takes tens of
+seconds. This service does that once: it listens on a Unix socket, keeps
+one ShotGrid connection and the Toolkit instance of the current project,
+and answers resolutions from them. A request for another project retires
+the engine and bootstraps that project (bootstrapping may swap tk-core in
+sys.modules, so instances from other projects are not kept). Resolved
+contexts also go through the oom_context cache, so a repeated query is a
+file read.
+
+Requests and replies are single JSON lines:
+
+    {"command": "resolve", "project": "...", "sequence": "...", "shot": "...",
+     "refresh": false}
+    -> {"ok": true, "env": {...}, "elapsed": 0.004}
+
+    python -m oom_context_service serve
+    python -m oom_context_service status
+    python -m oom_context_service stop
+    python -m oom_context_service resolve <Project> [<Sequence> <Shot>]
+
+Clients start the service on first use. Socket: OOM_CONTEXT_SERVICE_SOCKET
+(default $XDG_RUNTIME_DIR or /tmp, ``oom-context-<user>.sock``); service
+output goes to the log file next to it.
+
+The MCP server cannot import this module (it runs another interpreter
+without src/ on its path), so ``oom_agent.context`` carries its own copy of
+the client: socket_path, _socket_alive, the autostart and the request
+framing. Change both together; tests/test_context_service.py checks they
+agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+START_TIMEOUT = 15.0
+# Resolutions bootstrap Toolkit on a miss; keep clients waiting that long
+REQUEST_TIMEOUT = 600.0
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][context_service]", *parts, file=sys.stderr)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def socket_path() -> Path:
+    configured = os.environ.get("OOM_CONTEXT_SERVICE_SOCKET", "").strip()
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return Path(base) / f"oom-context-{getpass.getuser()}.sock"
+
+
+def log_path() -> Path:
+    return socket_path().with_suffix(".log")
+
+
+class ContextService:
+    """ShotGrid connection and the current project's Toolkit for one process.
+
+    Toolkit runs a single engine per process and shotgun_api3 connections
+    are not thread safe, so resolutions are serialized; a warm one takes
+    milliseconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sg = None
+        self._project_id: Optional[int] = None
+        self._tk = None
+        self._engine = None
+        self.started = time.time()
+        self.resolved = 0
+        self.server: Optional[socketserver.UnixStreamServer] = None
+
+    def _connection(self):
+        if self._sg is None:
+            import oom_sg_auth
+
+            self._sg = oom_sg_auth.oom_auth().create_sg_connection()
+        return self._sg
+
+    def _toolkit_for(self, project: dict):
+        if self._tk is not None and self._project_id == project["id"]:
+            return None, self._tk
+        import sgtk
+
+        from oom_context import bootstrap_toolkit
+
+        # One engine per process: retire the previous project's engine and
+        # drop its tk, which may belong to a tk-core the bootstrap replaces
+        if self._engine is not None:
+            try:
+                self._engine.destroy_engine()
+            except Exception as exc:
+                _log_exception("destroy_engine", exc)
+            sgtk.platform.engine.set_current_engine(None)
+        self._engine = None
+        self._tk = None
+        self._project_id = None
+        print(f"[oom] Bootstrapping Toolkit for project {project['id']}")
+        engine, tk = bootstrap_toolkit(project)
+        self._engine = engine
+        self._tk = tk
+        self._project_id = project["id"]
+        return None, tk
+
+    def resolve(self, request: dict) -> dict:
+        from oom_context import load_cached_context, resolve_context
+
+        project = request["project"]
+        sequence = request.get("sequence") or None
+        shot = request.get("shot") or None
+        refresh = bool(request.get("refresh"))
+        if not refresh:
+            cached = load_cached_context(project, sequence, shot)
+            if cached:
+                return cached
+        with self._lock:
+            env = resolve_context(
+                project,
+                sequence,
+                shot,
+                refresh=refresh,
+                sg=self._connection(),
+                toolkit_for=self._toolkit_for,
+            )
+            self.resolved += 1
+        return env
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "started_at": self.started,
+            "resolved": self.resolved,
+            "project": self._project_id,
+        }
+
+    def handle(self, request: dict) -> dict:
+        command = request.get("command", "resolve")
+        if command == "status":
+            return {"ok": True, **self.status()}
+        if command == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"ok": True}
+        if command != "resolve":
+            return {"ok": False, "error": f"Unknown command: {command}"}
+        started = time.time()
+        try:
+            env = self.resolve(request)
+        except Exception as exc:
+            _log_exception("resolve", exc)
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        elapsed = round(time.time() - started, 3)
+        _dprint("resolved", request.get("project"), request.get("shot"), elapsed)
+        return {"ok": True, "env": env, "elapsed": elapsed}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        try:
+            reply = self.server.service.handle(json.loads(line))
+        except ValueError as exc:
+            reply = {"ok": False, "error": str(exc)}
+        try:
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+        except OSError as exc:
+            _log_exception("reply", exc)
+        return None
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _socket_alive(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve() -> int:
+    from oom_context import setup_environment
+
+    path = socket_path()
+    if path.exists():
+        if _socket_alive(path):
+            print(f"Context service already running on {path}", file=sys.stderr)
+            return 1
+        path.unlink()
+    setup_environment()
+    service = ContextService()
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(str(path), _Handler)
+    finally:
+        os.umask(old_umask)
+    server.service = service
+    service.server = server
+    print(f"[oom] Context service listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+# Client
+def _start_service() -> None:
+    log = open(log_path(), "ab")
+    subprocess.Popen(
+        [sys.executable, "-m", "oom_context_service", "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=log,
+        stderr=log,
+        start_new_session=True,
+    )
+    log.close()
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if _socket_alive(socket_path()):
+            return None
+        time.sleep(0.1)
+    raise RuntimeError(f"Context service did not start; see {log_path()}")
+
+
+def request(
+    payload: dict, autostart: bool = True, timeout: float = REQUEST_TIMEOUT
+) -> dict:
+    """Send one request and return the service's reply."""
+    path = socket_path()
+    if autostart and not _socket_alive(path):
+        _start_service()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        with sock.makefile("r") as replies:
+            line = replies.readline()
+    if not line:
+        raise RuntimeError("Context service closed the connection")
+    return json.loads(line)
+
+
+def resolve(
+    project: str,
+    sequence: Optional[str] = None,
+    shot: Optional[str] = None,
+    refresh: bool = False,
+) -> dict:
+    """Resolve a context through the service; returns the OOM_* env values."""
+    reply = request(
+        {
+            "command": "resolve",
+            "project": project,
+            "sequence": sequence,
+            "shot": shot,
+            "refresh": refresh,
+        }
+    )
+    if not reply.get("ok"):
+        raise RuntimeError(reply.get("error") or "Context resolution failed")
+    return reply["env"]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident Toolkit context service")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", help="Run the service in the foreground")
+    sub.add_parser("status", help="Show service state")
+    sub.add_parser("stop", help="Stop the service")
+    resolve_parser = sub.add_parser("resolve", help="Resolve a context")
+    resolve_parser.add_argument("names", nargs="+", metavar="NAME")
+    resolve_parser.add_argument("--refresh", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve()
+    if args.command == "resolve":
+        if len(args.names) not in (1, 3):
+            parser.error("expected <Project> [<Sequence> <Shot>]")
+        names = args.names + [None] * (3 - len(args.names))
+        try:
+            env = resolve(*names, refresh=args.refresh)
+        except (OSError, RuntimeError) as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        print(json.dumps(env, indent=2))
+        return 0
+    if not _socket_alive(socket_path()):
+        print("Context service is not running")
+        return 1 if args.command == "status" else 0
+    reply = request({"command": args.command}, autostart=False)
+    if args.command == "status":
+        reply.pop("ok", None)
+        print(json.dumps(reply, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Skip Toolkit filesystem work that has nothing to do.
+
+``tk.synchronize_filesystem_structure()`` diffs the local path cache against
+ShotGrid and takes seconds on large projects, yet it only has work when folder
+creation or deletion was logged since the last sync. Those changes show up as
+``Toolkit_Folders_Create`` / ``Toolkit_Folders_Delete`` EventLogEntries, so
+the id of the newest such event is recorded next to the path cache after each
+sync and the next sync only runs when a newer event exists.
+
+``create_filesystem_structure`` is likewise skipped for entities whose folders
+are already in the path cache and on disk. For a Shot that includes the
+folders of each of its current Tasks, so steps and tasks added in ShotGrid
+still get their ``tasks/<Step>/...`` folders.
+
+Any failure while checking falls back to running the Toolkit call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Optional
+
+FOLDER_EVENT_TYPES = ["Toolkit_Folders_Create", "Toolkit_Folders_Delete"]
+
+
+def _state_file(tk) -> Optional[str]:
+    try:
+        return tk.pipeline_configuration.get_path_cache_location() + ".oom_sync.json"
+    except Exception:
+        return None
+
+
+def _load_state(path: Optional[str]) -> dict:
+    if not path:
+        return {}
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path: Optional[str], state: dict) -> None:
+    if not path:
+        return
+    try:
+        tmp = f"{path}.{os.getpid()}"
+        with open(tmp, "w") as handle:
+            json.dump(state, handle)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def latest_folder_event_id(sg, project: dict) -> int:
+    """Id of the newest folder create/delete event for ``project`` (0 if none)."""
+    event = sg.find_one(
+        "EventLogEntry",
+        [
+            ["event_type", "in", FOLDER_EVENT_TYPES],
+            ["project", "is", {"type": "Project", "id": project["id"]}],
+        ],
+        ["id"],
+        order=[{"field_name": "id", "direction": "desc"}],
+    )
+    return int(event["id"]) if event else 0
+
+
+def synchronize_if_changed(
+    tk, project: Optional[dict] = None, force: bool = False
+) -> bool:
+    """Synchronize the path cache only when ShotGrid logged folder changes.
+
+    Returns True when a sync ran.
+    """
+    state_path = _state_file(tk)
+    event_id = None
+    try:
+        if project is None:
+            project = {
+                "type": "Project",
+                "id": tk.pipeline_configuration.get_project_id(),
+            }
+        # Read before syncing so events logged during the sync are not lost
+        event_id = latest_folder_event_id(tk.shotgun, project)
+        state = _load_state(state_path)
+        cache_present = os.path.exists(
+            tk.pipeline_configuration.get_path_cache_location()
+        )
+        if not force and cache_present and state.get("event_id") == event_id:
+            print(f"[oom] Path cache up to date (event {event_id}); skipping sync")
+            return False
+    except Exception as exc:
+        print(f"[oom] Path cache check failed, synchronizing: {exc}")
+
+    tk.synchronize_filesystem_structure()
+    if event_id is not None:
+        _save_state(state_path, {"event_id": event_id, "synced_at": time.time()})
+    return True
+
+
+def _folders_exist(tk, entity_type: str, entity_id: int) -> bool:
+    paths = tk.paths_from_entity(entity_type, entity_id)
+    return bool(paths) and all(os.path.isdir(path) for path in paths)
+
+
+def _structure_complete(tk, entity_type: str, entity_id: int) -> bool:
+    if not _folders_exist(tk, entity_type, entity_id):
+        return False
+    if entity_type != "Shot":
+        return True
+    # Step/task folders are created under the shot, so each current task
+    # must already have its folders
+    shot_roots = tk.paths_from_entity("Shot", entity_id)
+    tasks = tk.shotgun.find(
+        "Task", [["entity", "is", {"type": "Shot", "id": entity_id}]], ["step"]
+    )
+    task_paths = {
+        task["id"]: tk.paths_from_entity("Task", task["id"]) for task in tasks
+    }
+    if any(task_paths.values()):
+        # Schema has task folders: every task needs its own
+        return all(
+            paths and all(os.path.isdir(path) for path in paths)
+            for paths in task_paths.values()
+        )
+    # Step-level schema: every task's step needs a folder under this shot
+    for step_id in {task["step"]["id"] for task in tasks if task.get("step")}:
+        step_paths = [
+            path
+            for path in tk.paths_from_entity("Step", step_id)
+            if any(_is_under(path, root) for root in shot_roots)
+        ]
+        if not step_paths or not all(os.path.isdir(path) for path in step_paths):
+            return False
+    return True
+
+
+def _is_under(path: str, root: str) -> bool:
+    return os.path.normpath(path).startswith(os.path.normpath(root) + os.sep)
+
+
+def ensure_filesystem_structure(
+    tk, entity_type: str, entity_id: int, force: bool = False
+) -> bool:
+    """Create folders for an entity unless they already exist.
+
+    Returns True when ``create_filesystem_structure`` ran.
+    """
+    if not force:
+        try:
+            if _structure_complete(tk, entity_type, entity_id):
+                return False
+        except Exception as exc:
+            print(f"[oom] Folder check failed, creating structure: {exc}")
+    tk.create_filesystem_structure(entity_type, entity_id)
+    return True
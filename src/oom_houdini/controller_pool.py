@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Warm controller pods for headless PDG cooks.
+
+A per-artist Deployment keeps a few controller pods with hython booted and
+Toolkit bootstrapped for the artist's project. Submitting a cook drops a
+request into a queue directory on RAID; an idle pod claims it (atomic
+rename), loads the hip and cooks the node, so submit-to-first-work-item time
+is a hip load instead of a pod start plus hython and Toolkit boot.
+
+Queue layout under ``<OOM_CONTROLLER_POOL_ROOT>/<user>/``:
+
+    queue/<id>.json      pending requests, claimed oldest first
+    claimed/<id>.json    requests a worker is cooking (with the worker id)
+    done/<id>.json       result (state, message, worker, timings)
+    workers/<pod>.json   heartbeats; idle workers make the submitter use the pool
+
+A claim whose worker stopped heartbeating is requeued, and failed after
+MAX_ATTEMPTS, so a dead pod does not block resubmitting the same cook.
+Results in done/ are pruned after DONE_TTL seconds.
+
+Workers clear the scene after every cook and keep serving. With
+OOM_CONTROLLER_POOL_MAX_COOKS set (default 0, unlimited) a worker deletes
+its own pod after that many cooks so the ReplicaSet schedules a fresh one;
+exiting the container instead would only restart it in place with
+CrashLoopBackOff delays.
+
+    python -m oom_houdini.controller_pool deploy --replicas 2
+    python -m oom_houdini.controller_pool status
+    python -m oom_houdini.controller_pool result <id>
+
+Submission uses the pool when OOM_CONTROLLER_POOL=1 and an idle worker is
+available, and falls back to a regular controller job otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import json
+import os
+import shlex
+import socket
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_POOL_ROOT = "/mnt/RAID/pdg_controller_pool"
+DEFAULT_NAMESPACE = "dcc"
+DEFAULT_HFS = "/opt/houdini"
+POOL_TEMPLATE = "pdg-controller-pool.yaml"
+HEARTBEAT_SECONDS = 5.0
+# Heartbeats older than this belong to dead pods
+STALE_SECONDS = 30.0
+POLL_SECONDS = 1.0
+# Claims of dead workers are requeued this many times, then failed
+MAX_ATTEMPTS = 2
+# Results kept in done/ for `result` lookups
+DONE_TTL = 7 * 24 * 3600.0
+MAINTENANCE_SECONDS = 60.0
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][controller_pool]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def pool_enabled() -> bool:
+    return _env_truthy(os.environ.get("OOM_CONTROLLER_POOL", ""))
+
+
+def pool_root(user: Optional[str] = None) -> Path:
+    base = Path(os.environ.get("OOM_CONTROLLER_POOL_ROOT") or DEFAULT_POOL_ROOT)
+    return base / (user or getpass.getuser())
+
+
+def pool_name(user: Optional[str] = None) -> str:
+    from oom_houdini.submit_pdg_cook import sanitize_job_name
+
+    return sanitize_job_name(f"pdg-ctrl-pool-{user or getpass.getuser()}")
+
+
+def _ensure_layout(root: Path) -> None:
+    for sub in ("queue", "claimed", "done", "workers"):
+        (root / sub).mkdir(parents=True, exist_ok=True)
+    return None
+
+
+def _write_json_atomic(path: Path, data: dict, *, existing: bool = False) -> bool:
+    """Replace ``path`` with ``data``; with ``existing``, only if it is still there.
+
+    Claims use ``existing`` so a file another process has just moved out of
+    claimed/ is not written back as a second copy.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:6]}")
+    tmp.write_text(json.dumps(data))
+    if existing and not path.exists():
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+# Submit side
+def enqueue(
+    hip: str,
+    node: str,
+    *,
+    hip_name: Optional[str] = None,
+    env: Optional[dict] = None,
+    fingerprint: str = "",
+    user: Optional[str] = None,
+) -> str:
+    root = pool_root(user)
+    _ensure_layout(root)
+    # Sortable ids so workers claim requests in submission order
+    request_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+    _write_json_atomic(
+        root / "queue" / f"{request_id}.json",
+        {
+            "id": request_id,
+            "hip": hip,
+            "node": node,
+            "hip_name": hip_name or "",
+            "env": dict(env or {}),
+            "fingerprint": fingerprint,
+            "submitted": time.time(),
+        },
+    )
+    return request_id
+
+
+def find_request(fingerprint: str, user: Optional[str] = None) -> Optional[str]:
+    """Return the id of a queued or running request with this fingerprint."""
+    if not fingerprint:
+        return None
+    root = pool_root(user)
+    reap_stale_claims(root)
+    for sub in ("queue", "claimed"):
+        for path in sorted((root / sub).glob("*.json")):
+            data = _read_json(path) or {}
+            if data.get("fingerprint") == fingerprint:
+                return str(data.get("id") or path.stem)
+    return None
+
+
+def _alive(heartbeat: Optional[dict], now: float) -> bool:
+    return bool(heartbeat) and now - float(heartbeat.get("updated", 0)) < STALE_SECONDS
+
+
+def workers(user: Optional[str] = None) -> list[dict]:
+    now = time.time()
+    found = []
+    for path in (pool_root(user) / "workers").glob("*.json"):
+        data = _read_json(path)
+        if _alive(data, now):
+            found.append(data)
+    return found
+
+
+def reap_stale_claims(root: Path) -> int:
+    """Requeue (or fail) claims whose worker stopped heartbeating."""
+    now = time.time()
+    reaped = 0
+    for path in sorted((root / "claimed").glob("*.json")):
+        data = _read_json(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        # rename keeps the enqueue mtime; claim_next touches the file, and
+        # ctime covers the moment between its rename and that touch
+        age = now - max(stat.st_mtime, stat.st_ctime)
+        if data is None:
+            if age > STALE_SECONDS:
+                path.unlink(missing_ok=True)
+            continue
+        worker_id = str(data.get("worker") or "")
+        if worker_id:
+            heartbeat = _read_json(root / "workers" / f"{worker_id}.json")
+            if _alive(heartbeat, now):
+                continue
+        elif age < STALE_SECONDS:
+            # Just renamed; the claimer has not recorded itself yet
+            continue
+        request_id = str(data.get("id") or path.stem)
+        attempts = int(data.get("attempts", 0) or 0) + 1
+        if attempts >= MAX_ATTEMPTS:
+            result = {
+                "id": request_id,
+                "state": "failed",
+                "message": f"Pool worker {worker_id or '?'} died during the cook",
+                "worker": worker_id,
+                "finished": now,
+            }
+            _write_json_atomic(root / "done" / path.name, result)
+            path.unlink(missing_ok=True)
+            print(f"[oom] Pool request {request_id} failed: worker {worker_id} died")
+        else:
+            data.update(attempts=attempts, worker="")
+            if not _write_json_atomic(path, data, existing=True):
+                continue
+            try:
+                os.rename(path, root / "queue" / path.name)
+            except OSError as exc:
+                _log_exception("reap_stale_claims", exc)
+                continue
+            print(f"[oom] Requeued pool request {request_id}: worker {worker_id} died")
+        reaped += 1
+    return reaped
+
+
+def prune_done(root: Path, max_age: float = DONE_TTL) -> int:
+    cutoff = time.time() - max_age
+    pruned = 0
+    for path in (root / "done").glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                pruned += 1
+        except OSError:
+            continue
+    return pruned
+
+
+def available_workers(user: Optional[str] = None) -> int:
+    """Idle workers not already spoken for by queued requests."""
+    idle = sum(1 for worker in workers(user) if worker.get("state") == "idle")
+    queued = len(list((pool_root(user) / "queue").glob("*.json")))
+    return max(0, idle - queued)
+
+
+def request_status(request_id: str, user: Optional[str] = None) -> dict:
+    root = pool_root(user)
+    done = _read_json(root / "done" / f"{request_id}.json")
+    if done:
+        return done
+    if (root / "claimed" / f"{request_id}.json").exists():
+        return {"id": request_id, "state": "cooking"}
+    if (root / "queue" / f"{request_id}.json").exists():
+        return {"id": request_id, "state": "queued"}
+    return {"id": request_id, "state": "unknown"}
+
+
+# Worker side
+def claim_next(root: Path, worker_id: str = "") -> Optional[dict]:
+    for path in sorted((root / "queue").glob("*.json")):
+        target = root / "claimed" / path.name
+        try:
+            # rename is atomic on the shared filesystem; losers move on
+            os.rename(path, target)
+            # Start the claim's age now rather than at enqueue time
+            os.utime(target)
+        except OSError:
+            continue
+        data = _read_json(target)
+        if data is None:
+            target.unlink(missing_ok=True)
+            continue
+        # Record the claimer so the claim can be reaped if this pod dies
+        data.update(worker=worker_id, claimed=time.time())
+        if not _write_json_atomic(target, data, existing=True):
+            # Reaped back to queue/ before the claim was recorded
+            continue
+        return data
+    return None
+
+
+def finish_request(root: Path, request_id: str, result: dict) -> None:
+    """Publish the result of a claimed request and release the claim."""
+    _write_json_atomic(root / "done" / f"{request_id}.json", result)
+    (root / "claimed" / f"{request_id}.json").unlink(missing_ok=True)
+
+
+class _Heartbeat:
+    def __init__(self, root: Path, worker_id: str):
+        self._path = root / "workers" / f"{worker_id}.json"
+        self._worker_id = worker_id
+        self._state = {"state": "starting", "request": ""}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="oom-pool-heartbeat", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+        return None
+
+    def set(self, state: str, request: str = "") -> None:
+        with self._lock:
+            self._state = {"state": state, "request": request}
+        self._write()
+        return None
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._path.unlink(missing_ok=True)
+        return None
+
+    def _write(self) -> None:
+        with self._lock:
+            data = dict(self._state)
+        data.update(
+            worker=self._worker_id, host=socket.gethostname(), updated=time.time()
+        )
+        try:
+            _write_json_atomic(self._path, data)
+        except OSError as exc:
+            _log_exception("heartbeat", exc)
+        return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            self._write()
+        return None
+
+
+def _apply_env(env: dict) -> dict:
+    import hou
+
+    previous = {key: os.environ.get(key) for key in env}
+    for key, value in env.items():
+        os.environ[key] = str(value)
+        hou.putenv(key, str(value))
+    return previous
+
+
+def _restore_env(previous: dict) -> None:
+    import hou
+
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+            hou.unsetenv(key)
+        else:
+            os.environ[key] = value
+            hou.putenv(key, value)
+    return None
+
+
+def _warm_up() -> None:
+    # Import the cook path and bootstrap Toolkit for the pool's project up
+    # front; this is the boot time the pool exists to hide
+    import hou
+
+    from oom_houdini import cook_top  # noqa: F401
+
+    project_id = (os.environ.get("OOM_PROJECT_ID") or "").strip()
+    if not project_id or getattr(hou.session, "oom_tk", None) is not None:
+        return None
+    try:
+        from oom_bootstrap import bootstrap
+
+        engine, tk, _sg = bootstrap({"type": "Project", "id": int(project_id)})
+        hou.session.oom_engine = engine
+        hou.session.oom_tk = tk
+        print(f"[oom] Pool worker bootstrapped Toolkit for project {project_id}")
+    except Exception as exc:
+        # 456.py bootstraps on hip load anyway; only the warm start is lost
+        print(f"[oom] Pool worker Toolkit warm-up failed: {exc}")
+    return None
+
+
+def _run_request(request: dict) -> dict:
+    import hou
+
+    from oom_houdini.cook_top import load_and_cook
+
+    started = time.time()
+    previous = _apply_env(request.get("env") or {})
+    try:
+        load_and_cook(request["hip"], request["node"], request.get("hip_name") or None)
+        result = {"state": "succeeded", "message": "Cook finished"}
+    except Exception as exc:
+        result = {"state": "failed", "message": str(exc)}
+    finally:
+        _restore_env(previous)
+        try:
+            hou.hipFile.clear(suppress_save_prompt=True)
+        except Exception as exc:
+            _log_exception("_run_request:clear", exc)
+    result.update(id=request.get("id"), started=started, finished=time.time())
+    return result
+
+
+def _delete_own_pod() -> bool:
+    # Let the ReplicaSet start a fresh pod; a container exit would restart
+    # in place under CrashLoopBackOff
+    pod = (os.environ.get("POD_NAME") or "").strip()
+    namespace = (os.environ.get("POD_NAMESPACE") or DEFAULT_NAMESPACE).strip()
+    if not pod:
+        return False
+    try:
+        from kubernetes import client
+
+        from oom_kube.helpers import load_kube
+
+        load_kube()
+        client.CoreV1Api().delete_namespaced_pod(name=pod, namespace=namespace)
+        return True
+    except Exception as exc:
+        print(f"[oom] Pool worker could not delete pod {pod}: {exc}")
+        return False
+
+
+def worker_main(max_cooks: Optional[int] = None) -> int:
+    root = pool_root()
+    _ensure_layout(root)
+    if max_cooks is None:
+        try:
+            max_cooks = int(os.environ.get("OOM_CONTROLLER_POOL_MAX_COOKS", "0"))
+        except ValueError:
+            max_cooks = 0
+    worker_id = (os.environ.get("POD_NAME") or "").strip() or (
+        f"{socket.gethostname()}-{os.getpid()}"
+    )
+    heartbeat = _Heartbeat(root, worker_id)
+    heartbeat.start()
+
+    _warm_up()
+    cooks = 0
+    last_maintenance = 0.0
+    try:
+        heartbeat.set("idle")
+        while max_cooks <= 0 or cooks < max_cooks:
+            if time.time() - last_maintenance > MAINTENANCE_SECONDS:
+                last_maintenance = time.time()
+                try:
+                    reap_stale_claims(root)
+                    prune_done(root)
+                except Exception as exc:
+                    _log_exception("maintenance", exc)
+            request = claim_next(root, worker_id)
+            if request is None:
+                time.sleep(POLL_SECONDS)
+                continue
+
+            request_id = str(request.get("id") or "")
+            heartbeat.set("busy", request_id)
+            print(f"[oom] Pool worker {worker_id} cooking {request_id}")
+            result = _run_request(request)
+            result["worker"] = worker_id
+            finish_request(root, request_id, result)
+            print(f"[oom] Pool request {request_id} {result['state']}")
+            cooks += 1
+            heartbeat.set("idle")
+    finally:
+        heartbeat.stop()
+    if max_cooks > 0 and _delete_own_pod():
+        # Wait for the kubelet to stop the pod instead of exiting into a restart
+        time.sleep(3600)
+    return 0
+
+
+# Deployment
+def build_worker_cmd(hfs: str) -> str:
+    hython = Path(hfs) / "bin" / "hython"
+    snippet = (
+        "from oom_houdini.controller_pool import worker_main; "
+        "raise SystemExit(worker_main())"
+    )
+    parts = [
+        "set -euo pipefail",
+        "umask 000",
+        'if [ -n "${OOM_PYTHONPATH:-}" ]; then export PYTHONPATH="${OOM_PYTHONPATH}${PYTHONPATH:+:${PYTHONPATH}}"; fi',
+        f"export HFS={shlex.quote(hfs)}",
+        f"exec {shlex.quote(str(hython))} -c {shlex.quote(snippet)}",
+    ]
+    return "; ".join(parts)
+
+
+def build_pool_manifest(replicas: int, namespace: str = DEFAULT_NAMESPACE) -> dict:
+    from oom_houdini.submit_pdg_cook import _render_template, resolve_uid_gid
+    from oom_kube.helpers import dev_mode
+
+    uid, gid = resolve_uid_gid()
+    username = getpass.getuser()
+    tag = (os.environ.get("OOM_TAG") or "").strip()
+    hfs = os.environ.get("HFS", DEFAULT_HFS).strip() or DEFAULT_HFS
+    context = {
+        "pool_name": pool_name(username),
+        "namespace": namespace,
+        "replicas": int(replicas),
+        "oom_dev": "'True'" if dev_mode() else "'False'",
+        "OOM_TAG": "latest" if not tag or "dirty" in tag else tag,
+        "uid": uid,
+        "gid": gid,
+        "username": username,
+        "command": build_worker_cmd(hfs),
+        "pool_root": (os.environ.get("OOM_CONTROLLER_POOL_ROOT") or DEFAULT_POOL_ROOT),
+        "OOM_PROJECT_ID": os.environ.get("OOM_PROJECT_ID", ""),
+        "OOM_PROJECT_PATH": os.environ.get("OOM_PROJECT_PATH", ""),
+    }
+    return _render_template(POOL_TEMPLATE, context)
+
+
+def deploy_pool(replicas: int, namespace: str = DEFAULT_NAMESPACE) -> str:
+    from kubernetes import client
+
+    from oom_kube.helpers import load_kube
+
+    manifest = build_pool_manifest(replicas, namespace)
+    name = manifest["metadata"]["name"]
+    load_kube()
+    apps_api = client.AppsV1Api()
+    try:
+        apps_api.create_namespaced_deployment(namespace=namespace, body=manifest)
+    except client.exceptions.ApiException as exc:
+        if exc.status != 409:
+            raise
+        apps_api.replace_namespaced_deployment(
+            name=name, namespace=namespace, body=manifest
+        )
+    return name
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm PDG controller pool")
+    sub = parser.add_subparsers(dest="command", required=True)
+    deploy = sub.add_parser("deploy", help="Create/update this artist's pool")
+    deploy.add_argument("--replicas", type=int, default=1)
+    deploy.add_argument("--namespace", default=DEFAULT_NAMESPACE)
+    sub.add_parser("status", help="Show workers and queued requests")
+    result = sub.add_parser("result", help="Show the state of a request")
+    result.add_argument("request_id")
+    sub.add_parser("worker", help="Run a pool worker (inside hython)")
+    args = parser.parse_args(argv)
+
+    if args.command == "deploy":
+        name = deploy_pool(args.replicas, args.namespace)
+        print(f"Deployed {name} with {args.replicas} warm controller(s)")
+        return 0
+    if args.command == "worker":
+        return worker_main()
+    if args.command == "result":
+        print(json.dumps(request_status(args.request_id), indent=2))
+        return 0
+
+    root = pool_root()
+    for worker in sorted(workers(), key=lambda w: w.get("worker", "")):
+        print(
+            f"{worker.get('worker', '')}  {worker.get('state', '')}  "
+            f"{worker.get('request', '')}".rstrip()
+        )
+    queued = sorted(p.stem for p in (root / "queue").glob("*.json"))
+    claimed = sorted(p.stem for p in (root / "claimed").glob("*.json"))
+    print(f"{len(queued)} queued, {len(claimed)} cooking")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
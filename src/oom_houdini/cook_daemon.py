@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Resident cook daemon for cook_top_cli.
+
+Each cook_top_cli run normally pays Houdini startup and a hip load. The
+daemon keeps them warm instead: it listens on a Unix socket and routes
+(hip, node) requests to worker processes that each keep one hip loaded.
+A Houdini session holds a single hip, so the LRU of loaded hips is an LRU
+of workers; the least recently used idle worker is stopped when a new hip
+needs a slot. A worker reloads its hip when the file changed on disk or
+the request carries a different session env than the hip was loaded with.
+
+Requests and replies are JSON lines. Replies stream ``log`` and
+``progress`` events (see ``cook_progress``) and end with one ``done`` event.
+
+    python -m oom_houdini.cook_daemon serve [--max-hips 3]
+    python -m oom_houdini.cook_daemon status
+    python -m oom_houdini.cook_daemon stop
+    OOM_COOK_DAEMON=1 cook_top_cli.py <hip_name> <node_description>
+
+The client starts the daemon on first use. Socket: OOM_COOK_DAEMON_SOCKET
+(default $XDG_RUNTIME_DIR or /tmp, ``oom-cook-<user>.sock``); daemon and
+worker output goes to the log file next to it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+DEFAULT_MAX_HIPS = 3
+START_TIMEOUT = 15.0
+# Session variables forwarded from the client so hips load in its context
+CONTEXT_ENV_VARS = (
+    "OOM_PROJECT_ID",
+    "OOM_PROJECT_PATH",
+    "OOM_SEQUENCE_ID",
+    "OOM_SHOT_ID",
+    "OOM_SHOT_PATH",
+    "CUT_IN",
+    "CUT_OUT",
+)
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][cook_daemon]", *parts, file=sys.stderr)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def socket_path() -> Path:
+    configured = os.environ.get("OOM_COOK_DAEMON_SOCKET", "").strip()
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return Path(base) / f"oom-cook-{getpass.getuser()}.sock"
+
+
+def log_path() -> Path:
+    return socket_path().with_suffix(".log")
+
+
+def _apply_env(env: dict) -> dict:
+    import hou
+
+    previous = {key: os.environ.get(key) for key in env}
+    for key, value in env.items():
+        os.environ[key] = str(value)
+        hou.putenv(key, str(value))
+    return previous
+
+
+def _restore_env(previous: dict) -> None:
+    import hou
+
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+            hou.unsetenv(key)
+        else:
+            os.environ[key] = value
+            hou.putenv(key, value)
+    return None
+
+
+# Worker: one hython per loaded hip, JSON lines on stdin/stdout
+def worker_main() -> int:
+    # Keep the real stdout for protocol replies; everything Houdini and the
+    # cook print goes to stderr (the daemon log)
+    proto = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+    write_lock = threading.Lock()
+
+    def emit(event: str, **data) -> None:
+        with write_lock:
+            proto.write(json.dumps({"event": event, **data}) + "\n")
+        return None
+
+    try:
+        import hou
+    except ImportError:
+        from oom_houdini import oom_hou  # noqa: F401
+
+        import hou
+
+    from oom_houdini.cook_progress import ProgressWriter
+    from oom_houdini.cook_top import _cook_node
+    from oom_houdini.cook_top_cli import find_node
+
+    loaded: Optional[tuple] = None
+    for line in sys.stdin:
+        started = time.time()
+        previous: dict = {}
+        try:
+            request = json.loads(line)
+            hip = request["hip"]
+            env = {key: str(value) for key, value in (request.get("env") or {}).items()}
+            # Set for Houdini ($VAR in parms) as well as Python, and undone
+            # after the cook so one client's context does not leak into the next
+            previous = _apply_env(env)
+            # The hip's load-time evaluation depends on the env too
+            stamp = (hip, os.path.getmtime(hip), tuple(sorted(env.items())))
+            if stamp != loaded:
+                emit("log", message=f"Loading hip file: {hip}")
+                loaded = None
+                hou.hipFile.load(hip, suppress_save_prompt=True)
+                loaded = stamp
+            else:
+                emit("log", message=f"Reusing loaded hip file: {hip}")
+            node_path = request.get("node") or find_node(request["description"])
+            emit("log", message=f"Cooking node: {node_path}")
+            writer = ProgressWriter(
+                node=node_path,
+                hip=hip,
+                on_update=lambda data: emit("progress", **data),
+            )
+            _cook_node(node_path, block=True, progress=writer)
+            counts = writer.snapshot()
+            ok = not counts["failed"]
+            message = (
+                "Cook complete." if ok else f"{counts['failed']} work items failed"
+            )
+            emit("done", ok=ok, node=node_path, message=message)
+        except Exception as exc:
+            emit("done", ok=False, message=f"{type(exc).__name__}: {exc}")
+        finally:
+            try:
+                _restore_env(previous)
+            except Exception as exc:
+                _log_exception("restore_env", exc)
+        _dprint("request finished in", f"{time.time() - started:.1f}s")
+    return 0
+
+
+class _Worker:
+    def __init__(self, hip: str):
+        self.hip = hip
+        self.lock = threading.Lock()
+        self.last_used = time.time()
+        self.cooks = 0
+        # Requests checked out against this worker, running or waiting
+        self.users = 0
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "oom_houdini.cook_daemon", "worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(self, request: dict, send: Callable[[str], None]) -> dict:
+        """Forward ``request`` and relay events until ``done``."""
+        self.last_used = time.time()
+        self.cooks += 1
+        self.proc.stdin.write(json.dumps(request) + "\n")
+        self.proc.stdin.flush()
+        client_gone = False
+        for line in self.proc.stdout:
+            if not client_gone:
+                try:
+                    send(line)
+                except OSError:
+                    # Keep draining so the next request starts in sync
+                    client_gone = True
+            event = json.loads(line)
+            if event.get("event") == "done":
+                return event
+        raise RuntimeError(f"Worker for {self.hip} exited")
+
+    def stop(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.terminate()
+            self.proc.wait(timeout=10)
+        except Exception as exc:
+            _log_exception("stop", exc)
+            self.proc.kill()
+        return None
+
+
+class CookDaemon:
+    def __init__(self, max_hips: int = DEFAULT_MAX_HIPS):
+        self.max_hips = max(1, int(max_hips))
+        self._workers: OrderedDict[str, _Worker] = OrderedDict()
+        self._lock = threading.Lock()
+        self.server: Optional[socketserver.UnixStreamServer] = None
+
+    def _evict(self) -> None:
+        while len(self._workers) >= self.max_hips:
+            idle = [h for h, w in self._workers.items() if not w.users]
+            if not idle:
+                # Every slot is cooking; run over the limit until one frees up
+                return None
+            worker = self._workers.pop(idle[0])
+            print(f"[oom] Unloading {worker.hip}", file=sys.stderr)
+            worker.stop()
+        return None
+
+    def checkout(self, hip: str) -> _Worker:
+        with self._lock:
+            worker = self._workers.get(hip)
+            if worker is not None and not worker.alive():
+                self._workers.pop(hip)
+                worker = None
+            if worker is None:
+                self._evict()
+                worker = _Worker(hip)
+                self._workers[hip] = worker
+            self._workers.move_to_end(hip)
+            worker.users += 1
+            return worker
+
+    def status(self) -> dict:
+        with self._lock:
+            hips = [
+                {
+                    "hip": worker.hip,
+                    "pid": worker.proc.pid,
+                    "busy": worker.users > 0,
+                    "cooks": worker.cooks,
+                    "last_used": worker.last_used,
+                }
+                for worker in reversed(self._workers.values())
+            ]
+        return {"pid": os.getpid(), "max_hips": self.max_hips, "hips": hips}
+
+    def handle(self, request: dict, send: Callable[[str], None]) -> None:
+        command = request.get("command", "cook")
+        if command == "status":
+            send(json.dumps({"event": "done", "ok": True, **self.status()}) + "\n")
+            return None
+        if command == "stop":
+            send(json.dumps({"event": "done", "ok": True}) + "\n")
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return None
+
+        worker = self.checkout(request["hip"])
+        try:
+            if worker.lock.locked():
+                send(json.dumps({"event": "log", "message": "Waiting for hip"}) + "\n")
+            with worker.lock:
+                worker.run(request, send)
+        except Exception as exc:
+            _log_exception("handle", exc)
+            done = {"event": "done", "ok": False, "message": str(exc)}
+            try:
+                send(json.dumps(done) + "\n")
+            except OSError:
+                pass
+        finally:
+            with self._lock:
+                worker.users -= 1
+        return None
+
+    def shutdown_workers(self) -> None:
+        with self._lock:
+            for worker in self._workers.values():
+                worker.stop()
+            self._workers.clear()
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+
+        def send(text: str) -> None:
+            self.wfile.write(text.encode())
+            self.wfile.flush()
+
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            done = {"event": "done", "ok": False, "message": str(exc)}
+            send(json.dumps(done) + "\n")
+            return None
+        self.server.daemon.handle(request, send)
+        return None
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _socket_alive(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve(max_hips: int = DEFAULT_MAX_HIPS) -> int:
+    path = socket_path()
+    if path.exists():
+        if _socket_alive(path):
+            print(f"Cook daemon already running on {path}", file=sys.stderr)
+            return 1
+        path.unlink()
+    daemon = CookDaemon(max_hips)
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(str(path), _Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon = daemon
+    daemon.server = server
+    print(f"[oom] Cook daemon listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        daemon.shutdown_workers()
+        server.server_close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+# Client
+def _start_daemon() -> None:
+    log = open(log_path(), "ab")
+    subprocess.Popen(
+        [sys.executable, "-m", "oom_houdini.cook_daemon", "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=log,
+        stderr=log,
+        start_new_session=True,
+    )
+    log.close()
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if _socket_alive(socket_path()):
+            return None
+        time.sleep(0.1)
+    raise RuntimeError(f"Cook daemon did not start; see {log_path()}")
+
+
+def request(payload: dict, autostart: bool = True) -> Iterator[dict]:
+    """Send one request and yield the daemon's events."""
+    path = socket_path()
+    if autostart and not _socket_alive(path):
+        _start_daemon()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        with sock.makefile("r") as replies:
+            for line in replies:
+                event = json.loads(line)
+                done = event.get("event") == "done"
+                yield event
+                if done:
+                    return None
+    finally:
+        sock.close()
+    raise RuntimeError("Cook daemon closed the connection")
+
+
+def cook(
+    hip: str, node: Optional[str] = None, description: Optional[str] = None
+) -> int:
+    """Cook through the daemon, printing progress; returns an exit code."""
+    from oom_houdini.cook_progress import format_progress
+
+    payload = {
+        "hip": str(Path(hip).expanduser().resolve()),
+        "node": node or "",
+        "description": description or "",
+        "env": {var: os.environ[var] for var in CONTEXT_ENV_VARS if var in os.environ},
+    }
+    last = None
+    try:
+        for event in request(payload):
+            kind = event.get("event")
+            if kind == "log":
+                print(f"[oom] {event.get('message', '')}")
+            elif kind == "progress":
+                line = format_progress(event)
+                if line != last:
+                    print(f"[oom] {line}", flush=True)
+                    last = line
+            elif kind == "done":
+                stream = sys.stdout if event.get("ok") else sys.stderr
+                print(f"[oom] {event.get('message', '')}", file=stream)
+                return 0 if event.get("ok") else 1
+    except (OSError, RuntimeError) as exc:
+        print(f"Cook daemon unavailable: {exc}", file=sys.stderr)
+    return 1
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident hython cook daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the daemon in the foreground")
+    serve_parser.add_argument(
+        "--max-hips",
+        type=int,
+        default=int(os.environ.get("OOM_COOK_DAEMON_HIPS", DEFAULT_MAX_HIPS)),
+        help="Hips kept loaded (one worker process each)",
+    )
+    sub.add_parser("worker", help=argparse.SUPPRESS)
+    sub.add_parser("status", help="Show loaded hips")
+    sub.add_parser("stop", help="Stop the daemon and its workers")
+    cook_parser = sub.add_parser("cook", help="Cook a TOP node through the daemon")
+    cook_parser.add_argument("hip")
+    cook_parser.add_argument("node")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args.max_hips)
+    if args.command == "worker":
+        return worker_main()
+    if args.command == "cook":
+        return cook(args.hip, node=args.node)
+    if not _socket_alive(socket_path()):
+        print("Cook daemon is not running")
+        return 1 if args.command == "status" else 0
+    for event in request({"command": args.command}, autostart=False):
+        if args.command == "status":
+            event.pop("event", None)
+            event.pop("ok", None)
+            print(json.dumps(event, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
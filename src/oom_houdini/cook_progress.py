@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Live progress for headless PDG cooks.
+
+The controller (``cook_top.load_and_cook``) publishes work item counts to a
+small JSON file in the cook directory while it cooks; submitters, the MCP
+``farm_submit`` tool and the CLI below read it back, so checking a farm cook
+does not need kubectl or the hip.
+
+The file lives at ``$HIP/pdgtemp_<cook_id>/progress.json`` and the controller
+finds it through OOM_COOK_PROGRESS. It holds:
+
+    state       loading | cooking | succeeded | failed
+    generated   work items created so far (dynamic items keep adding)
+    scheduled   items handed to the scheduler or cooking
+    cooked      items cooked successfully (including cache hits)
+    failed      items that failed
+    eta         seconds left at the current cook rate, or null
+
+    python -m oom_houdini.cook_progress <progress.json | pdgtemp dir> [--follow]
+
+This module does not import Houdini; PDG is imported by the writer only.
+The MCP server cannot import it and reads progress through its own copy of
+read_progress and format_progress (mcp-server/oom_agent/cook_progress.py);
+change both together.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+PROGRESS_FILE = "progress.json"
+PROGRESS_ENV = "OOM_COOK_PROGRESS"
+# Lower bound between writes; a large graph emits thousands of events
+WRITE_INTERVAL = 1.0
+FINAL_STATES = ("succeeded", "failed")
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][cook_progress]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def progress_path(hip_dir: str, cook_id: str) -> Path:
+    return Path(hip_dir) / f"pdgtemp_{cook_id}" / PROGRESS_FILE
+
+
+def _resolve(path) -> Path:
+    target = Path(path).expanduser()
+    if target.is_dir():
+        return target / PROGRESS_FILE
+    return target
+
+
+def read_progress(path) -> Optional[dict]:
+    try:
+        return json.loads(_resolve(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".progress-", dir=path.parent)
+    with os.fdopen(fd, "w") as handle:
+        json.dump(data, handle)
+    os.chmod(tmp_name, 0o666)
+    os.replace(tmp_name, path)
+    return None
+
+
+def _format_eta(seconds) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def format_progress(data: Optional[dict]) -> str:
+    if not data:
+        return "no progress published yet"
+    return (
+        f"{data.get('state', '?')}: {data.get('cooked', 0)}/{data.get('generated', 0)}"
+        f" cooked, {data.get('scheduled', 0)} scheduled,"
+        f" {data.get('failed', 0)} failed, eta {_format_eta(data.get('eta'))}"
+    )
+
+
+class ProgressWriter:
+    """Count PDG work item states for one cook and publish them.
+
+    Snapshots go to ``path`` when given and to ``on_update`` when given.
+    """
+
+    def __init__(self, path=None, node: str = "", hip: str = "", on_update=None):
+        self.path = Path(path) if path else None
+        self._on_update = on_update
+        self._lock = threading.Lock()
+        self._states: dict = {}
+        self._state = "loading"
+        self._message = ""
+        self._node = node
+        self._hip = hip
+        self._started = time.time()
+        self._first_done: Optional[float] = None
+        self._last_write = 0.0
+        self._context = None
+        self._handlers: list = []
+
+    def _counts(self) -> dict:
+        counts = {
+            "generated": len(self._states),
+            "scheduled": 0,
+            "cooked": 0,
+            "failed": 0,
+        }
+        for state in self._states.values():
+            if state in ("scheduled", "cooking"):
+                counts["scheduled"] += 1
+            elif state == "cooked":
+                counts["cooked"] += 1
+            elif state == "failed":
+                counts["failed"] += 1
+        return counts
+
+    def _eta(self, counts: dict, now: float) -> Optional[float]:
+        done = counts["cooked"] + counts["failed"]
+        if self._first_done is None or done < 2:
+            return None
+        elapsed = now - self._first_done
+        if elapsed <= 0:
+            return None
+        # Rate measured from the first finished item so load/generate time
+        # does not drag the estimate
+        rate = (done - 1) / elapsed
+        remaining = max(0, counts["generated"] - done)
+        return round(remaining / rate, 1) if rate > 0 else None
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        with self._lock:
+            counts = self._counts()
+            data = {
+                "state": self._state,
+                "node": self._node,
+                "hip": self._hip,
+                "pid": os.getpid(),
+                "host": os.environ.get("HOSTNAME", ""),
+                "started_at": self._started,
+                "updated_at": now,
+                "eta": None if self._state in FINAL_STATES else self._eta(counts, now),
+                "message": self._message,
+            }
+        data.update(counts)
+        return data
+
+    def publish(self, force: bool = False) -> None:
+        now = time.time()
+        if not force and now - self._last_write < WRITE_INTERVAL:
+            return None
+        self._last_write = now
+        data = self.snapshot()
+        try:
+            if self.path is not None:
+                _write_json_atomic(self.path, data)
+            if self._on_update is not None:
+                self._on_update(data)
+        except Exception as exc:
+            _log_exception("publish", exc)
+        return None
+
+    def set_state(self, state: str, message: str = "") -> None:
+        with self._lock:
+            self._state = state
+            self._message = message
+        self.publish(force=True)
+        return None
+
+    # PDG events
+    def _on_add(self, event) -> None:
+        with self._lock:
+            self._states.setdefault(event.workItemId, "generated")
+        self.publish()
+        return None
+
+    def _on_remove(self, event) -> None:
+        with self._lock:
+            self._states.pop(event.workItemId, None)
+        self.publish()
+        return None
+
+    def _on_state(self, event) -> None:
+        import pdg
+
+        state = event.currentState
+        if state in (pdg.workItemState.CookedSuccess, pdg.workItemState.CookedCache):
+            value = "cooked"
+        elif state == pdg.workItemState.CookedFail:
+            value = "failed"
+        elif state == pdg.workItemState.Cooking:
+            value = "cooking"
+        elif state == pdg.workItemState.Scheduled:
+            value = "scheduled"
+        else:
+            value = "generated"
+        with self._lock:
+            self._states[event.workItemId] = value
+            if value in ("cooked", "failed") and self._first_done is None:
+                self._first_done = time.time()
+        self.publish()
+        return None
+
+    def attach(self, top_node) -> None:
+        """Subscribe to the graph context that cooks ``top_node``."""
+        context = top_node.getPDGGraphContext()
+        if context is None:
+            return None
+        import pdg
+
+        self._context = context
+        for callback, event_type in (
+            (self._on_add, pdg.EventType.WorkItemAdd),
+            (self._on_remove, pdg.EventType.WorkItemRemove),
+            (self._on_state, pdg.EventType.WorkItemStateChange),
+        ):
+            self._handlers.append(context.addEventHandler(callback, event_type))
+        self.set_state("cooking")
+        return None
+
+    def detach(self) -> None:
+        for handler in self._handlers:
+            try:
+                self._context.removeEventHandler(handler)
+            except Exception as exc:
+                _log_exception("detach", exc)
+        self._handlers = []
+        self._context = None
+        return None
+
+
+def writer_from_env(node: str = "", hip: str = "") -> Optional[ProgressWriter]:
+    path = os.environ.get(PROGRESS_ENV, "").strip()
+    if not path:
+        return None
+    return ProgressWriter(path, node=node, hip=hip)
+
+
+def follow(path, interval: float = 2.0, stream=None) -> Optional[dict]:
+    """Print progress lines until the cook reaches a final state."""
+    out = stream or sys.stdout
+    last = None
+    while True:
+        data = read_progress(path)
+        line = format_progress(data)
+        if line != last:
+            print(line, file=out, flush=True)
+            last = line
+        if data and data.get("state") in FINAL_STATES:
+            return data
+        time.sleep(interval)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show progress of a headless cook")
+    parser.add_argument("path", help="progress.json or the cook's pdgtemp directory")
+    parser.add_argument(
+        "--follow", action="store_true", help="Keep printing until the cook ends"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the raw record")
+    args = parser.parse_args(argv)
+
+    if args.follow:
+        data = follow(args.path)
+        return 0 if data.get("state") == "succeeded" else 1
+    data = read_progress(args.path)
+    if args.json:
+        print(json.dumps(data, indent=2))
+    else:
+        print(format_progress(data))
+    return 0 if data else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,11 @@
+import os
 import sys
+from typing import Optional
 
 import hou
 
-from oom_houdini import oom_cache
+from oom_houdini import cook_progress, oom_cache
+from oom_houdini.hip_snapshot import CONTEXT_PATH_ENV, apply_hip_context
 
 
 # Helpers
@@ -31,25 +34,125 @@ def _normalized_op_name(hou_node):
     return parts[-1] if parts else None
 
 
+# Upstream walks are cached per start node and reused while the graph
+# generation is unchanged. The generation is bumped by hip load/clear/merge
+# and by rewiring, renaming or deleting a walked node (or retargeting a fetch).
+_upstream_cache: dict = {}
+_graph_generation = 0
+_watched_nodes: set = set()
+_hip_callback_installed = False
+
+
+def _bump_graph_generation() -> None:
+    global _graph_generation
+    _graph_generation += 1
+    _upstream_cache.clear()
+    return None
+
+
+def _on_hip_event(event_type) -> None:
+    if event_type in (
+        hou.hipFileEventType.AfterClear,
+        hou.hipFileEventType.AfterLoad,
+        hou.hipFileEventType.AfterMerge,
+    ):
+        # Callbacks died with the old nodes
+        _watched_nodes.clear()
+        _bump_graph_generation()
+    return None
+
+
+def _on_node_event(event_type=None, parm_tuple=None, **kwargs) -> None:
+    if event_type == hou.nodeEventType.ParmTupleChanged:
+        # parm_tuple is None when many parms changed at once
+        if parm_tuple is not None and parm_tuple.name() not in ("node", "enable"):
+            return None
+    _bump_graph_generation()
+    return None
+
+
+def _watch_node(node, is_fetch: bool) -> bool:
+    global _hip_callback_installed
+    try:
+        if not _hip_callback_installed:
+            hou.hipFile.addEventCallback(_on_hip_event)
+            _hip_callback_installed = True
+        key = node.sessionId()
+        if key in _watched_nodes:
+            return True
+        events = [
+            hou.nodeEventType.InputRewired,
+            hou.nodeEventType.NameChanged,
+            hou.nodeEventType.BeingDeleted,
+        ]
+        if is_fetch:
+            events.append(hou.nodeEventType.ParmTupleChanged)
+        node.addEventCallback(tuple(events), _on_node_event)
+        _watched_nodes.add(key)
+    except Exception:
+        return False
+    return True
+
+
+def _fetch_target(node):
+    try:
+        if not node.parm("enable").eval():
+            return None
+        return hou.node(node.parm("node").evalAsString())
+    except Exception:
+        return None
+
+
 def find_all_upstream_nodes(node_path):
+    """Return ``node_path`` and every node upstream of it, depth first.
+
+    Follows node inputs and the targets of enabled ``oom_fetch`` nodes.
+    """
+    cached = _upstream_cache.get(node_path)
+    if cached is not None and cached[0] == _graph_generation:
+        return list(cached[1])
+
+    generation = _graph_generation
     start_node = hou.node(node_path)
     visited = set()
     result = []
-
-    def walk(node):
-        if node.path() in visited:
-            return
-        visited.add(node.path())
+    cacheable = True
+    stack = [start_node]
+    while stack:
+        node = stack.pop()
+        key = node.sessionId()
+        if key in visited:
+            continue
+        visited.add(key)
         result.append(node)
-        for input_node in node.inputs():
-            if input_node is not None:
-                walk(input_node)
+        is_fetch = _normalized_op_name(node) == "oom_fetch"
+        target = _fetch_target(node) if is_fetch else None
+        cacheable = _watch_node(node, is_fetch) and cacheable
+        upstream = [n for n in node.inputs() if n is not None]
+        if target is not None:
+            upstream.append(target)
+        # Reversed so the first input is walked first, as the recursive walk did
+        stack.extend(reversed(upstream))
 
-    walk(start_node)
+    if cacheable and generation == _graph_generation:
+        _upstream_cache[node_path] = (generation, tuple(result))
     return result
 
 
+def _cache_publish_type(target_node):
+    # Disambiguate by publish type based on filename
+    try:
+        fname_expr = target_node.parm("filename").unexpandedString()
+        if ".usd" in fname_expr.lower():
+            return "oom_usd_publish_wedged"
+    except Exception:
+        # Fallback to cache type if filename parm missing
+        pass
+    return oom_cache.CACHE_PUBLISHED_TYPE_CODE
+
+
 def pre_update_cache(upstream_nodes):
+    targets = {}
     for cache_node in upstream_nodes:
         # Normalize node type so both "oom::oom_fetch::0.1" and "oom_fetch" match
         node_type = _normalized_op_name(cache_node)
@@ -62,20 +165,18 @@ def pre_update_cache(upstream_nodes):
             target_node = cache_node
         else:
             continue
-        # refresh versions (disambiguate by publish type based on filename)
-        cache_name = target_node.parm("name").eval()
-        pf_code = None
-        try:
-            fname_expr = target_node.parm("filename").unexpandedString()
-            if ".usd" in fname_expr.lower():
-                pf_code = "oom_usd_publish_wedged"
-            else:
-                pf_code = oom_cache.CACHE_PUBLISHED_TYPE_CODE
-        except Exception:
-            # Fallback to cache type if filename parm missing
-            pf_code = oom_cache.CACHE_PUBLISHED_TYPE_CODE
-
-        versions = oom_cache.get_versions(cache_name, pf_code)
+        # Several fetches may point at the same cache; bump it once
+        targets.setdefault(target_node.path(), target_node)
+
+    lookups = {
+        path: (node.parm("name").eval(), _cache_publish_type(node))
+        for path, node in targets.items()
+    }
+    # One ShotGrid query for the whole graph instead of two per cache
+    published = oom_cache.get_versions_bulk(lookups.values())
+
+    for path, target_node in targets.items():
+        versions = list(published.get(lookups[path], []))
         # append pending version to list
         if not versions:
             new_version = 0
@@ -89,7 +190,12 @@ def pre_update_cache(upstream_nodes):
         target_node.parm("version").set(0)
 
 
-def _cook_node(node_path: str, *, block: bool = True) -> None:
+def _cook_node(
+    node_path: str,
+    *,
+    block: bool = True,
+    progress: Optional[cook_progress.ProgressWriter] = None,
+) -> None:
     """Cook the given TOP node in the current Houdini session.
 
     Parameters
@@ -99,22 +205,84 @@ def _cook_node(node_path: str, *, block: bool = True) -> None:
     block
         If ``True`` this function blocks until cooking completes. When
         ``False`` the cook happens asynchronously.
+    progress
+        Optional writer that publishes work item counts while a blocking
+        cook runs.
     """
     node = hou.node(node_path)
     if not node:
         raise RuntimeError(f"Node {node_path} not found!")
 
+    if progress is not None:
+        progress.attach(node)
     print("[oom] Cooking work items")
-    node.dirtyAllWorkItems(False)
-    node.generateStaticWorkItems(True, nodes=[node])
-    node.cookWorkItems(block, False, False, False, nodes=[node])
+    try:
+        node.dirtyAllWorkItems(False)
+        node.generateStaticWorkItems(True, nodes=[node])
+        node.cookWorkItems(block, False, False, False, nodes=[node])
+    finally:
+        if progress is not None:
+            progress.detach()
     print("[oom] Finished cooking")
 
 
-def cook(hip_file: str, node_path: str) -> None:
+def _set_context_path(hip_name: Optional[str]) -> Optional[str]:
+    """Export the artist's hip path for 456.py; returns the previous value."""
+    previous = os.environ.get(CONTEXT_PATH_ENV)
+    if hip_name:
+        os.environ[CONTEXT_PATH_ENV] = hip_name
+        hou.putenv(CONTEXT_PATH_ENV, hip_name)
+    return previous
+
+
+def _restore_context_path(previous: Optional[str]) -> None:
+    if previous is None:
+        os.environ.pop(CONTEXT_PATH_ENV, None)
+        hou.unsetenv(CONTEXT_PATH_ENV)
+    else:
+        os.environ[CONTEXT_PATH_ENV] = previous
+        hou.putenv(CONTEXT_PATH_ENV, previous)
+    return None
+
+
+def load_and_cook(
+    hip_file: str, node_path: str, hip_name: Optional[str] = None
+) -> None:
+    """Load ``hip_file`` and cook ``node_path`` to completion.
+
+    ``hip_name`` is the artist's path when ``hip_file`` is a snapshot. The
+    session stays named as the snapshot, so $HIPFILE and out-of-process work
+    items keep using the immutable copy; $HIP/$HIPNAME and the Toolkit
+    context follow ``hip_name`` through OOM_HIP_CONTEXT_PATH.
+    Progress goes to OOM_COOK_PROGRESS when the submitter set it.
+    """
+    progress = cook_progress.writer_from_env(node_path, hip_name or hip_file)
+    if progress is not None:
+        progress.set_state("loading")
+    # Set before loading: 456.py runs during the load and reads it
+    previous = _set_context_path(hip_name)
+    try:
+        hou.hipFile.load(hip_file)
+        if hip_name:
+            apply_hip_context(hip_name)
+        _cook_node(node_path, block=True, progress=progress)
+    except Exception as exc:
+        if progress is not None:
+            progress.set_state("failed", str(exc))
+        raise
+    finally:
+        _restore_context_path(previous)
+    if progress is not None:
+        failed = progress.snapshot()["failed"]
+        if failed:
+            progress.set_state("failed", f"{failed} work items failed")
+        else:
+            progress.set_state("succeeded")
+
+
+def cook(hip_file: str, node_path: str, hip_name: Optional[str] = None) -> None:
     """Load ``hip_file`` and cook ``node_path`` in a background hython."""
-    hou.hipFile.load(hip_file)
-    _cook_node(node_path, block=True)
+    load_and_cook(hip_file, node_path, hip_name)
     print("[oom] Exiting")
     sys.exit()
 
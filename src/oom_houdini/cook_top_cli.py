@@ -8,105 +8,112 @@ Bootstrap of the Houdini Python API is handled via `oom_houdini.oom_hou`, so
 this can be run under the system Python (3.11+) with the `oom-core` root on
 `PYTHONPATH` and Houdini environment variables set.
 
+With --daemon (or OOM_COOK_DAEMON=1) the script is a thin client instead: it
+hands the cook to the resident daemon in `oom_houdini.cook_daemon`, which
+keeps recently used hips loaded, and streams progress until the cook ends.
+
 Usage:
-    cook_top_cli.py <hip_name> <node_description>
+    cook_top_cli.py [--daemon] <hip_name> <node_description>
 
 Environment:
     OOM_CLI_SUBPROCESS=1      internal flag to avoid re-forking
     OOM_CLI_DEBUG=1           enable debug traces (node discovery, filtering)
+    OOM_COOK_DAEMON=1         cook through the resident daemon
 """
 
+from __future__ import annotations
+
 import os
 import sys
 
-from oom_houdini.cook_top import _cook_node
-
-# Detach into a background subprocess on first invocation
-if __name__ == "__main__" and not os.environ.get("OOM_CLI_SUBPROCESS"):
-    # Relaunch in a detached session so the cook can continue if the terminal closes
-    import subprocess
-
-    env = os.environ.copy()
-    env["OOM_CLI_SUBPROCESS"] = "1"
-    subprocess.Popen(
-        [sys.executable] + sys.argv,
-        env=env,
-        start_new_session=True,
-        stdin=subprocess.DEVNULL,
-    )
-    sys.exit(0)
-
-import re
-from glob import glob
-
 # enable debug logs when set
 DEBUG = bool(os.environ.get("OOM_CLI_DEBUG"))
 
-# Bootstrap Houdini Python API (must be done before importing hou)
-import hou  # noqa: E402
-
 
 def find_hip_path(hip_name: str) -> str:
     """Find the most recent hip file matching <hip_name> under the current shot context."""
+    from oom_houdini.hip_index import find_latest
+
     shot_path = os.environ.get("OOM_SHOT_PATH")
     if not shot_path:
         print("Error: OOM_SHOT_PATH not set. Run oom-context first.", file=sys.stderr)
         sys.exit(1)
-    # Look for HIP files in any step-specific houdini task folder (per shotgun templates)
-    tasks_root = os.path.join(str(shot_path), "tasks")
-    # patterns: try .hip first, then .hiplc
-    patterns = [f"{hip_name}.v*.hip", f"{hip_name}.v*.hiplc"]
-    candidates: list[str] = []
-    # search under tasks/<Step>/houdini
-    for houdini_dir in glob(os.path.join(tasks_root, "*", "houdini")):
-        for pat in patterns:
-            found = glob(os.path.join(houdini_dir, pat))
-            if found:
-                candidates = found
-                break
-        if candidates:
-            break
-    if not candidates:
+    # Highest <hip_name>.v###.hip(.hiplc) in any tasks/<Step>/houdini folder
+    entry = find_latest(shot_path, hip_name)
+    if entry is None:
+        tasks_root = os.path.join(str(shot_path), "tasks")
         print(
             f"No hip files found matching {hip_name}.v*.hip(.hiplc) in any houdini task under {tasks_root}",
             file=sys.stderr,
         )
         sys.exit(1)
-
-    # Choose the highest numeric version (e.g. v005)
-    def version_key(path: str) -> int:
-        m = re.search(r"\.v(\d+)\.hip", path)
-        return int(m.group(1)) if m else -1
-
-    return max(candidates, key=version_key)
-
-
-def find_top_nodes() -> list[hou.Node]:
-    """Recursively collect all TOP nodes under /obj."""
-    root = hou.node("/obj")
-    if not root:
-        return []
-    result: list[hou.Node] = []
-
-    def walk(node: hou.Node) -> None:
-        for child in node.children():
-            # accept any node in a TOP/PDG context (covers Topnet and PDG networks)
-            cat = child.type().category().name().lower()
-            if "top" in cat or "pdg" in cat:
-                result.append(child)
-                # debug: log node type and category
-                print(
-                    f"[oom:debug] found TOP/PDG node: {child.path()} (type={child.type().name()}, cat={cat})",
-                    file=sys.stderr,
-                )
-            walk(child)
-
-    walk(root)
+    return entry.path
+
+
+def _top_container_types(hou) -> list:
+    """Node types whose children are TOPs (topnets, TOP subnets, HDAs)."""
+    top = hou.topNodeTypeCategory()
+    found = []
+    for category in hou.nodeTypeCategories().values():
+        for node_type in category.nodeTypes().values():
+            try:
+                if node_type.childTypeCategory() == top:
+                    found.append(node_type)
+            except Exception:
+                continue
+    return found
+
+
+def find_top_nodes(root: str = "/obj") -> list:
+    """Collect all TOP nodes under ``root``.
+
+    Every TOP node lives in a TOP-capable network, so this gathers the
+    instances of those network types and their children instead of walking
+    every node in the scene.
+    """
+    import hou
+
+    prefix = root.rstrip("/") + "/"
+    containers = {}
+    for node_type in _top_container_types(hou):
+        for network in node_type.instances():
+            if network.path().startswith(prefix):
+                containers[network.sessionId()] = network
+    result = []
+    for network in containers.values():
+        result.extend(network.children())
+    result.sort(key=lambda node: node.path())
+    if DEBUG:
+        for node in result:
+            print(
+                f"[oom:debug] found TOP node: {node.path()} (type={node.type().name()})",
+                file=sys.stderr,
+            )
     return result
 
 
+def _exact_top_node(description: str):
+    """Return the TOP node at ``description`` when it is an absolute path."""
+    if not description.startswith("/"):
+        return None
+    import hou
+
+    node = hou.node(description)
+    if node is None or node.type().category() != hou.topNodeTypeCategory():
+        return None
+    return node
+
+
 def find_node(description: str) -> str:
-    """Find a single TOP node matching the given description (type or substring)."""
+    """Find a single TOP node matching the given description.
+
+    An absolute path or an exact node name wins; otherwise the description
+    matches as a type keyword or name/path substring. Raises LookupError
+    when nothing or more than one node matches.
+    """
+    exact = _exact_top_node(description)
+    if exact is not None:
+        return exact.path()
     desc = description.lower()
     nodes = find_top_nodes()
     if DEBUG:
@@ -114,6 +121,9 @@ def find_node(description: str) -> str:
             f"[oom:debug] found {len(nodes)} TOP/PDG nodes: {[n.path() for n in nodes]}",
             file=sys.stderr,
         )
+    named = [n for n in nodes if n.name() == description]
+    if len(named) == 1:
+        return named[0].path()
     # Filter by common type keywords
     if "null" in desc:
         nodes = [n for n in nodes if "null" in n.type().name().lower()]
@@ -127,27 +137,51 @@ def find_node(description: str) -> str:
             file=sys.stderr,
         )
     if not candidates:
-        print(
-            f"No TOP nodes found matching description: {description}", file=sys.stderr
-        )
-        sys.exit(1)
+        raise LookupError(f"No TOP nodes found matching description: {description}")
     if len(candidates) > 1:
         paths = ", ".join(n.path() for n in candidates)
-        print(
-            f"Ambiguous description '{description}', candidates: {paths}",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+        raise LookupError(f"Ambiguous description '{description}', candidates: {paths}")
     return candidates[0].path()
 
 
+def _daemon_requested(argv: list[str]) -> bool:
+    if "--daemon" in argv:
+        argv.remove("--daemon")
+        return True
+    return os.environ.get("OOM_COOK_DAEMON", "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def _usage(argv: list[str]) -> None:
+    print(
+        f"Usage: {os.path.basename(argv[0])} [--daemon] <hip_name> <node_description>",
+        file=sys.stderr,
+    )
+    sys.exit(1)
+
+
+def daemon_main(argv: list[str]) -> int:
+    """Cook through the resident daemon; no Houdini import in this process."""
+    from oom_houdini import cook_daemon
+
+    if len(argv) != 3:
+        _usage(argv)
+    hip_path = find_hip_path(argv[1])
+    return cook_daemon.cook(hip_path, description=argv[2])
+
+
 def main(argv: list[str]) -> None:
     if len(argv) != 3:
-        print(
-            f"Usage: {os.path.basename(argv[0])} <hip_name> <node_description>",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+        _usage(argv)
+
+    # Bootstrap Houdini Python API (must be done before importing hou)
+    import hou
+
+    from oom_houdini.cook_top import _cook_node
 
     hip_name, description = argv[1], argv[2]
     hip_path = find_hip_path(hip_name)
@@ -158,11 +192,33 @@ def main(argv: list[str]) -> None:
         print(f"Failed to load hip file: {e}", file=sys.stderr)
         sys.exit(1)
 
-    node_path = find_node(description)
+    try:
+        node_path = find_node(description)
+    except LookupError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
     print(f"[oom] Cooking node: {node_path}")
     _cook_node(node_path, block=True)
     print("[oom] Cook complete.")
 
 
 if __name__ == "__main__":
+    if _daemon_requested(sys.argv):
+        sys.exit(daemon_main(sys.argv))
+
+    # Detach into a background subprocess on first invocation
+    if not os.environ.get("OOM_CLI_SUBPROCESS"):
+        # Relaunch in a detached session so the cook can continue if the terminal closes
+        import subprocess
+
+        env = os.environ.copy()
+        env["OOM_CLI_SUBPROCESS"] = "1"
+        subprocess.Popen(
+            [sys.executable] + sys.argv,
+            env=env,
+            start_new_session=True,
+            stdin=subprocess.DEVNULL,
+        )
+        sys.exit(0)
+
     main(sys.argv)
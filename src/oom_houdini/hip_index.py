@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Per-shot index of hip files under ``<shot>/tasks/<Step>/houdini``.
+
+Globbing every version on every lookup is slow on NFS shots with hundreds
+of saves. The index lists each houdini directory with ``os.scandir`` and
+keeps name, step, version, mtime and size per file. A directory is only
+listed again when its mtime changed (a file was added, removed or renamed),
+so a warm lookup costs one stat per step.
+
+Saving over an existing hip does not touch the directory, so the mtime and
+size in ``shot_index`` entries are as of the last listing. ``find_latest``
+stats the file it returns and reports its current values; callers that
+need exact values for every entry should stat the paths themselves.
+
+The index is kept in memory for long-lived processes and in a JSON file
+per shot (OOM_HIP_INDEX_DIR, default ~/.cache/oom/hip_index) for short ones
+like cook_top_cli. Used by cook_top_cli.find_hip_path. The MCP scene
+listing does not use it: src/ is not importable in the MCP server, and that
+listing sorts on every file's mtime, which needs a stat per file anyway.
+
+    python -m oom_houdini.hip_index <shot_path> [name]
+
+This module does not import Houdini.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HIP_EXTENSIONS = (".hip", ".hiplc", ".hipnc")
+INDEX_VERSION = 1
+_VERSIONED = re.compile(r"^(?P<name>.+)\.v(?P<version>\d+)$")
+
+_memory: Dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][hip_index]", *parts, file=sys.stderr)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+@dataclass(frozen=True)
+class HipEntry:
+    path: str
+    name: str
+    step: str
+    version: Optional[int]
+    ext: str
+    mtime: float
+    size: int
+
+
+def index_dir() -> Path:
+    configured = os.environ.get("OOM_HIP_INDEX_DIR", "").strip()
+    if configured:
+        return Path(configured)
+    return Path.home() / ".cache" / "oom" / "hip_index"
+
+
+def _index_file(shot_path: str) -> Path:
+    digest = hashlib.sha1(shot_path.encode()).hexdigest()[:16]
+    return index_dir() / f"{digest}.json"
+
+
+def parse_hip_name(filename: str) -> Optional[tuple]:
+    """Split ``fx_sim.v012.hiplc`` into ``("fx_sim", 12, ".hiplc")``."""
+    stem, ext = os.path.splitext(filename)
+    if ext not in HIP_EXTENSIONS:
+        return None
+    match = _VERSIONED.match(stem)
+    if match:
+        return match.group("name"), int(match.group("version")), ext
+    return stem, None, ext
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _scan_dir(houdini_dir: str, step: str) -> List[dict]:
+    entries = []
+    with os.scandir(houdini_dir) as it:
+        for item in it:
+            parsed = parse_hip_name(item.name)
+            if parsed is None:
+                continue
+            try:
+                if not item.is_file():
+                    continue
+                stat = item.stat()
+            except OSError:
+                continue
+            name, version, ext = parsed
+            entries.append(
+                asdict(
+                    HipEntry(
+                        path=item.path,
+                        name=name,
+                        step=step,
+                        version=version,
+                        ext=ext,
+                        mtime=stat.st_mtime,
+                        size=stat.st_size,
+                    )
+                )
+            )
+    entries.sort(key=lambda entry: entry["path"])
+    return entries
+
+
+def _load(shot_path: str) -> dict:
+    cached = _memory.get(shot_path)
+    if cached is not None:
+        return cached
+    try:
+        data = json.loads(_index_file(shot_path).read_text())
+        if data.get("version") == INDEX_VERSION and data.get("shot") == shot_path:
+            return data
+    except (OSError, ValueError) as exc:
+        _log_exception("_load", exc)
+    return {"version": INDEX_VERSION, "shot": shot_path, "dirs": {}}
+
+
+def _save(shot_path: str, data: dict) -> None:
+    target = _index_file(shot_path)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".index-", dir=target.parent)
+        with os.fdopen(fd, "w") as handle:
+            json.dump(data, handle)
+        os.replace(tmp_name, target)
+    except OSError as exc:
+        _log_exception("_save", exc)
+    return None
+
+
+def _refresh(shot_path: str) -> dict:
+    data = _load(shot_path)
+    tasks_root = os.path.join(shot_path, "tasks")
+    old_dirs = data.get("dirs", {})
+    dirs: Dict[str, dict] = {}
+    changed = False
+    try:
+        steps = sorted(e.name for e in os.scandir(tasks_root) if e.is_dir())
+    except OSError:
+        steps = []
+    for step in steps:
+        houdini_dir = os.path.join(tasks_root, step, "houdini")
+        mtime = _mtime(houdini_dir)
+        if mtime is None:
+            continue
+        previous = old_dirs.get(step)
+        if previous and previous.get("mtime") == mtime:
+            dirs[step] = previous
+            continue
+        try:
+            entries = _scan_dir(houdini_dir, step)
+        except OSError as exc:
+            _log_exception("_scan_dir", exc)
+            continue
+        dirs[step] = {"mtime": mtime, "entries": entries}
+        changed = True
+        _dprint("rescanned", houdini_dir, len(entries))
+    if set(dirs) != set(old_dirs):
+        changed = True
+    data = {"version": INDEX_VERSION, "shot": shot_path, "dirs": dirs}
+    _memory[shot_path] = data
+    if changed:
+        _save(shot_path, data)
+    return data
+
+
+def shot_index(shot_path) -> List[HipEntry]:
+    """Every hip file in the shot's houdini task folders."""
+    key = os.path.abspath(str(shot_path))
+    with _lock:
+        data = _refresh(key)
+    return [
+        HipEntry(**entry)
+        for step in sorted(data["dirs"])
+        for entry in data["dirs"][step]["entries"]
+    ]
+
+
+def _restat(entry: HipEntry) -> HipEntry:
+    try:
+        stat = os.stat(entry.path)
+    except OSError:
+        return entry
+    return replace(entry, mtime=stat.st_mtime, size=stat.st_size)
+
+
+def find_latest(
+    shot_path, name: str, extensions: tuple = (".hip", ".hiplc")
+) -> Optional[HipEntry]:
+    """Highest version of ``<name>.v*`` across steps; .hip wins a tie."""
+    candidates = [
+        entry
+        for entry in shot_index(shot_path)
+        if entry.name == name and entry.ext in extensions and entry.version is not None
+    ]
+    if not candidates:
+        return None
+    latest = max(
+        candidates,
+        key=lambda e: (e.version, -extensions.index(e.ext), e.mtime),
+    )
+    # An in-place save leaves the directory mtime alone; report the file's own
+    return _restat(latest)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or len(args) > 2:
+        print("Usage: python -m oom_houdini.hip_index <shot_path> [name]")
+        return 1
+    if len(args) == 2:
+        entry = find_latest(args[0], args[1])
+        if entry is None:
+            return 1
+        print(entry.path)
+        return 0
+    for entry in shot_index(args[0]):
+        version = "-" if entry.version is None else f"v{entry.version:03d}"
+        print(f"{entry.step:<12} {entry.name:<32} {version:>6}  {entry.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
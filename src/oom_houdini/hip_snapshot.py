@@ -0,0 +1,203 @@
+"""
+Content-addressed hip snapshots for farm submissions.
+
+Submitting copies the artist's hip into a shared store on RAID, named by the
+SHA-256 of its contents, and the controller loads that immutable copy. Saves
+made after submission cannot change what the farm cooks, and submitting the
+same file again reuses the existing blob without copying it.
+
+Layout under the store root (env OOM_HIP_SNAPSHOT_ROOT):
+
+    blobs/<aa>/<sha256><.hip|.hiplc|.hipnc>      read-only snapshot
+    blobs/<aa>/<sha256><ext>.json                source path, size, first use
+    digests/<sha1 of source path>.json           digest of the source as of
+                                                 its (mtime_ns, size)
+
+The digest record lets an unchanged hip be resubmitted with one stat instead
+of reading the whole file again.
+
+Set OOM_HIP_SNAPSHOTS=0 to submit live hip paths instead.
+
+A controller keeps its session named as the snapshot, so $HIPFILE, and the
+hip that out-of-process work items open, stay on the immutable copy. The
+artist's path travels in OOM_HIP_CONTEXT_PATH: $HIP/$HIPNAME and the Toolkit
+context (456.py) follow it.
+
+This module imports Houdini only inside apply_hip_context, so submit helpers
+can use it.
+"""
+
+from __future__ import annotations
+
+import getpass
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_SNAPSHOT_ROOT = "/mnt/RAID/pdg_snapshots"
+CHUNK_SIZE = 1 << 20
+CONTEXT_PATH_ENV = "OOM_HIP_CONTEXT_PATH"
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+def snapshots_enabled() -> bool:
+    return _env_truthy(os.environ.get("OOM_HIP_SNAPSHOTS", "1"))
+
+
+def snapshot_root() -> Path:
+    return Path(os.environ.get("OOM_HIP_SNAPSHOT_ROOT") or DEFAULT_SNAPSHOT_ROOT)
+
+
+@dataclass(frozen=True)
+class HipSnapshot:
+    path: Path
+    digest: str
+    source: Path
+    reused: bool
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _digest_record(source: Path, root: Optional[Path]) -> Path:
+    base = root or snapshot_root()
+    key = hashlib.sha1(source.as_posix().encode()).hexdigest()
+    return base / "digests" / f"{key}.json"
+
+
+def _stat_key(stat: os.stat_result) -> list:
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def cached_digest(source: Path, root: Optional[Path] = None) -> str:
+    """SHA-256 of ``source``, rehashed only when its mtime or size changed."""
+    stat = source.stat()
+    record_path = _digest_record(source, root)
+    try:
+        record = json.loads(record_path.read_text())
+        if record.get("source") == source.as_posix() and record.get(
+            "stat"
+        ) == _stat_key(stat):
+            return str(record["digest"])
+    except (OSError, ValueError, KeyError):
+        pass
+    digest = file_digest(source)
+    _remember_digest(source, stat, digest, root)
+    return digest
+
+
+def _remember_digest(
+    source: Path, stat: os.stat_result, digest: str, root: Optional[Path]
+) -> None:
+    # Only trust the digest if the file did not change while it was read
+    try:
+        if _stat_key(source.stat()) != _stat_key(stat):
+            return None
+        record_path = _digest_record(source, root)
+        _ensure_dir(record_path.parent)
+        tmp = record_path.with_name(f".{record_path.name}.{os.getpid()}")
+        tmp.write_text(
+            json.dumps(
+                {"source": source.as_posix(), "stat": _stat_key(stat), "digest": digest}
+            )
+        )
+        os.replace(tmp, record_path)
+    except OSError:
+        pass
+    return None
+
+
+def blob_path(digest: str, suffix: str, root: Optional[Path] = None) -> Path:
+    base = root or snapshot_root()
+    return base / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+
+def _ensure_dir(path: Path) -> None:
+    # Shared by every artist; match the pipeline's umask 000 convention
+    if path.is_dir():
+        return None
+    path.mkdir(parents=True, exist_ok=True)
+    try:
+        os.chmod(path, 0o777)
+        os.chmod(path.parent, 0o777)
+    except OSError:
+        pass
+    return None
+
+
+def _copy_hashed(source: Path, dest_dir: Path) -> tuple[Path, str]:
+    # Hash what is actually copied, so a save racing the copy still yields a
+    # blob whose name matches its contents
+    digest = hashlib.sha256()
+    fd, tmp_name = tempfile.mkstemp(prefix=".incoming-", dir=dest_dir)
+    try:
+        with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return Path(tmp_name), digest.hexdigest()
+
+
+def store_snapshot(hip: Path, root: Optional[Path] = None) -> HipSnapshot:
+    """Store ``hip`` in the snapshot store and return the blob to load."""
+    source = Path(hip).expanduser().resolve()
+    suffix = source.suffix or ".hip"
+    digest = cached_digest(source, root)
+    target = blob_path(digest, suffix, root)
+    if target.is_file():
+        return HipSnapshot(target, digest, source, reused=True)
+
+    _ensure_dir(target.parent)
+    stat = source.stat()
+    tmp, digest = _copy_hashed(source, target.parent)
+    _remember_digest(source, stat, digest, root)
+    target = blob_path(digest, suffix, root)
+    _ensure_dir(target.parent)
+    if target.is_file():
+        # Another submit stored the same contents first
+        tmp.unlink(missing_ok=True)
+        return HipSnapshot(target, digest, source, reused=True)
+
+    os.chmod(tmp, 0o444)
+    os.replace(tmp, target)
+    meta = {
+        "source": source.as_posix(),
+        "size": target.stat().st_size,
+        "created": time.time(),
+        "user": getpass.getuser(),
+    }
+    try:
+        target.with_name(target.name + ".json").write_text(json.dumps(meta))
+    except OSError:
+        pass
+    return HipSnapshot(target, digest, source, reused=False)
+
+
+def apply_hip_context(hip_name: str) -> None:
+    """Point $HIP and $HIPNAME at the artist's ``hip_name``.
+
+    The session name, and with it $HIPFILE, is left on the loaded snapshot.
+    """
+    import hou
+
+    folder, filename = os.path.split(hip_name)
+    hou.hscript(f"set -g HIP = '{folder}'")
+    hou.hscript(f"set -g HIPNAME = '{os.path.splitext(filename)[0]}'")
+    hou.hscript("varchange")
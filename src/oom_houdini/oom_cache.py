@@ -3,16 +3,17 @@
 This module assumes ShotGrid Toolkit has been bootstrapped via the ``123.py``
 startup script. The bootstrap stores ``oom_tk`` and ``oom_context`` on
 ``hou.session`` which are used here to resolve template paths and query
-publishes.
+publishes; ``oom_session`` waits for them while the bootstrap is running.
 """
 
 import ast
 import os
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import hou
 
 from oom_houdini.sg_template_utils import build_template_fields
+from oom_houdini.oom_session import session_context, session_tk
 
 CACHE_TEMPLATE_NAME = "oom_houdini_cache"
 # Default PublishedFileType code for generic Houdini cache publishes
@@ -29,8 +30,8 @@ def get_versions(
     ``"oom_usd_publish_wedged"``). This avoids cross-type collisions when different
     publishes share the same code/name.
     """
-    tk = hou.session.oom_tk
-    ctx = hou.session.oom_context
+    tk = session_tk()
+    ctx = session_context()
     sg = tk.shotgun
 
     filters = [
@@ -59,6 +60,50 @@ def get_versions(
     )
 
 
+def get_versions_bulk(
+    requests: Iterable[Tuple[str, Optional[str]]],
+) -> Dict[Tuple[str, Optional[str]], List[int]]:
+    """Return sorted published versions for many ``(cache_name, type)`` pairs.
+
+    Same result as calling :func:`get_versions` per pair, but in a single
+    ShotGrid query: the publish type is matched through the linked
+    PublishedFileType code and the versions are grouped locally. A type of
+    ``None`` matches publishes of any type.
+    """
+    keys = list(dict.fromkeys(requests))
+    result: Dict[Tuple[str, Optional[str]], List[int]] = {key: [] for key in keys}
+    if not keys:
+        return result
+
+    tk = session_tk()
+    ctx = session_context()
+    sg = tk.shotgun
+
+    type_field = "published_file_type.PublishedFileType.code"
+    filters = [
+        ["project", "is", ctx.project],
+        ["entity", "is", ctx.entity],
+        ["code", "in", sorted({name for name, _ in keys})],
+    ]
+    pf_codes = {pf_code for _, pf_code in keys}
+    if None not in pf_codes:
+        filters.append([type_field, "in", sorted(pf_codes)])
+
+    pubs = sg.find("PublishedFile", filters, ["code", "version_number", type_field])
+    found: Dict[Tuple[str, Optional[str]], set] = {key: set() for key in keys}
+    for pub in pubs:
+        version = pub.get("version_number")
+        if version is None:
+            continue
+        name = pub.get("code")
+        for key in ((name, pub.get(type_field)), (name, None)):
+            if key in found:
+                found[key].add(version)
+    for key, versions in found.items():
+        result[key] = sorted(versions)
+    return result
+
+
 def cache_versions_update(cache_name, versions):
     if not hasattr(hou.session, "oom_cache_versions"):
         hou.session.oom_cache_versions = {}
@@ -131,7 +176,7 @@ def populate_cache(kwargs: dict) -> None:
     This resolves the cache file path using the ShotGrid template and updates
     the version menu from existing publishes.
     """
-    tk = hou.session.oom_tk
+    tk = session_tk()
     template = tk.templates["oom_houdini_cache"]
     node = kwargs["node"]
     name_parm = kwargs["parm"]
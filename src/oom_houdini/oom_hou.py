@@ -42,19 +42,132 @@ from pathlib import Path
 # os.environ.setdefault("HHP", str(HOUDINI_PYTHON_LIB))
 
 # --- Official Houdini setup via houdini_setup.sh ---
+import hashlib
+import json
 import subprocess
 
+# Bump when the cached delta format changes
+_ENV_CACHE_VERSION = 2
+# Caller variables the setup reads or rewrites; their values are part of the
+# cache key, along with every HOUDINI_* variable
+_ENV_CACHE_INPUTS = (
+    "HFS",
+    "HH",
+    "HHP",
+    "HB",
+    "HD",
+    "HT",
+    "HSB",
+    "PATH",
+    "LD_LIBRARY_PATH",
+    "PYTHONPATH",
+    "HOME",
+)
 
-def _capture_houdini_env(hfs_path: str) -> None:
-    """Source houdini_setup.sh and import all resulting env vars into os.environ."""
+
+def _run_houdini_setup(hfs_path: str) -> dict:
+    """Source houdini_setup_bash in a login shell and return the resulting env."""
     # Change to HFS root so houdini_setup_bash correctly detects its install directory
     bash_cmd = ["bash", "-lc", f"cd {hfs_path} && source houdini_setup_bash && env -0"]
     out = subprocess.check_output(bash_cmd)
+    env = {}
     for kv in out.split(b"\0"):
         if not kv:
             continue
         key, val = kv.split(b"=", 1)
-        os.environ[key.decode()] = val.decode()
+        env[key.decode()] = val.decode()
+    return env
+
+
+def _env_delta(before: dict, after: dict) -> dict:
+    """Describe what the setup changed, relative to the env it started from.
+
+    Path-like variables the setup extends are stored as a prefix/suffix so a
+    cached delta still composes with the caller's own PATH, PYTHONPATH, ...
+    """
+    delta = {}
+    for key, value in after.items():
+        old = before.get(key)
+        if old == value:
+            continue
+        if old and value.endswith(old):
+            delta[key] = {"prepend": value[: -len(old)]}
+        elif old and value.startswith(old):
+            delta[key] = {"append": value[len(old) :]}
+        else:
+            delta[key] = {"set": value}
+    return delta
+
+
+def _apply_env_delta(delta: dict) -> None:
+    for key, change in delta.items():
+        current = os.environ.get(key, "")
+        if "prepend" in change:
+            os.environ[key] = change["prepend"] + current
+        elif "append" in change:
+            os.environ[key] = current + change["append"]
+        else:
+            os.environ[key] = change["set"]
+
+
+def _env_inputs_digest(env: dict) -> str:
+    names = set(_ENV_CACHE_INPUTS)
+    names.update(key for key in env if key.startswith("HOUDINI_"))
+    values = {name: env.get(name) for name in sorted(names)}
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode()).hexdigest()
+
+
+def _env_cache_file(hfs_path: str, setup_script: Path):
+    """Cache location for this HFS and caller env, or None.
+
+    The key covers HFS, the setup script's mtime and size, and the caller's
+    setup-relevant variables. A "set" entry records the value the setup
+    produced from this caller's env, so it is only replayed for callers with
+    the same inputs.
+    """
+    enabled = os.environ.get("OOM_HOU_ENV_CACHE", "1").strip().lower()
+    if enabled in ("0", "false", "no", "off"):
+        return None
+    try:
+        stat = setup_script.stat()
+    except OSError:
+        return None
+    key = (
+        f"{_ENV_CACHE_VERSION}:{Path(hfs_path).resolve()}:{stat.st_mtime_ns}:"
+        f"{stat.st_size}:{_env_inputs_digest(dict(os.environ))}"
+    )
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    cache_dir = os.environ.get("OOM_HOU_ENV_CACHE_DIR") or (
+        Path.home() / ".cache" / "oom" / "houdini_env"
+    )
+    return Path(cache_dir) / f"{digest}.json"
+
+
+def _capture_houdini_env(hfs_path: str) -> None:
+    """Apply the env changes of houdini_setup_bash to os.environ.
+
+    The changes are cached on disk, keyed by HFS, the setup script's mtime
+    and the caller's setup-relevant env, so only the first import with a
+    given env pays for the login shell.
+    """
+    cache_file = _env_cache_file(hfs_path, Path(hfs_path) / "houdini_setup_bash")
+    delta = None
+    if cache_file is not None:
+        try:
+            delta = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            delta = None
+    if delta is None:
+        delta = _env_delta(dict(os.environ), _run_houdini_setup(hfs_path))
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}")
+                tmp.write_text(json.dumps(delta))
+                os.replace(tmp, cache_file)
+            except OSError:
+                pass
+    _apply_env_delta(delta)
 
 
 # Determine HFS root (fall back to default if necessary)
@@ -3,6 +3,7 @@ import os
 import hou
 
 import oom_houdini.oom_cache as _cache
+from oom_houdini.oom_session import session_tk
 from oom_houdini.sg_template_utils import build_template_fields
 
 # Alias reusable cache helpers; override refresh for USD specificity
@@ -20,7 +21,7 @@ def populate_lop(kwargs: dict) -> None:
     Builds the publish file path using the ``oom_usd_publish_wedged`` ShotGrid
     template and updates version tracking parameters.
     """
-    tk = hou.session.oom_tk
+    tk = session_tk()
     template = tk.templates["oom_usd_publish_wedged"]
     node = kwargs["node"]
     name_parm = kwargs["parm"]
@@ -1,4 +1,5 @@
 import oom_houdini.oom_cache as _cache
+from oom_houdini.oom_session import session_tk
 from oom_houdini.sg_template_utils import build_template_fields
 import hou
 import os
@@ -18,7 +19,7 @@ def populate_lop(kwargs: dict) -> None:
     Builds the publish file path using the ``oom_renderpass`` ShotGrid
     template and updates version tracking parameters.
     """
-    tk = hou.session.oom_tk
+    tk = session_tk()
     template = tk.templates["oom_renderpass"]
     node = kwargs["node"]
     name_parm = kwargs["parm"]
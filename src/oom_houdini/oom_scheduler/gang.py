@@ -0,0 +1,211 @@
+"""
+Gang admission for distributed simulations.
+
+Work items that carry the scheduler's partition attribute (``gang`` by
+default) are held back until every member of their gang has been scheduled
+by PDG and the farm has room for all of them at once. The members (tracker
+first) are then submitted together, so a sliced sim never sits half Running
+and half Pending.
+
+Attributes read from each work item:
+    <gang attrib>       gang key shared by the tracker and all slices
+    gang_size           total number of members in the gang (tracker included)
+    gang_role           "tracker" for the sim tracker, anything else for slices
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_GANG_ATTRIB = "gang"
+GANG_SIZE_ATTRIB = "gang_size"
+GANG_ROLE_ATTRIB = "gang_role"
+FARM_NODE_SELECTOR = "oom/farm=true,oom/schedulable=true"
+# Must match the node affinity in pdg-job-cpu.yaml / pdg-job-gpu.yaml
+GPU_NODE_SELECTOR = "oom/farm=true,oom/schedulable=true,oom/gpu=true"
+# Minimum seconds between capacity probes for the same waiting gang
+CAPACITY_RETRY_SECONDS = 5.0
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][gang]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def work_item_attrib(work_item, name: str):
+    # Generic attribute lookup across PDG attribute types
+    if not name:
+        return None
+    getter = getattr(work_item, "attribValue", None)
+    if callable(getter):
+        try:
+            value = getter(name)
+            if value is not None and value != "":
+                return value
+        except Exception as exc:
+            _log_exception("work_item_attrib:attribValue", exc)
+    for method in ("stringAttribValue", "intAttribValue"):
+        getter = getattr(work_item, method, None)
+        if not callable(getter):
+            continue
+        try:
+            value = getter(name)
+        except Exception:
+            continue
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def node_free_capacity(core_api, gpu: bool = False) -> Optional[List[Dict[str, float]]]:
+    """Return free cpu/memory/gpu per farm node (allocatable minus requests).
+
+    Returns None when the cluster-scoped node/pod listing is not permitted
+    (or otherwise rejected by the API server), so callers can skip the
+    capacity gate instead of failing.
+    """
+    from kubernetes.client import ApiException
+
+    try:
+        return _node_free_capacity(core_api, gpu)
+    except ApiException as exc:
+        print(f"[oom] Gang capacity check unavailable ({exc.status} {exc.reason})")
+        return None
+
+
+def _node_free_capacity(core_api, gpu: bool) -> List[Dict[str, float]]:
+    from oom_kube.helpers import parse_quantity
+
+    selector = GPU_NODE_SELECTOR if gpu else FARM_NODE_SELECTOR
+    nodes = core_api.list_node(label_selector=selector)
+    free: Dict[str, Dict[str, float]] = {}
+    for node in getattr(nodes, "items", []) or []:
+        spec = getattr(node, "spec", None)
+        if getattr(spec, "unschedulable", False):
+            continue
+        alloc = getattr(getattr(node, "status", None), "allocatable", None) or {}
+        free[node.metadata.name] = {
+            "cpu": parse_quantity(alloc.get("cpu", "0")),
+            "memory": parse_quantity(alloc.get("memory", "0")),
+            "gpu": parse_quantity(alloc.get("nvidia.com/gpu", "0")),
+        }
+    if not free:
+        return []
+
+    pods = core_api.list_pod_for_all_namespaces(
+        field_selector="status.phase!=Succeeded,status.phase!=Failed"
+    )
+    for pod in getattr(pods, "items", []) or []:
+        node_name = getattr(getattr(pod, "spec", None), "node_name", None)
+        if node_name not in free:
+            continue
+        for container in getattr(pod.spec, "containers", None) or []:
+            requests = (
+                getattr(getattr(container, "resources", None), "requests", None) or {}
+            )
+            free[node_name]["cpu"] -= parse_quantity(requests.get("cpu", "0"))
+            free[node_name]["memory"] -= parse_quantity(requests.get("memory", "0"))
+            free[node_name]["gpu"] -= parse_quantity(
+                requests.get("nvidia.com/gpu", "0")
+            )
+    return list(free.values())
+
+
+def gang_fits(requests: List[Dict[str, float]], free: List[Dict[str, float]]) -> bool:
+    """First-fit-decreasing placement of every member onto the free nodes."""
+    bins = [dict(node) for node in free]
+    ordered = sorted(
+        requests, key=lambda r: (r.get("cpu", 0), r.get("memory", 0)), reverse=True
+    )
+    for request in ordered:
+        for node in bins:
+            if all(node.get(key, 0) >= request.get(key, 0) for key in request):
+                for key in request:
+                    node[key] = node.get(key, 0) - request.get(key, 0)
+                break
+        else:
+            return False
+    return True
+
+
+class GangCoordinator:
+    def __init__(self):
+        # gang key -> {"size": int, "items": {work item id: work item}}
+        self._pending: Dict[str, dict] = {}
+        self._submitted: Dict[int, str] = {}
+        self._last_probe: Dict[str, float] = {}
+
+    def gang_key(self, work_item, attrib: str) -> Optional[Tuple[str, int]]:
+        key = work_item_attrib(work_item, attrib)
+        if key is None:
+            return None
+        try:
+            size = int(work_item_attrib(work_item, GANG_SIZE_ATTRIB) or 0)
+        except (TypeError, ValueError):
+            size = 0
+        if size <= 0:
+            _dprint("gang_key", f"missing {GANG_SIZE_ATTRIB}", f"gang={key}")
+            return None
+        return str(key), size
+
+    def is_submitted(self, work_item) -> bool:
+        return int(getattr(work_item, "id", -1)) in self._submitted
+
+    def add(self, work_item, key: str, size: int) -> Optional[List]:
+        """Register a member; return the full gang once every member arrived."""
+        gang = self._pending.setdefault(key, {"size": size, "items": {}})
+        gang["size"] = max(int(gang["size"]), size)
+        gang["items"][int(work_item.id)] = work_item
+        if len(gang["items"]) < gang["size"]:
+            _dprint("add", f"gang={key}", f"{len(gang['items'])}/{gang['size']}")
+            return None
+
+        # Tracker first so slices find it when they start
+        def _order(item):
+            role = str(work_item_attrib(item, GANG_ROLE_ATTRIB) or "").lower()
+            return (0 if role == "tracker" else 1, int(item.id))
+
+        return sorted(gang["items"].values(), key=_order)
+
+    def should_probe(self, key: str) -> bool:
+        # Every deferred member is rescheduled; only probe capacity periodically
+        now = time.monotonic()
+        last = self._last_probe.get(key)
+        if last is not None and now - last < CAPACITY_RETRY_SECONDS:
+            return False
+        self._last_probe[key] = now
+        return True
+
+    def mark_submitted(self, key: str) -> None:
+        self._last_probe.pop(key, None)
+        gang = self._pending.pop(key, None)
+        if not gang:
+            return None
+        for wi_id in gang["items"]:
+            self._submitted[int(wi_id)] = key
+        return None
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._submitted.clear()
+        self._last_probe.clear()
+        return None
@@ -88,6 +88,7 @@ def build_job_manifest(
     mem_gi: Optional[str],
     gpu: Union[int, str, None] = 0,
     priority_class: Optional[str] = "farm-default",
+    labels: Optional[dict] = None,
 ) -> dict:
     gpu_count = _coerce_gpu(gpu)
     resolved_template = template or (GPU_TEMPLATE if gpu_count > 0 else CPU_TEMPLATE)
@@ -127,7 +128,19 @@ def build_job_manifest(
         }
     )
 
-    return _render_template(resolved_template, context)
+    manifest = _render_template(resolved_template, context)
+    if labels:
+        _apply_labels(manifest, labels)
+    return manifest
+
+
+def _apply_labels(manifest: dict, labels: dict) -> None:
+    # Extra labels on both the Job and its pod template
+    metadata = manifest.setdefault("metadata", {})
+    metadata.setdefault("labels", {}).update(labels)
+    pod_meta = manifest.setdefault("spec", {}).setdefault("template", {})
+    pod_meta.setdefault("metadata", {}).setdefault("labels", {}).update(labels)
+    return None
 
 
 def build_service_job_manifest(
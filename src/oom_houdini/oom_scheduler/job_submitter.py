@@ -32,11 +32,27 @@ def _log_exception(context: str, exc: Exception) -> None:
     return None
 
 
+def _timestamp(value) -> Optional[float]:
+    # Kubernetes datetimes -> epoch seconds
+    try:
+        return value.timestamp() if value is not None else None
+    except Exception:
+        return None
+
+
 class _ActiveJobInfo(TypedDict):
     namespace: str
     job_name: str
     work_item_id: int
     work_item_name: str
+    # Usage ledger fields (see oom_houdini.usage_ledger)
+    artist: str
+    shot: str
+    top_node: str
+    workload: str
+    cpu_request: float
+    mem_request_gib: float
+    gpu_request: float
 
 
 class JobSubmitter:
@@ -49,8 +65,12 @@ class JobSubmitter:
         self._python_bin = os.environ.get("PDG_PYTHON", DEFAULT_PYTHON)
         self._hython_bin = os.environ.get("PDG_HYTHON", DEFAULT_HYTHON)
         self._active_jobs: Dict[Tuple[str, str], _ActiveJobInfo] = {}
+        # work item id -> (namespace, job name); kept after jobs finish so
+        # log/status URIs still resolve for completed items
+        self._work_item_jobs: Dict[int, Tuple[str, str]] = {}
         self._batch_api = None
         self._core_api = None
+        self._custom_api = None
         self._kube_client_mod = None
 
     def submit_work_item(
@@ -61,32 +81,103 @@ class JobSubmitter:
         result_server: Optional[str],
     ):
         import pdg
-        from oom_houdini.oom_scheduler.job_builder import build_job_manifest
         from oom_kube.helpers import load_kube, create_job
 
-        owner = self._owner
-        owner.createJobDirsAndSerializeWorkItems(work_item)
+        namespace, job_name, manifest = self._build_work_item_job(
+            work_item, mq_client_id=mq_client_id, result_server=result_server
+        )
 
-        wi_id = str(work_item.id)
-        wi_name = str(work_item.name)
-        wi_job_name = work_item.stringAttribValue("job_name")
-        cook_id = getattr(owner, "_cook_id", "") or ""
+        load_kube()
+        batch_api = self._ensure_batch_api()
+        if batch_api is None:
+            raise RuntimeError("Failed to initialize Kubernetes client")
+        job_resource = create_job(batch_api, manifest)
+        self._track_job(namespace, job_name, manifest, job_resource, work_item)
 
-        job_name_input_parts = []
-        for part in (
-            (wi_job_name.strip() if wi_job_name else ""),
-            wi_name,
-            wi_id,
-            cook_id,
-        ):
-            if part:
-                job_name_input_parts.append(part)
-        job_name_input = "_".join(job_name_input_parts)
-        job_name = self._sanitize_job_name(job_name_input)
-        namespace = "dcc"
+        return pdg.scheduleResult.Succeeded
 
-        item_command = self._resolve_item_command(work_item)
-        wrapper_command = self._wrap_with_pdgjobcmd(item_command)
+    def submit_gang(
+        self,
+        work_items: list,
+        *,
+        gang_key: str,
+        mq_client_id: Optional[str],
+        result_server: Optional[str],
+    ) -> bool:
+        """
+        Submit every member of a gang, or none of them.
+
+        Returns False (nothing submitted) when the farm cannot place the
+        whole gang right now. Raises when no Kubernetes client is available,
+        as submit_work_item does, or when a job creation fails, after deleting
+        the members created so far. Without RBAC to list nodes and pods the
+        capacity gate is skipped and the members are submitted as usual.
+        """
+        from oom_kube.helpers import load_kube, create_job, delete_job
+        from oom_houdini.oom_scheduler.gang import gang_fits, node_free_capacity
+
+        requests = [self.member_request() for _ in work_items]
+        core_api = self._ensure_core_api()
+        if core_api is None:
+            # Not a capacity problem: deferring would wait forever
+            raise RuntimeError("Failed to initialize Kubernetes client")
+        gpu = any(r.get("gpu", 0) > 0 for r in requests)
+        free = node_free_capacity(core_api, gpu=gpu)
+        if free is None:
+            _dprint("submit_gang:no_capacity_check", f"gang={gang_key}")
+        elif not gang_fits(requests, free):
+            _dprint("submit_gang:deferred", f"gang={gang_key}", len(work_items))
+            return False
+
+        labels = {"oom/gang": self._sanitize_job_name(gang_key)}
+        jobs = [
+            (
+                work_item,
+                self._build_work_item_job(
+                    work_item,
+                    mq_client_id=mq_client_id,
+                    result_server=result_server,
+                    labels=labels,
+                ),
+            )
+            for work_item in work_items
+        ]
+
+        load_kube()
+        batch_api = self._ensure_batch_api()
+        if batch_api is None:
+            raise RuntimeError("Failed to initialize Kubernetes client")
+
+        created = []
+        try:
+            for work_item, (namespace, job_name, manifest) in jobs:
+                job_resource = create_job(batch_api, manifest)
+                created.append((namespace, job_name, manifest, job_resource, work_item))
+        except Exception:
+            # Roll back so a partial gang never holds cores
+            for namespace, job_name, _, _, _ in created:
+                try:
+                    delete_job(batch_api, namespace, job_name)
+                except Exception as exc:
+                    _log_exception("submit_gang:rollback", exc)
+            raise
+
+        for namespace, job_name, manifest, job_resource, work_item in created:
+            self._track_job(namespace, job_name, manifest, job_resource, work_item)
+        _dprint("submit_gang:submitted", f"gang={gang_key}", len(created))
+        return True
+
+    def member_request(self) -> Dict[str, float]:
+        # Per-job resource request in the units parse_quantity returns
+        cpu_arg, mem_arg, gpu_flag, _ = self._resource_args()
+        return {
+            "cpu": float(cpu_arg),
+            "memory": float(mem_arg) * 1024**3,
+            "gpu": float(gpu_flag),
+        }
+
+    def _resource_args(self) -> Tuple[str, str, int, str]:
+        owner = self._owner
 
         # Read scheduler parameters for GPU and priority class
         try:
@@ -118,6 +209,49 @@ class JobSubmitter:
         # Preserve previous defaults when parms are unset
         cpu_arg = str(int(cpu_cores)) if int(cpu_cores) > 0 else "10"
         mem_arg = str(int(ram_gb)) if int(ram_gb) > 0 else "32"
+        return cpu_arg, mem_arg, gpu_flag, priority_class
+
+    def _build_work_item_job(
+        self,
+        work_item,
+        *,
+        mq_client_id: Optional[str],
+        result_server: Optional[str],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, str, dict]:
+        from oom_houdini.oom_scheduler.job_builder import build_job_manifest
+        from oom_houdini.oom_scheduler.resume import rewrite_start_frame
+
+        owner = self._owner
+        owner.createJobDirsAndSerializeWorkItems(work_item)
+
+        wi_id = str(work_item.id)
+        wi_name = str(work_item.name)
+        wi_job_name = work_item.stringAttribValue("job_name")
+        cook_id = getattr(owner, "_cook_id", "") or ""
+
+        job_name_input_parts = []
+        for part in (
+            (wi_job_name.strip() if wi_job_name else ""),
+            wi_name,
+            wi_id,
+            cook_id,
+        ):
+            if part:
+                job_name_input_parts.append(part)
+        job_name_input = "_".join(job_name_input_parts)
+        job_name = self._sanitize_job_name(job_name_input)
+        namespace = "dcc"
+
+        item_command = self._resolve_item_command(work_item)
+        resume_manifest = self._prepare_resume(work_item, job_name, item_command)
+        if resume_manifest:
+            item_command, _ = rewrite_start_frame(item_command)
+        wrapper_command = self._wrap_with_pdgjobcmd(
+            item_command, resume_manifest=resume_manifest
+        )
+
+        cpu_arg, mem_arg, gpu_flag, priority_class = self._resource_args()
 
         manifest = build_job_manifest(
             None,
@@ -137,30 +271,59 @@ class JobSubmitter:
             mem_arg,
             gpu=gpu_flag,
             priority_class=priority_class,
+            labels=labels,
         )
+        return namespace, job_name, manifest
 
-        load_kube()
-        batch_api = self._ensure_batch_api()
-        if batch_api is None:
-            raise RuntimeError("Failed to initialize Kubernetes client")
-        job_resource = create_job(batch_api, manifest)
-
+    def _track_job(
+        self, namespace: str, job_name: str, manifest: dict, job_resource, work_item
+    ) -> None:
         submitted_name = str(
             getattr(getattr(job_resource, "metadata", None), "name", None)
             or manifest.get("metadata", {}).get("name")
             or job_name
         )
+        labels = manifest.get("metadata", {}).get("labels") or {}
+        request = self.member_request()
+        try:
+            top_node = str(work_item.node.path())
+        except Exception:
+            top_node = ""
         self._active_jobs[(namespace, submitted_name)] = cast(
             _ActiveJobInfo,
             {
                 "namespace": namespace,
                 "job_name": submitted_name,
                 "work_item_id": int(getattr(work_item, "id", 0) or 0),
-                "work_item_name": wi_name,
+                "work_item_name": str(work_item.name),
+                "artist": str(labels.get("oom/artist") or ""),
+                "shot": os.environ.get("OOM_SHOT_ID", "") or "",
+                "top_node": top_node,
+                "workload": str(labels.get("oom/workload") or ""),
+                "cpu_request": request["cpu"],
+                "mem_request_gib": request["memory"] / 1024**3,
+                "gpu_request": request["gpu"],
             },
         )
+        self._work_item_jobs[int(getattr(work_item, "id", 0) or 0)] = (
+            namespace,
+            submitted_name,
+        )
+        return None
 
-        return pdg.scheduleResult.Succeeded
+    def active_job_count(self) -> int:
+        return len(self._active_jobs)
+
+    def job_for_work_item(self, work_item_id: int) -> Optional[Tuple[str, str]]:
+        # Resolve the (namespace, job name) a work item was submitted as
+        try:
+            return self._work_item_jobs.get(int(work_item_id))
+        except (TypeError, ValueError):
+            return None
+
+    def has_job(self, namespace: str, job_name: str) -> bool:
+        # Whether this scheduler submitted (namespace, job name)
+        return (namespace, job_name) in set(self._work_item_jobs.values())
 
     def _sanitize_job_name(self, work_item_name: str) -> str:
         text = (work_item_name or "").strip()
@@ -198,7 +361,30 @@ class JobSubmitter:
         parts = shlex.split(command)
         return " ".join(shlex.quote(arg) for arg in parts)
 
-    def _wrap_with_pdgjobcmd(self, item_command: str) -> str:
+    def _prepare_resume(self, work_item, job_name: str, item_command: str):
+        # Record expected frame outputs so a restarted pod can skip ahead
+        try:
+            from oom_houdini.oom_scheduler.resume import (
+                expected_outputs,
+                rewrite_start_frame,
+                write_manifest,
+            )
+
+            if not rewrite_start_frame(item_command)[1]:
+                return None
+            outputs = expected_outputs(work_item)
+            if not outputs:
+                return None
+            return write_manifest(
+                self._owner.workingDir(False) or "", job_name, outputs
+            )
+        except Exception as exc:
+            _log_exception("_prepare_resume", exc)
+            return None
+
+    def _wrap_with_pdgjobcmd(
+        self, item_command: str, resume_manifest: Optional[str] = None
+    ) -> str:
         # use the scheduler-provided hython so Houdini modules are available
         hython = self._owner._hythonBin()
         pdgjobcmd = f"{self._hfs}/houdini/python3.11libs/pdgjob/pdgjobcmd.py"
@@ -227,6 +413,29 @@ class JobSubmitter:
             PDG_SUCCESS
         """).strip()
 
+        resume_snippet = ""
+        if resume_manifest:
+            from oom_houdini.oom_scheduler.resume import PROBE_SCRIPT
+
+            # On a retry, continue from the last complete frame on disk. The
+            # probe only reads JSON, so plain Python runs it instead of hython
+            python = shlex.quote(self._python_bin)
+            manifest = shlex.quote(resume_manifest)
+            resume_snippet = "\n".join(
+                [
+                    f"OOM_RESUME_FRAME=\"$({python} - {manifest} <<'PDG_RESUME' | tail -n 1",
+                    PROBE_SCRIPT.rstrip(),
+                    "PDG_RESUME",
+                    ')" || OOM_RESUME_FRAME=""',
+                    'if [ -n "$OOM_RESUME_FRAME" ]; then',
+                    '    echo "[oom] Resuming work item from frame $OOM_RESUME_FRAME"',
+                    "    export OOM_RESUME_FRAME",
+                    "else",
+                    "    unset OOM_RESUME_FRAME",
+                    "fi",
+                ]
+            )
+
         main_cmd = (
             f"{shlex.quote(hython)} {shlex.quote(pdgjobcmd)} "
             f"--hfs {shlex.quote(self._hfs)} --norpc --keepalive 10 --sendstatus {item_command}"
@@ -236,6 +445,7 @@ class JobSubmitter:
             f"""
             set -euo pipefail
             umask 000
+            {resume_snippet}
             {start_snippet}
             {main_cmd}
             rc=$?
@@ -306,6 +516,9 @@ class JobSubmitter:
                                 "job_name": job_name,
                                 "namespace": namespace,
                                 "message": "Job not found (deleted)",
+                                "info": info,
+                                "started_at": None,
+                                "finished_at": None,
                             }
                         )
                         self._active_jobs.pop(key, None)
@@ -327,6 +540,9 @@ class JobSubmitter:
                     "job_name": job_name,
                     "namespace": namespace,
                     "message": outcome.get("message", ""),
+                    "info": info,
+                    "started_at": _timestamp(getattr(status, "start_time", None)),
+                    "finished_at": _timestamp(getattr(status, "completion_time", None)),
                 }
             )
             self._active_jobs.pop(key, None)
@@ -407,6 +623,23 @@ class JobSubmitter:
             self._core_api = None
         return self._core_api
 
+    def _ensure_custom_api(self):
+        if self._custom_api is not None:
+            return self._custom_api
+        try:
+            from kubernetes import client
+            from oom_kube.helpers import load_kube
+        except Exception as exc:
+            _log_exception("_ensure_custom_api:import", exc)
+            return None
+        try:
+            load_kube()
+            self._custom_api = client.CustomObjectsApi()
+        except Exception as exc:
+            _log_exception("_ensure_custom_api:init", exc)
+            self._custom_api = None
+        return self._custom_api
+
     def _delete_job_resource(self, namespace: str, job_name: str) -> None:
         if not namespace or not job_name:
             return
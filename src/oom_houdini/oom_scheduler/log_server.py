@@ -0,0 +1,410 @@
+import html
+import json
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+
+DEFAULT_CACHE_TTL = 5.0
+DEFAULT_TAIL_LINES = 2000
+# Log bodies kept in memory; least recently read are dropped first
+MAX_CACHE_ENTRIES = 128
+FINISHED_PHASES = ("Succeeded", "Failed")
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][log_server]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def _advertised_host() -> str:
+    # Prefer an explicit override, then the host's routable address
+    host = (os.environ.get("OOM_LOG_SERVER_HOST") or "").strip()
+    if host:
+        return host
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except Exception as exc:
+        _log_exception("_advertised_host", exc)
+        return socket.gethostname()
+
+
+def _bind_host() -> str:
+    # Listen only on the farm-facing address unless told otherwise; the
+    # server proxies pod logs with the scheduler's kube credentials
+    host = (os.environ.get("OOM_LOG_SERVER_BIND") or "").strip()
+    return host or _advertised_host()
+
+
+def _pod_sort_key(pod) -> float:
+    created = getattr(getattr(pod, "metadata", None), "creation_timestamp", None)
+    try:
+        return created.timestamp() if created is not None else 0.0
+    except Exception:
+        return 0.0
+
+
+class LogServer:
+    """
+    Local HTTP endpoint serving pod logs and status pages for work item jobs.
+
+    Logs are fetched lazily from Kubernetes when a URI is opened. Finished
+    pods are cached until evicted from a small LRU, running pods for a short
+    TTL so repeated refreshes do not hammer the API server. Passing
+    ``follow=1`` streams the log as the pod writes it.
+
+    Only jobs accepted by ``job_known(namespace, job_name)`` are served;
+    anything else is a 404, so the server cannot be used to read other
+    namespaces' pods.
+
+    Routes:
+        /logs/<namespace>/<job_name>?tail=<lines>&follow=1
+        /status/<namespace>/<job_name>
+        /diagnostics                  scheduler/MQ metrics as JSON
+    """
+
+    def __init__(
+        self,
+        core_api_factory: Callable[[], object],
+        batch_api_factory: Callable[[], object],
+        *,
+        port: Optional[int] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        diagnostics: Optional[Callable[[], dict]] = None,
+        job_known: Optional[Callable[[str, str], bool]] = None,
+    ):
+        self._core_api_factory = core_api_factory
+        self._job_known = job_known
+        self._diagnostics = diagnostics
+        self._batch_api_factory = batch_api_factory
+        if port is None:
+            try:
+                port = int(os.environ.get("OOM_LOG_SERVER_PORT", "0") or 0)
+            except ValueError:
+                port = 0
+        self._port = port
+        self._cache_ttl = cache_ttl
+        self._cache: OrderedDict[Tuple[str, str, int], Tuple[float, str, bool]]
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._host = ""
+
+    # Function Defs
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    def start(self) -> None:
+        if self._server is not None:
+            return None
+
+        handler = _make_handler(self)
+        self._host = _advertised_host()
+        self._server = ThreadingHTTPServer((_bind_host(), self._port), handler)
+        self._server.daemon_threads = True
+        self._port = int(self._server.server_address[1])
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="oom-log-server",
+            daemon=True,
+        )
+        self._thread.start()
+        _dprint("started", f"{self._host}:{self._port}")
+        return None
+
+    def stop(self) -> None:
+        if self._server is None:
+            return None
+        try:
+            self._server.shutdown()
+            self._server.server_close()
+        except Exception as exc:
+            _log_exception("stop", exc)
+        self._server = None
+        self._thread = None
+        with self._cache_lock:
+            self._cache.clear()
+        return None
+
+    def log_uri(self, namespace: str, job_name: str) -> Optional[str]:
+        return self._uri("logs", namespace, job_name)
+
+    def status_uri(self, namespace: str, job_name: str) -> Optional[str]:
+        return self._uri("status", namespace, job_name)
+
+    def _uri(self, kind: str, namespace: str, job_name: str) -> Optional[str]:
+        if self._server is None or not namespace or not job_name:
+            return None
+        return (
+            f"http://{self._host}:{self._port}/{kind}/"
+            f"{quote(namespace, safe='')}/{quote(job_name, safe='')}"
+        )
+
+    def serves(self, namespace: str, job_name: str) -> bool:
+        if self._job_known is None:
+            return False
+        try:
+            return bool(self._job_known(namespace, job_name))
+        except Exception as exc:
+            _log_exception("serves", exc)
+            return False
+
+    def render_diagnostics(self) -> str:
+        data = self._diagnostics() if self._diagnostics is not None else {}
+        return json.dumps(data, indent=2, sort_keys=True, default=str)
+
+    # Kubernetes lookups
+    def find_pods(self, namespace: str, job_name: str) -> list:
+        core_api = self._core_api_factory()
+        if core_api is None:
+            return []
+        pods = core_api.list_namespaced_pod(
+            namespace=namespace,
+            label_selector=f"oom-bubble-job={job_name}",
+        )
+        # Newest first so retries after a backoff show the current attempt
+        return sorted(getattr(pods, "items", []) or [], key=_pod_sort_key, reverse=True)
+
+    def read_log(self, namespace: str, pod, tail: int) -> str:
+        pod_name = pod.metadata.name
+        phase = getattr(getattr(pod, "status", None), "phase", "") or ""
+        key = (namespace, pod_name, tail)
+        now = time.monotonic()
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            fetched_at, text, final = cached
+            if final or now - fetched_at < self._cache_ttl:
+                return text
+
+        core_api = self._core_api_factory()
+        if core_api is None:
+            return ""
+        kwargs = {"name": pod_name, "namespace": namespace}
+        if tail > 0:
+            kwargs["tail_lines"] = tail
+        text = core_api.read_namespaced_pod_log(**kwargs) or ""
+
+        with self._cache_lock:
+            self._cache[key] = (now, text, phase in FINISHED_PHASES)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        return text
+
+    def stream_log(self, namespace: str, pod, tail: int):
+        core_api = self._core_api_factory()
+        if core_api is None:
+            return
+        kwargs = {
+            "name": pod.metadata.name,
+            "namespace": namespace,
+            "follow": True,
+            "_preload_content": False,
+        }
+        if tail > 0:
+            kwargs["tail_lines"] = tail
+        response = core_api.read_namespaced_pod_log(**kwargs)
+        try:
+            for chunk in response.stream():
+                yield chunk
+        finally:
+            try:
+                response.release_conn()
+            except Exception as exc:
+                _log_exception("stream_log:release", exc)
+
+    def read_job(self, namespace: str, job_name: str):
+        batch_api = self._batch_api_factory()
+        if batch_api is None:
+            return None
+        try:
+            return batch_api.read_namespaced_job_status(
+                name=job_name, namespace=namespace
+            )
+        except Exception as exc:
+            _log_exception("read_job", exc)
+            return None
+
+    def render_status(self, namespace: str, job_name: str) -> str:
+        job = self.read_job(namespace, job_name)
+        pods = self.find_pods(namespace, job_name)
+
+        status = getattr(job, "status", None)
+        rows = [
+            ("Job", job_name),
+            ("Namespace", namespace),
+            ("Active", getattr(status, "active", None) or 0),
+            ("Succeeded", getattr(status, "succeeded", None) or 0),
+            ("Failed", getattr(status, "failed", None) or 0),
+        ]
+        for condition in getattr(status, "conditions", None) or []:
+            if (getattr(condition, "status", "") or "").lower() == "true":
+                reason = getattr(condition, "reason", "") or ""
+                rows.append(("Condition", f"{condition.type} {reason}".strip()))
+        if job is None:
+            rows.append(("Condition", "Job not found (deleted or expired)"))
+
+        pod_rows = []
+        for pod in pods:
+            pod_status = getattr(pod, "status", None)
+            restarts = 0
+            reason = ""
+            for cstatus in getattr(pod_status, "container_statuses", None) or []:
+                restarts += int(getattr(cstatus, "restart_count", 0) or 0)
+                terminated = getattr(
+                    getattr(cstatus, "state", None), "terminated", None
+                )
+                if terminated is not None:
+                    reason = terminated.reason or ""
+            pod_rows.append(
+                (
+                    pod.metadata.name,
+                    getattr(pod_status, "phase", "") or "",
+                    getattr(getattr(pod, "spec", None), "node_name", "") or "",
+                    str(restarts),
+                    reason or getattr(pod_status, "reason", "") or "",
+                )
+            )
+
+        log_link = self.log_uri(namespace, job_name) or ""
+        parts = [
+            "<html><head><meta http-equiv='refresh' content='10'>",
+            f"<title>{html.escape(job_name)}</title></head><body>",
+            f"<h2>{html.escape(job_name)}</h2><table>",
+        ]
+        for label, value in rows:
+            parts.append(
+                f"<tr><th align='left'>{html.escape(str(label))}</th>"
+                f"<td>{html.escape(str(value))}</td></tr>"
+            )
+        parts.append("</table><h3>Pods</h3><table border='1'>")
+        parts.append(
+            "<tr><th>Pod</th><th>Phase</th><th>Node</th>"
+            "<th>Restarts</th><th>Reason</th></tr>"
+        )
+        for row in pod_rows:
+            cells = "".join(f"<td>{html.escape(cell)}</td>" for cell in row)
+            parts.append(f"<tr>{cells}</tr>")
+        parts.append("</table>")
+        if log_link:
+            parts.append(
+                f"<p><a href='{html.escape(log_link)}'>log</a> | "
+                f"<a href='{html.escape(log_link)}?follow=1'>follow log</a></p>"
+            )
+        parts.append("</body></html>")
+        return "".join(parts)
+
+
+def _make_handler(server: LogServer):
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            _dprint("http", format % args)
+
+        def _send_text(self, code: int, body: str, content_type: str) -> None:
+            data = body.encode("utf-8", "replace")
+            self.send_response(code)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            parts = [p for p in parsed.path.split("/") if p]
+            if parts == ["diagnostics"]:
+                try:
+                    body = server.render_diagnostics()
+                    self._send_text(200, body, "application/json")
+                except Exception as exc:
+                    _log_exception("do_GET:diagnostics", exc)
+                    self._send_text(500, f"{exc}\n", "text/plain")
+                return
+            if len(parts) != 3 or parts[0] not in ("logs", "status"):
+                self._send_text(404, "Not found\n", "text/plain")
+                return
+            kind, namespace, job_name = parts
+            if not server.serves(namespace, job_name):
+                self._send_text(404, "Not found\n", "text/plain")
+                return
+            query = parse_qs(parsed.query)
+
+            try:
+                if kind == "status":
+                    body = server.render_status(namespace, job_name)
+                    self._send_text(200, body, "text/html")
+                    return
+                self._serve_log(namespace, job_name, query)
+            except Exception as exc:
+                _log_exception("do_GET", exc)
+                try:
+                    self._send_text(
+                        502, f"Failed reading {job_name}: {exc}\n", "text/plain"
+                    )
+                except Exception:
+                    pass
+
+        def _serve_log(self, namespace: str, job_name: str, query: dict) -> None:
+            try:
+                tail = int((query.get("tail") or [DEFAULT_TAIL_LINES])[0])
+            except ValueError:
+                tail = DEFAULT_TAIL_LINES
+            follow = _env_truthy((query.get("follow") or ["0"])[0])
+
+            pods = server.find_pods(namespace, job_name)
+            if not pods:
+                self._send_text(
+                    404,
+                    f"No pods found for job {job_name} (pending or expired)\n",
+                    "text/plain",
+                )
+                return
+            pod = pods[0]
+            phase = getattr(getattr(pod, "status", None), "phase", "") or ""
+
+            if not follow or phase in FINISHED_PHASES or phase == "Pending":
+                self._send_text(
+                    200, server.read_log(namespace, pod, tail), "text/plain"
+                )
+                return
+
+            # Stream the live log until the pod exits or the client disconnects
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            for chunk in server.stream_log(namespace, pod, tail):
+                try:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    break
+
+    return _Handler
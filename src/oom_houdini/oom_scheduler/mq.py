@@ -1,5 +1,11 @@
+import bisect
+import hashlib
 import os
+import socket
+import threading
+import time
 import uuid
+from collections import Counter, deque
 
 
 DEFAULT_RELAY_PORT = 53000
@@ -15,6 +21,34 @@ PERSISTENT_MQ_CONFIG = {
 }
 
 
+# Relay health checks: seconds between probes of the connected relay, probe
+# timeout, and consecutive failed probes before failing over
+HEALTH_INTERVAL = 5.0
+PROBE_TIMEOUT = 1.0
+MAX_PROBE_FAILURES = 2
+# Back-off between reconnect attempts while no relay is reachable
+RECONNECT_INTERVAL = 5.0
+# Points per shard on the consistent hash ring
+SHARD_VNODES = 64
+# Callback latencies kept for percentile reporting
+METRICS_WINDOW = 1000
+# Work item RPCs that jobs send through the relay; only these are timed so
+# the percentiles describe the cook traffic and not helper calls
+TIMED_CALLBACKS = (
+    "start_cook",
+    "success",
+    "failed",
+    "cancelled",
+    "result_data",
+    "add_output",
+    "set_string_attrib",
+    "set_int_attrib",
+    "set_float_attrib",
+    "set_file_attrib",
+    "set_pyobject_attrib",
+)
+
+
 # Debug / Dev mode helpers (mirrors scheduler.py)
 def _env_truthy(value):
     # Normalize env var values like 1/true/yes/on
@@ -61,6 +95,243 @@ def _log_exception(context: str, exc: Exception) -> None:
     return None
 
 
+def _parse_endpoints(text, relay_port, callback_port):
+    # "host[:relay[:callback]], host2..." -> list of endpoint dicts
+    endpoints = []
+    for entry in str(text or "").replace(";", ",").split(","):
+        parts = entry.strip().split(":")
+        if not parts[0]:
+            continue
+        endpoints.append(
+            {
+                "host": parts[0],
+                "relay_port": _env_int(
+                    parts[1] if len(parts) > 1 else None, relay_port
+                ),
+                "callback_port": _env_int(
+                    parts[2] if len(parts) > 2 else None, callback_port
+                ),
+            }
+        )
+    return endpoints
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class MQMetrics:
+    """
+    Thread-safe counters for the relay path.
+
+    Relay messages carry no send timestamp, so message latency is split in
+    the two parts that can be observed from the scheduler: the network round
+    trip to the relay (from health probes) and the time each callback takes
+    to be handled once the relay delivers it. ``in_flight`` counts callbacks
+    currently being handled; a growing value means messages queue up on the
+    scheduler side rather than on the farm.
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._by_method = Counter()
+        self._messages = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._last_message = None
+        self.reconnects = 0
+        self.failovers = 0
+        self.relay_rtt = None
+
+    def enter(self) -> float:
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        return time.monotonic()
+
+    def exit(self, method, started, failed=False) -> None:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._messages += 1
+            self._by_method[method] += 1
+            self._latencies.append(elapsed)
+            self._last_message = time.time()
+            if failed:
+                self._errors += 1
+        return None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._latencies)
+            data = {
+                "messages": self._messages,
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "by_method": dict(self._by_method),
+                "last_message": self._last_message,
+            }
+        data.update(
+            {
+                "handle_ms_avg": (
+                    1000.0 * sum(ordered) / len(ordered) if ordered else 0.0
+                ),
+                "handle_ms_p50": 1000.0 * _percentile(ordered, 0.5),
+                "handle_ms_p95": 1000.0 * _percentile(ordered, 0.95),
+                "handle_ms_max": 1000.0 * (ordered[-1] if ordered else 0.0),
+                "relay_rtt_ms": (
+                    None if self.relay_rtt is None else 1000.0 * self.relay_rtt
+                ),
+                "reconnects": self.reconnects,
+                "failovers": self.failovers,
+            }
+        )
+        return data
+
+
+def _instrumented_api(api_cls, metrics, methods=TIMED_CALLBACKS):
+    """Subclass ``api_cls`` so the RPCs in ``methods`` are timed into ``metrics``."""
+
+    def _wrap(name, func):
+        def _timed(self, *args, **kwargs):
+            started = metrics.enter()
+            failed = False
+            try:
+                return func(self, *args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                metrics.exit(name, started, failed)
+
+        _timed.__name__ = name
+        _timed.__doc__ = getattr(func, "__doc__", None)
+        return _timed
+
+    namespace = {}
+    for name in methods:
+        # Names missing from this Houdini version's API are skipped
+        attr = getattr(api_cls, name, None)
+        if callable(attr) and not isinstance(attr, type):
+            namespace[name] = _wrap(name, attr)
+    return type(f"Timed{api_cls.__name__}", (api_cls,), namespace)
+
+
+def _ring_hash(text):
+    return int.from_bytes(hashlib.md5(text.encode("utf-8")).digest()[:8], "big")
+
+
+def shard_order(key, endpoints, vnodes=SHARD_VNODES):
+    """
+    Order relay shards for ``key`` on a consistent hash ring.
+
+    The first entry is the shard that owns ``key``; the rest are the
+    failover order walking clockwise. Adding or removing a shard only moves
+    the keys that hashed next to it.
+    """
+    ring = []
+    for idx, endpoint in enumerate(endpoints):
+        name = f"{endpoint['host']}:{endpoint['relay_port']}"
+        for vnode in range(vnodes):
+            ring.append((_ring_hash(f"{name}#{vnode}"), idx))
+    ring.sort()
+    if not ring:
+        return []
+
+    start = bisect.bisect(ring, (_ring_hash(str(key)), len(endpoints)))
+    ordered = []
+    for offset in range(len(ring)):
+        idx = ring[(start + offset) % len(ring)][1]
+        if idx not in ordered:
+            ordered.append(idx)
+            if len(ordered) == len(endpoints):
+                break
+    return [endpoints[idx] for idx in ordered]
+
+
+def probe_latency(host, port, timeout=PROBE_TIMEOUT):
+    """Return the TCP connect time to host:port in seconds, or None."""
+    started = time.monotonic()
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            pass
+    except OSError:
+        return None
+    return time.monotonic() - started
+
+
+class RelayProber:
+    """
+    Connect-latency probes of the relay endpoints on a background thread.
+
+    onTick must not block on TCP connects, so the scheduler thread only reads
+    the latest round. ``rounds`` counts completed rounds; a latency of None
+    means the endpoint did not answer in that round.
+    """
+
+    def __init__(self, interval=HEALTH_INTERVAL, timeout=PROBE_TIMEOUT):
+        self._interval = interval
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._endpoints = []
+        self._latency = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.rounds = 0
+
+    def set_endpoints(self, endpoints) -> None:
+        with self._lock:
+            self._endpoints = list(endpoints or [])
+        return None
+
+    def probe_now(self) -> None:
+        with self._lock:
+            endpoints = list(self._endpoints)
+        results = {}
+        for endpoint in endpoints:
+            key = (endpoint["host"], int(endpoint["relay_port"]))
+            results[key] = probe_latency(key[0], key[1], self._timeout)
+            _dprint("probe", f"{key[0]}:{key[1]}", results[key])
+        with self._lock:
+            self._latency = results
+            self.rounds += 1
+        return None
+
+    def latency(self, host, port):
+        """Last probed connect time of host:port; None if down or unprobed."""
+        with self._lock:
+            return self._latency.get((host, int(port)))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.probe_now()
+            except Exception as exc:
+                _log_exception("prober", exc)
+        return None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return None
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="oom-mq-prober", daemon=True
+        )
+        self._thread.start()
+        return None
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+        return None
+
+
 class MQManager:
     """
     Minimal MQ wrapper that connects to a long-running mqserver instance.
@@ -73,6 +344,23 @@ class MQManager:
         OOM_MQ_HOST              - required hostname or IP
         OOM_MQ_RELAY_PORT        - optional, defaults to 53000
         OOM_MQ_CALLBACK_PORT     - optional, defaults to 53001
+        OOM_MQ_HOSTS             - optional pool of relays,
+                                   "host[:relay[:callback]],..."; overrides
+                                   the single host settings above
+        OOM_MQ_SHARDS            - optional relay shards, same format; takes
+                                   precedence over OOM_MQ_HOSTS
+
+    With several relays configured, the one with the lowest connect latency
+    is used. A ``RelayProber`` thread keeps probing the relays and ``poll()``
+    only reads its results; when the current relay stops answering the manager
+    fails over to the next healthy relay and re-advertises the result server
+    address, and while none is reachable it retries in the background so
+    deferred work items resume once a relay comes back.
+
+    Shards spread callback traffic of many concurrent cooks: each manager
+    picks its shard by consistent hashing of its ``client_id`` instead of by
+    latency, and fails over along the hash ring. Work item jobs are handed
+    the chosen shard through ``result_server()``.
     """
 
     def __init__(self, owner, persistent_config=None):
@@ -81,6 +369,7 @@ class MQManager:
 
         # cache for resolved persistent MQ configuration
         self._config_cache = persistent_config
+        self._sharded = False
 
         # client id used by relay connections
         self.client_id = uuid.uuid4().hex
@@ -94,6 +383,18 @@ class MQManager:
         # readiness/waiting flags
         self._ready = False
 
+        # health tracking for the connected relay; probes run on the
+        # prober thread, poll() checks each finished round once
+        self._prober = RelayProber()
+        self._checked_round = 0
+        self._probe_failures = 0
+        self._last_connect_attempt = 0.0
+        self._wanted = False
+        self._connected_once = False
+
+        # relay path instrumentation, surfaced through poll()
+        self.metrics = MQMetrics()
+
     # Function Defs
     def is_ready(self) -> bool:
         return bool(self._ready)
@@ -103,6 +404,8 @@ class MQManager:
 
     def _load_persistent_config(self):
         if self._config_cache:
+            if isinstance(self._config_cache, dict):
+                self._config_cache = [self._config_cache]
             return self._config_cache
 
         config = PERSISTENT_MQ_CONFIG or {}
@@ -110,6 +413,19 @@ class MQManager:
         relay_port = config.get("relay_port", DEFAULT_RELAY_PORT)
         callback_port = config.get("callback_port", DEFAULT_CALLBACK_PORT)
 
+        shards = (os.environ.get("OOM_MQ_SHARDS") or "").strip()
+        if shards:
+            endpoints = _parse_endpoints(shards, relay_port, callback_port)
+            self._sharded = len(endpoints) > 1
+            self._config_cache = endpoints or None
+            return self._config_cache
+
+        pool = (os.environ.get("OOM_MQ_HOSTS") or "").strip()
+        if pool:
+            endpoints = _parse_endpoints(pool, relay_port, callback_port)
+            self._config_cache = endpoints or None
+            return self._config_cache
+
         if not host:
             host = (
                 os.environ.get("OOM_MQ_HOST") or os.environ.get("PDG_MQ_HOST") or ""
@@ -131,32 +447,74 @@ class MQManager:
         relay_port = _env_int(relay_port, DEFAULT_RELAY_PORT)
         callback_port = _env_int(callback_port, DEFAULT_CALLBACK_PORT)
 
-        self._config_cache = {
-            "host": host,
-            "relay_port": int(relay_port),
-            "callback_port": int(callback_port),
-        }
+        self._config_cache = [
+            {
+                "host": host,
+                "relay_port": int(relay_port),
+                "callback_port": int(callback_port),
+            }
+        ]
         return self._config_cache
 
+    def _ranked_endpoints(self, endpoints, probe_single=False):
+        # Reachable relays by ascending connect latency (or hash ring order
+        # when sharded), from the prober's last round; a lone relay is tried
+        # unprobed on start so its own connect error surfaces
+        if len(endpoints) == 1 and not probe_single:
+            return list(endpoints)
+
+        def _latency(endpoint):
+            return self._prober.latency(endpoint["host"], endpoint["relay_port"])
+
+        if self._sharded:
+            return [
+                endpoint
+                for endpoint in shard_order(self.client_id, endpoints)
+                if _latency(endpoint) is not None
+            ]
+        timed = [
+            (_latency(endpoint), endpoint)
+            for endpoint in endpoints
+            if _latency(endpoint) is not None
+        ]
+        timed.sort(key=lambda pair: pair[0])
+        return [endpoint for _, endpoint in timed]
+
+    def _connect_best(self, exclude=None, probe_single=False) -> bool:
+        endpoints = self._load_persistent_config() or []
+        self._last_connect_attempt = time.monotonic()
+        candidates = [e for e in endpoints if e != exclude] or list(endpoints)
+        for endpoint in self._ranked_endpoints(candidates, probe_single):
+            if self._connect_shared(
+                endpoint["host"], endpoint["relay_port"], endpoint["callback_port"]
+            ):
+                self._probe_failures = 0
+                self._checked_round = self._prober.rounds
+                return True
+        return False
+
     # Start the PDG MQ connection (persistent server assumed to be running)
     def start(self) -> None:
         if self._ready:
             return None
 
-        config = self._load_persistent_config()
-        if not config:
+        endpoints = self._load_persistent_config()
+        if not endpoints:
             raise RuntimeError(
                 "Persistent MQ not configured. "
                 "Set OOM_MQ_HOST (and optional *_PORT values) before cooking."
             )
 
-        if not self._connect_shared(
-            config["host"], config["relay_port"], config["callback_port"]
-        ):
-            raise RuntimeError(
-                f"Failed to connect to persistent PDGMQ server "
-                f"{config['host']}:{config['relay_port']}"
-            )
+        # poll() keeps retrying from here on, even if this attempt fails
+        self._wanted = True
+        self._prober.set_endpoints(endpoints)
+        if len(endpoints) > 1:
+            # Rank on a fresh round; later rounds come from the prober thread
+            self._prober.probe_now()
+        self._prober.start()
+        if not self._connect_best():
+            names = ", ".join(f"{e['host']}:{e['relay_port']}" for e in endpoints)
+            raise RuntimeError(f"Failed to connect to persistent PDGMQ server {names}")
 
         _dprint(
             "connected persistent MQ",
@@ -177,7 +535,8 @@ class MQManager:
             from pdgutils import PDGNetMQRelay
 
             if not self._relay:
-                self._relay = PDGNetMQRelay(CallbackServerAPI(self._owner))
+                api_cls = _instrumented_api(CallbackServerAPI, self.metrics)
+                self._relay = PDGNetMQRelay(api_cls(self._owner))
 
             self._relay.connectToMQServer(
                 host,
@@ -197,12 +556,86 @@ class MQManager:
         self._relayport = int(relayport)
         self._owner.setWorkItemResultServerAddr(f"{host}:{int(relayport)}")
         self._ready = True
+        if self._connected_once:
+            self.metrics.reconnects += 1
+        self._connected_once = True
 
         _dprint("connected relay", host, int(relayport))
         return True
 
-    # Poll for the MQ connection until the relay is established
-    def poll(self) -> None:
+    def result_server(self) -> str:
+        # Address work item jobs report back to (PDG_RESULT_SERVER)
+        if not self._ready or not self._host or not self._relayport:
+            return ""
+        return f"{self._host}:{int(self._relayport)}"
+
+    def _disconnect(self) -> None:
+        # Drop the current relay without forgetting that a connection is wanted
+        if self._relay:
+            try:
+                self._relay.stopRelayServer()
+            except Exception as exc:
+                _log_exception("mq.disconnect:relay", exc)
+        self._relay = None
+        self._ready = False
+        return None
+
+    def _relay_healthy(self) -> bool:
+        is_connected = getattr(self._relay, "isConnected", None)
+        if callable(is_connected):
+            try:
+                if not is_connected():
+                    return False
+            except Exception as exc:
+                _log_exception("mq.health:isConnected", exc)
+        rtt = self._prober.latency(self._host, self._relayport)
+        if rtt is not None:
+            self.metrics.relay_rtt = rtt
+        return rtt is not None
+
+    # Watch the relay, reconnect/fail over when it drops and report metrics.
+    # Called from onTick: reads the prober's results and never probes itself
+    def poll(self) -> dict:
+        if self._wanted:
+            self._check_relay()
+        snapshot = self.metrics.snapshot()
+        snapshot["relay"] = self.result_server()
+        snapshot["ready"] = self.is_ready()
+        return snapshot
+
+    def _check_relay(self) -> None:
+        now = time.monotonic()
+
+        if not self._ready:
+            if now - self._last_connect_attempt < RECONNECT_INTERVAL:
+                return None
+            if self._connect_best(probe_single=True):
+                _dprint("poll", "reconnected", f"{self._host}:{self._relayport}")
+            return None
+
+        rounds = self._prober.rounds
+        if rounds == self._checked_round:
+            return None
+        self._checked_round = rounds
+        if self._relay_healthy():
+            self._probe_failures = 0
+            return None
+
+        self._probe_failures += 1
+        _dprint("poll", "relay probe failed", self._host, self._probe_failures)
+        if self._probe_failures < MAX_PROBE_FAILURES:
+            return None
+
+        failed = {
+            "host": self._host,
+            "relay_port": self._relayport,
+            "callback_port": self._xmlport,
+        }
+        self._disconnect()
+        self.metrics.failovers += 1
+        # Prefer another relay; the failed one is retried last
+        if self._connect_best(exclude=failed, probe_single=True):
+            _dprint("poll", "failed over", f"{self._host}:{self._relayport}")
         return None
 
     # Stop the relay and clear scheduler state
@@ -219,6 +652,9 @@ class MQManager:
             _log_exception("mq.stop", exc)
 
         # Reset state
+        self._prober.stop()
+        self._wanted = False
+        self._probe_failures = 0
         self._host = None
         self._xmlport = None
         self._relayport = None
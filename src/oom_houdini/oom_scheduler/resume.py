@@ -0,0 +1,229 @@
+"""
+Checkpoint/resume helpers for work items restarted by Kubernetes.
+
+At submission the job submitter records each work item's expected output
+files (by frame) in a small JSON manifest under the cook directory. The job
+wrapper calls :func:`probe` before running the item command; on a retry
+(the pod was evicted/preempted and the Job created a new one) the probe
+reports the last frame that is on disk contiguously from the start of the
+range, and the wrapper feeds it back into the item command's start-frame
+argument so the cook continues from there instead of frame 1.
+
+The last existing frame is re-cooked, since an evicted pod may have been
+killed half way through writing it.
+
+The wrapper runs :data:`PROBE_SCRIPT` under plain Python rather than hython,
+so probing costs neither a Houdini license nor a hython start-up. The script
+loads this file by path, because the oom_scheduler package ``__init__``
+imports pdg.
+"""
+
+import json
+import os
+import re
+import shlex
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+RESUME_DIR = "resume"
+RESUME_ENV = "OOM_RESUME_FRAME"
+# Start-frame flags understood by the PDG cook scripts; override with a
+# space separated OOM_RESUME_START_FLAGS when a node type uses another flag.
+DEFAULT_START_FLAGS = ("--start", "-fs", "--frame-start")
+
+_FRAME_RE = re.compile(r"\.(-?\d+)(?=\.)")
+
+# Read from stdin by the job wrapper: python - <manifest>
+PROBE_SCRIPT = """\
+import importlib.util, os, sys
+package = importlib.util.find_spec("oom_houdini")
+path = os.path.join(package.submodule_search_locations[0], "oom_scheduler", "resume.py")
+spec = importlib.util.spec_from_file_location("oom_resume", path)
+resume = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(resume)
+sys.exit(resume.main(sys.argv[1:]))
+"""
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][resume]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def start_flags() -> Tuple[str, ...]:
+    raw = (os.environ.get("OOM_RESUME_START_FLAGS") or "").split()
+    return tuple(raw) or DEFAULT_START_FLAGS
+
+
+def frame_from_path(path: str) -> Optional[int]:
+    # Last dotted integer token in the file name, e.g. name.1.0101.bgeo.sc -> 101
+    matches = _FRAME_RE.findall(os.path.basename(path))
+    if not matches:
+        return None
+    try:
+        return int(matches[-1])
+    except ValueError:
+        return None
+
+
+def frames_by_path(paths: Iterable[str]) -> Dict[int, List[str]]:
+    frames: Dict[int, List[str]] = {}
+    for path in paths:
+        frame = frame_from_path(path)
+        if frame is None:
+            continue
+        frames.setdefault(frame, []).append(path)
+    return frames
+
+
+def _frame_complete(paths: List[str]) -> bool:
+    for path in paths:
+        try:
+            if os.path.getsize(path) <= 0:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def last_complete_frame(frames: Dict[int, List[str]]) -> Optional[int]:
+    """Return the last frame whose outputs exist contiguously from the first."""
+    last = None
+    for frame in sorted(frames):
+        if not _frame_complete(frames[frame]):
+            break
+        last = frame
+    return last
+
+
+def manifest_path(pdg_dir: str, job_name: str) -> str:
+    return os.path.join(pdg_dir, RESUME_DIR, f"{job_name}.json")
+
+
+def write_manifest(
+    pdg_dir: str, job_name: str, outputs: Iterable[str]
+) -> Optional[str]:
+    frames = frames_by_path(outputs)
+    # Resume only makes sense for items that write several frames
+    if len(frames) < 2 or not pdg_dir:
+        return None
+    path = manifest_path(pdg_dir, job_name)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump({"frames": {str(k): v for k, v in frames.items()}}, handle)
+    # Runs once per submission, never on a pod restart: a marker left by an
+    # earlier run of the same job name must not make this one look like a retry
+    Path(f"{path}.attempt").unlink(missing_ok=True)
+    return path
+
+
+def expected_outputs(work_item) -> List[str]:
+    # Prefer the newer API, fall back to expectedResultData on older builds
+    for attr in ("expectedOutputFiles", "expectedResultData"):
+        try:
+            files = getattr(work_item, attr, None)
+            if callable(files):
+                files = files()
+        except Exception as exc:
+            _log_exception(f"expected_outputs:{attr}", exc)
+            continue
+        paths = []
+        for entry in files or []:
+            path = getattr(entry, "path", entry)
+            if isinstance(path, str) and path:
+                paths.append(path)
+        if paths:
+            return paths
+    return []
+
+
+def rewrite_start_frame(command: str) -> Tuple[str, bool]:
+    """
+    Point the start-frame argument of ``command`` at ``$OOM_RESUME_FRAME``.
+
+    The original value stays the default, so the command is unchanged when
+    the probe finds nothing to resume.
+    """
+    try:
+        parts = shlex.split(command)
+    except ValueError:
+        return command, False
+
+    flags = start_flags()
+    quoted = [shlex.quote(p) for p in parts]
+    for idx, part in enumerate(parts[:-1]):
+        if part in flags:
+            original = parts[idx + 1]
+            try:
+                float(original)
+            except ValueError:
+                continue
+            quoted[idx + 1] = f'"${{{RESUME_ENV}:-{original}}}"'
+            return " ".join(quoted), True
+    return command, False
+
+
+def probe(manifest: str) -> Optional[int]:
+    """
+    Return the frame a restarted item should resume from, or None.
+
+    The first attempt leaves a marker next to the manifest; only later
+    attempts of the same job look at the outputs, so a fresh cook never
+    skips frames left over from an earlier run.
+    """
+    if not manifest or not os.path.isfile(manifest):
+        return None
+    marker = f"{manifest}.attempt"
+    if not os.path.exists(marker):
+        try:
+            Path(marker).touch()
+        except OSError as exc:
+            _log_exception("probe:marker", exc)
+        return None
+
+    try:
+        with open(manifest) as handle:
+            data = json.load(handle)
+    except Exception as exc:
+        _log_exception("probe:read", exc)
+        return None
+
+    frames = {int(k): v for k, v in (data.get("frames") or {}).items()}
+    if not frames:
+        return None
+    last = last_complete_frame(frames)
+    if last is None or last <= min(frames):
+        return None
+    return last
+
+
+def main(argv: List[str]) -> int:
+    frame = probe(argv[0] if argv else "")
+    if frame is not None:
+        print(frame)
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
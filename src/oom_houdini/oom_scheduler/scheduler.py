@@ -8,7 +8,10 @@ from pdg.scheduler import PyScheduler
 from pdg.job.eventdispatch import EventDispatchMixin
 
 from .mq import MQManager
+from .gang import DEFAULT_GANG_ATTRIB, GangCoordinator
 from .job_submitter import JobSubmitter
+from .log_server import LogServer
+from oom_houdini.usage_ledger import UsageLedger, UsageSampler
 
 
 # Debug / Dev mode helpers
@@ -20,6 +23,8 @@ def _env_truthy(value):
 
 
 _DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+# Seconds between diagnostics lines in OOM_DEV output
+DIAGNOSTICS_INTERVAL = 30.0
 
 
 def _dprint(*parts):
@@ -70,6 +75,17 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
         # MQ manager state
         self._mq = MQManager(self)
         self._job_submitter = JobSubmitter(self)
+        self._gangs = GangCoordinator()
+        self._log_server = LogServer(
+            self._job_submitter._ensure_core_api,
+            self._job_submitter._ensure_batch_api,
+            diagnostics=self.diagnostics,
+            job_known=self._job_submitter.has_job,
+        )
+        self._mq_metrics = {}
+        self._last_diagnostics = 0.0
+        self._usage_ledger = UsageLedger()
+        self._usage_sampler = UsageSampler(self._job_submitter._ensure_custom_api)
 
         # Debug: constructor details
         _dprint("__init__", f"name={name}")
@@ -108,6 +124,12 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
                         "type": "int",
                         "size": 1,
                     },
+                    # Work item attribute that groups distributed sim slices
+                    {
+                        "name": "gang",
+                        "type": "string",
+                        "size": 1,
+                    },
                 ],
             }
         )
@@ -152,17 +174,21 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
             _dprint("onSchedule:deferred", "MQ state check failed")
             return pdg.scheduleResult.Deferred
 
+        gang = self._gang_for(work_item)
+        if gang is not None:
+            return self._schedule_gang_member(work_item, *gang)
+
         try:
             result = self._job_submitter.submit_work_item(
                 work_item,
                 mq_client_id=getattr(self._mq, "client_id", "") or "",
-                result_server=self.workItemResultServerAddr() or "",
+                result_server=self._result_server(),
             )
             _dprint(
                 "onSchedule:submitted",
                 _wi_repr(work_item),
                 f"client_id={getattr(self._mq, 'client_id', '') or ''}",
-                f"result_server={self.workItemResultServerAddr() or ''}",
+                f"result_server={self._result_server()}",
                 f"result={result}",
             )
         except Exception as exc:
@@ -176,6 +202,57 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
         _dprint("onSchedule:done", _wi_repr(work_item))
         return result
 
+    def _result_server(self) -> str:
+        # The relay shard this scheduler's MQ client is connected to
+        try:
+            address = self._mq.result_server()
+        except Exception as exc:
+            _log_exception("_result_server", exc)
+            address = ""
+        return address or self.workItemResultServerAddr() or ""
+
+    def _gang_for(self, work_item):
+        attrib = self.get_gang_attrib()
+        if not attrib:
+            return None
+        try:
+            return self._gangs.gang_key(work_item, attrib)
+        except Exception as exc:
+            _log_exception("_gang_for", exc)
+            return None
+
+    def _schedule_gang_member(self, work_item, gang_key, gang_size):
+        # Members are held until the whole gang can start together
+        if self._gangs.is_submitted(work_item):
+            return pdg.scheduleResult.Succeeded
+
+        members = self._gangs.add(work_item, gang_key, gang_size)
+        if members is None or not self._gangs.should_probe(gang_key):
+            return pdg.scheduleResult.Deferred
+
+        try:
+            submitted = self._job_submitter.submit_gang(
+                members,
+                gang_key=gang_key,
+                mq_client_id=getattr(self._mq, "client_id", "") or "",
+                result_server=self._result_server(),
+            )
+        except Exception as exc:
+            try:
+                self.cookError(f"Failed submitting gang {gang_key}: {exc}")
+            except Exception as inner_exc:
+                _log_exception("_schedule_gang_member:cookError", inner_exc)
+            _dprint("onSchedule:gang_failed", gang_key, repr(exc))
+            return pdg.scheduleResult.Failed
+
+        if not submitted:
+            _dprint("onSchedule:gang_waiting", gang_key, "insufficient capacity")
+            return pdg.scheduleResult.Deferred
+
+        self._gangs.mark_submitted(gang_key)
+        _dprint("onSchedule:gang_submitted", gang_key, f"members={len(members)}")
+        return pdg.scheduleResult.Succeeded
+
     def onScheduleStatic(self, dependencies, dependents, ready_items):
         # Placeholder callback
         return None
@@ -210,6 +287,12 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
                 _log_exception("onStart:cookError", inner_exc)
             _dprint("onStart:mq", "failed", repr(exc))
 
+        # Serve work item logs/status pages for the TOP UI
+        try:
+            self._log_server.start()
+        except Exception as exc:
+            _log_exception("onStart:log_server", exc)
+
         return None
 
     def onStop(self):
@@ -226,6 +309,14 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
         # except Exception:
         #     pass
 
+        self._gangs.clear()
+        self._usage_ledger.close()
+
+        try:
+            self._log_server.stop()
+        except Exception as exc:
+            _log_exception("onStop:log_server", exc)
+
         _dprint("onStop", "clearing cook id", f"was={self._cook_id}")
         self._cook_id = None
         return None
@@ -292,13 +383,20 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
         # Let MQ manager poll without blocking the UI
         try:
             # _dprint("onTick", "poll")
-            self._mq.poll()
+            self._mq_metrics = self._mq.poll() or {}
         except Exception as exc:
             _log_exception("onTick:mq", exc)
+        self._report_diagnostics()
+
+        try:
+            self._usage_sampler.sample()
+        except Exception as exc:
+            _log_exception("onTick:usage_sample", exc)
 
         try:
             updates = self._job_submitter.poll_job_updates()
             for update in updates:
+                self._record_usage(update)
                 state = update.get("state")
                 job_name = update.get("job_name")
                 wi_id = update.get("work_item_id")
@@ -323,14 +421,76 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
             _log_exception("onTick:jobs", exc)
         return None
 
-    def getLogURI(self, work_item):
-        # Placeholder callback
+    def diagnostics(self) -> dict:
+        # Scheduler health snapshot; served at /diagnostics by the log server
+        return {
+            "cook_id": self._cook_id,
+            "active_jobs": self._job_submitter.active_job_count(),
+            "mq": dict(self._mq_metrics),
+        }
+
+    def _report_diagnostics(self) -> None:
+        now = time.monotonic()
+        if not _DEV_VERBOSE or now - self._last_diagnostics < DIAGNOSTICS_INTERVAL:
+            return None
+        self._last_diagnostics = now
+        mq = self._mq_metrics
+        _dprint(
+            "diagnostics",
+            f"relay={mq.get('relay', '')}",
+            f"rtt_ms={mq.get('relay_rtt_ms')}",
+            f"messages={mq.get('messages', 0)}",
+            f"handle_p95_ms={mq.get('handle_ms_p95', 0.0):.1f}",
+            f"in_flight={mq.get('in_flight', 0)}",
+            f"active_jobs={self._job_submitter.active_job_count()}",
+            f"reconnects={mq.get('reconnects', 0)}",
+        )
         return None
 
-    def getStatusURI(self, work_item):
-        # Placeholder callback
+    def _record_usage(self, update: dict) -> None:
+        # Ledger failures must never affect the cook
+        info = update.get("info") or {}
+        try:
+            self._usage_ledger.record(
+                job_name=str(update.get("job_name") or ""),
+                namespace=str(update.get("namespace") or ""),
+                artist=info.get("artist", ""),
+                shot=info.get("shot", ""),
+                top_node=info.get("top_node", ""),
+                workload=info.get("workload", ""),
+                state=str(update.get("state") or ""),
+                started_at=update.get("started_at"),
+                finished_at=update.get("finished_at"),
+                cpu_request=float(info.get("cpu_request", 0.0)),
+                mem_request_gib=float(info.get("mem_request_gib", 0.0)),
+                gpu_request=float(info.get("gpu_request", 0.0)),
+                used=self._usage_sampler.pop(str(update.get("job_name") or "")),
+            )
+        except Exception as exc:
+            _log_exception("_record_usage", exc)
         return None
 
+    def getLogURI(self, work_item):
+        job = self._job_for_work_item(work_item)
+        if job is None:
+            return None
+        return self._log_server.log_uri(*job)
+
+    def getStatusURI(self, work_item):
+        job = self._job_for_work_item(work_item)
+        if job is None:
+            return None
+        return self._log_server.status_uri(*job)
+
+    def _job_for_work_item(self, work_item):
+        try:
+            if not self._log_server.is_running():
+                self._log_server.start()
+            return self._job_submitter.job_for_work_item(work_item.id)
+        except Exception as exc:
+            _log_exception("_job_for_work_item", exc)
+            return None
+
     def endSharedServer(self, sharedserver_name):
         # Placeholder callback
         return None
@@ -416,6 +576,18 @@ class oom_scheduler(EventDispatchMixin, PyScheduler):
             gib = 0
         return gib if gib > 0 else 0
 
+    def get_gang_attrib(self) -> str:
+        # Items without this attribute are submitted individually
+        value = ""
+        try:
+            pdg_parm = self["gang"]
+            if pdg_parm is not None:
+                value = pdg_parm.evaluateString() or ""
+        except Exception as exc:
+            _log_exception("get_gang_attrib", exc)
+        value = value or os.environ.get("OOM_GANG_ATTRIB", "") or DEFAULT_GANG_ATTRIB
+        return value.strip()
+
     def _shutdown_cleanup(self, source: str = "manual") -> None:
         return None
 
@@ -0,0 +1,62 @@
+"""
+Access to the Toolkit handles stored on ``hou.session``.
+
+123.py bootstraps ShotGrid Toolkit on a background thread so the UI is
+usable right away. Until it finishes, ``hou.session.oom_tk`` and
+``hou.session.oom_context`` are unset; ``hou.session.oom_ready`` is a
+``concurrent.futures.Future`` that resolves once they are populated.
+These helpers block on that future while a bootstrap is in flight and
+return immediately otherwise (hip loads, pool workers and hython sessions
+set the handles directly).
+
+``session_tk`` and ``session_context`` wait at most SESSION_TIMEOUT seconds
+and raise ``RuntimeError`` when the handles are still missing.
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import hou
+
+READY_ATTR = "oom_ready"
+# Seconds the session accessors wait for a bootstrap in flight
+SESSION_TIMEOUT = 120.0
+
+
+def wait_ready(timeout: float | None = None) -> None:
+    """Block until the startup bootstrap has finished (successfully or not)."""
+    future = getattr(hou.session, READY_ATTR, None)
+    if future is None or future.done():
+        return None
+    print("[oom] Waiting for ShotGrid bootstrap…")
+    try:
+        future.result(timeout)
+    except FutureTimeout:
+        raise
+    except Exception:
+        # 123.py already reported it; callers see the missing handles
+        pass
+    return None
+
+
+def _session_handle(attr: str, timeout: float | None):
+    try:
+        wait_ready(timeout)
+    except FutureTimeout:
+        raise RuntimeError(
+            f"ShotGrid bootstrap not ready after {timeout:g}s; try again shortly"
+        ) from None
+    value = getattr(hou.session, attr, None)
+    if value is None:
+        raise RuntimeError(
+            f"ShotGrid bootstrap failed or not ready (hou.session.{attr} is "
+            "unset); see the startup log"
+        )
+    return value
+
+
+def session_tk(timeout: float | None = SESSION_TIMEOUT):
+    return _session_handle("oom_tk", timeout)
+
+
+def session_context(timeout: float | None = SESSION_TIMEOUT):
+    return _session_handle("oom_context", timeout)
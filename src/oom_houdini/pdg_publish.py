@@ -15,13 +15,15 @@ from datetime import datetime, timezone
 
 import hou
 
+from oom_houdini.oom_session import session_context, session_tk
+
 
 # -----------------------------------------------------------------------------
 # ShotGrid helpers
 # -----------------------------------------------------------------------------
 def _sg_handles():
-    tk = hou.session.oom_tk
-    ctx = hou.session.oom_context
+    tk = session_tk()
+    ctx = session_context()
     sg = tk.shotgun
 
     return tk, ctx, sg
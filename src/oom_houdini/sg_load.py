@@ -4,6 +4,8 @@ import os
 import hou
 from PySide6 import QtCore, QtWidgets
 
+from oom_houdini.oom_session import session_context, session_tk
+
 
 def _format_date(val):
     """Return a short human friendly date string."""
@@ -111,9 +113,9 @@ class BrowseDialog(QtWidgets.QDialog):
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowStaysOnTopHint)
 
-        self.tk = hou.session.oom_tk
+        self.tk = session_tk()
         self.sg = self.tk.shotgun
-        self.context = hou.session.oom_context
+        self.context = session_context()
         self.project = self.context.project
         self.entity = self.context.entity
 
@@ -467,9 +469,9 @@ def update_to_latest(target, published_file_type, is_path=False, frames=False) -
         return
 
     # ShotGrid API
-    tk = hou.session.oom_tk
+    tk = session_tk()
     sg = tk.shotgun
-    context = hou.session.oom_context
+    context = session_context()
 
     # Resolve the publish's entity by first narrowing on publish code, then
     # matching the exact local_path client-side (SG API doesn't allow filtering
@@ -5,14 +5,14 @@ Centralizes common context → template field mapping so individual HDAs can
 focus on their path-expression specifics (eg: wedge, frame tokens, etc.).
 """
 
-import hou
+from oom_houdini.oom_session import session_context
 
 
 def build_template_fields(
     template, publish_name: str | None = None, include_frame: bool = False
 ) -> dict:
     # Base fields from the current SG context
-    context = hou.session.oom_context
+    context = session_context()
     fields = context.as_template_fields(template)
 
     # Add Step if available (some contexts may not have step)
@@ -9,23 +9,42 @@ Houdini/PDG during a simple submit action.
 from __future__ import annotations
 
 import argparse
+import csv
+import functools
 import getpass
+import hashlib
 import json
 import os
 import shlex
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
+from oom_houdini import controller_pool
+from oom_houdini.cook_progress import PROGRESS_ENV, progress_path
+from oom_houdini.hip_snapshot import file_digest, snapshots_enabled, store_snapshot
 from oom_kube.helpers import create_job, dev_mode, load_environment, load_kube
 
 DEFAULT_NAMESPACE = "dcc"
 DEFAULT_HFS = "/opt/houdini"
 SERVICE_TEMPLATE = "pdg-job-service.yaml"
+DEFAULT_BATCH_PARALLEL = 8
+FINGERPRINT_LABEL = "oom/fingerprint"
+# Session variables forwarded into the controller job template
+CONTEXT_ENV_VARS = (
+    "OOM_PROJECT_ID",
+    "OOM_PROJECT_PATH",
+    "OOM_SEQUENCE_ID",
+    "OOM_SHOT_ID",
+    "OOM_SHOT_PATH",
+    "CUT_IN",
+    "CUT_OUT",
+)
 
 
 def sanitize_job_name(text: str) -> str:
@@ -85,6 +104,10 @@ def resolve_uid_gid() -> tuple[int, int]:
     return uid_val, gid_val
 
 
+def new_cook_id() -> str:
+    return f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+
+
 def ensure_dirs(cook_id: str) -> tuple[str, str]:
     hip = os.environ.get("HIP", "").strip()
     base = os.path.join(hip, f"pdgtemp_{cook_id}")
@@ -94,10 +117,14 @@ def ensure_dirs(cook_id: str) -> tuple[str, str]:
     return base, scripts
 
 
+@functools.lru_cache(maxsize=None)
+def _get_template(template: str):
+    # Parse each template once per process; batch submits render it many times
+    return load_environment(template).get_template(template)
+
+
 def _render_template(template: str, context: dict) -> dict:
-    env = load_environment(template)
-    tpl = env.get_template(template)
-    return yaml.safe_load(tpl.render(**context))
+    return yaml.safe_load(_get_template(template).render(**context))
 
 
 def build_service_job_manifest(
@@ -115,6 +142,7 @@ def build_service_job_manifest(
     #    pdg_result_server: Optional[str] = None,
     #    pdg_result_client_id: Optional[str] = None,
     hhp: Optional[str] = None,
+    env_overrides: Optional[dict] = None,
 ) -> dict:
     # Base context without touching the scheduler package
     is_dev = dev_mode()
@@ -140,16 +168,9 @@ def build_service_job_manifest(
         "hhp": hhp or "",
     }
     # Pass-through selected environment variables from the submitting session
-    for var in (
-        "OOM_PROJECT_ID",
-        "OOM_PROJECT_PATH",
-        "OOM_SEQUENCE_ID",
-        "OOM_SHOT_ID",
-        "OOM_SHOT_PATH",
-        "CUT_IN",
-        "CUT_OUT",
-    ):
-        context[var] = os.environ.get(var, "")
+    overrides = env_overrides or {}
+    for var in CONTEXT_ENV_VARS:
+        context[var] = str(overrides.get(var, os.environ.get(var, "")))
     return _render_template(SERVICE_TEMPLATE, context)
 
 
@@ -167,29 +188,449 @@ def ensure_pdg_dirs(hip_path: Path, cook_id: str) -> tuple[str, str]:
     return base, scripts
 
 
-def build_controller_cmd(hip: Path, node: str, *, hfs: str, hip_dir: str) -> str:
+def build_controller_cmd(
+    hip: Path,
+    node: str,
+    *,
+    hfs: str,
+    hip_dir: str,
+    env: Optional[dict] = None,
+    hip_name: Optional[str] = None,
+) -> str:
     hython = Path(hfs) / "bin" / "hython"
-    snippet = f"from oom_houdini.cook_top import cook; cook({json.dumps(str(hip))}, {json.dumps(node)})"
+    # hip_name: the artist's path, so $HIP/$HIPNAME resolve as in their session
+    # while the controller loads a snapshot
+    name_arg = f", hip_name={json.dumps(hip_name)}" if hip_name else ""
+    snippet = f"from oom_houdini.cook_top import cook; cook({json.dumps(str(hip))}, {json.dumps(node)}{name_arg})"
     parts = [
         "set -euo pipefail",
         "umask 000",
         'if [ -n "${OOM_PYTHONPATH:-}" ]; then export PYTHONPATH="${OOM_PYTHONPATH}${PYTHONPATH:+:${PYTHONPATH}}"; fi',
         f"export HIP={shlex.quote(hip_dir)}",
         f"export HFS={shlex.quote(hfs)}",
-        f"{shlex.quote(str(hython))} -c {shlex.quote(snippet)}",
     ]
+    for key, value in (env or {}).items():
+        parts.append(f"export {key}={shlex.quote(str(value))}")
+    parts.append(f"{shlex.quote(str(hython))} -c {shlex.quote(snippet)}")
     return "; ".join(parts)
 
 
+def resolve_controller_hip(hip: Path, *, snapshot: bool = True) -> tuple[Path, str]:
+    """
+    Return (hip the controller loads, sha256 of its contents).
+
+    With snapshots enabled the hip is stored in the content-addressed
+    snapshot store first; if the store is unavailable the live path is used.
+    """
+    if snapshot and snapshots_enabled():
+        try:
+            stored = store_snapshot(hip)
+            return stored.path, stored.digest
+        except OSError as exc:
+            print(f"Hip snapshot failed, using live file: {exc}", file=sys.stderr)
+    return hip, file_digest(hip)
+
+
+def controller_fingerprint(
+    content_digest: str, node: str, env_overrides: Optional[dict] = None
+) -> str:
+    """Hash of hip contents, node path and the context env the job receives."""
+    digest = hashlib.sha256(content_digest.encode("ascii"))
+    overrides = env_overrides or {}
+    context = {var: os.environ.get(var, "") for var in CONTEXT_ENV_VARS}
+    context.update({k: str(v) for k, v in overrides.items()})
+    digest.update(b"\0" + node.strip().encode("utf-8"))
+    digest.update(b"\0" + json.dumps(context, sort_keys=True).encode("utf-8"))
+    # Label values are limited to 63 characters
+    return digest.hexdigest()[:40]
+
+
+def apply_fingerprint(manifest: dict, fingerprint: str) -> dict:
+    labels = manifest.setdefault("metadata", {}).setdefault("labels", {})
+    labels[FINGERPRINT_LABEL] = fingerprint
+    return manifest
+
+
+def controller_job_name(
+    cook_id: str,
+    fingerprint: str,
+    *,
+    name: Optional[str] = None,
+    unique: bool = False,
+) -> str:
+    """
+    Job name for a controller submit.
+
+    Without an explicit name it derives from the fingerprint, so a second
+    submit of the same cook fails to create (409) instead of racing past a
+    lookup. ``unique`` (duplicates allowed) names the job by cook id.
+    """
+    if name:
+        return sanitize_job_name(name)
+    if unique:
+        return sanitize_job_name(f"pdg-ctrl-{cook_id}")
+    return sanitize_job_name(f"pdg-ctrl-{fingerprint[:20]}")
+
+
+def _job_finished(job) -> bool:
+    status = getattr(job, "status", None)
+    if getattr(status, "completion_time", None):
+        return True
+    return any(
+        getattr(cond, "type", "") in ("Complete", "Failed")
+        and (getattr(cond, "status", "") or "").lower() == "true"
+        for cond in getattr(status, "conditions", None) or []
+    )
+
+
+def find_running_controller(batch_api, ns: str, fingerprint: str) -> Optional[str]:
+    """
+    Return the name of an unfinished controller job with this fingerprint.
+
+    Best effort only: two submits can both miss each other here. Jobs with
+    fingerprint-derived names rely on the create conflict instead.
+    """
+    jobs = batch_api.list_namespaced_job(
+        namespace=ns, label_selector=f"{FINGERPRINT_LABEL}={fingerprint}"
+    )
+    for job in getattr(jobs, "items", []) or []:
+        if not _job_finished(job):
+            return job.metadata.name
+    return None
+
+
+def create_controller_job(batch_api, manifest: dict, attempts: int = 3):
+    """
+    Create the controller job; returns ``(name, created)``.
+
+    ``created`` is False when an unfinished job with the same fingerprint
+    already holds the name, i.e. the same cook is running. A finished job keeps its name until
+    ttlSecondsAfterFinished, so it is deleted and the create retried.
+    """
+    from kubernetes import client
+
+    ns = manifest["metadata"]["namespace"]
+    name = manifest["metadata"]["name"]
+    fingerprint = manifest["metadata"].get("labels", {}).get(FINGERPRINT_LABEL)
+    for _ in range(max(1, attempts)):
+        try:
+            job = create_job(batch_api, manifest)
+            return getattr(getattr(job, "metadata", None), "name", name), True
+        except client.exceptions.ApiException as exc:
+            if exc.status != 409:
+                raise
+            conflict = exc
+        try:
+            existing = batch_api.read_namespaced_job(name=name, namespace=ns)
+        except client.exceptions.ApiException as exc:
+            if exc.status != 404:
+                raise
+            continue
+        labels = getattr(existing.metadata, "labels", None) or {}
+        if labels.get(FINGERPRINT_LABEL) != fingerprint:
+            # An explicit --name taken by a different cook
+            raise conflict
+        if not _job_finished(existing):
+            return name, False
+        if getattr(existing.metadata, "deletion_timestamp", None) is None:
+            try:
+                batch_api.delete_namespaced_job(
+                    name=name,
+                    namespace=ns,
+                    body=client.V1DeleteOptions(propagation_policy="Background"),
+                )
+            except client.exceptions.ApiException as exc:
+                if exc.status != 404:
+                    raise
+        time.sleep(1.0)
+    raise RuntimeError(f"Finished job {name} is still being deleted; retry shortly")
+
+
+def submit_to_pool(
+    load_path: Path,
+    hip_path: Path,
+    node: str,
+    fingerprint: str,
+    *,
+    allow_duplicate: bool = False,
+    progress: Optional[Path] = None,
+) -> Optional[dict]:
+    """
+    Hand the cook to a warm controller pod when the pool is enabled and idle.
+
+    Returns ``{"message", "request_id", "progress_path"}``, or None when the
+    caller should submit a regular controller job instead. ``progress_path``
+    is None when an identical queued cook is reused.
+    """
+    if not controller_pool.pool_enabled():
+        return None
+    try:
+        if not allow_duplicate:
+            existing = controller_pool.find_request(fingerprint)
+            if existing:
+                return {
+                    "message": f"Identical cook already on the controller pool: "
+                    f"{existing}",
+                    "request_id": existing,
+                    "progress_path": None,
+                }
+        if controller_pool.available_workers() <= 0:
+            return None
+        env = {var: os.environ.get(var, "") for var in CONTEXT_ENV_VARS}
+        if progress is not None:
+            env[PROGRESS_ENV] = str(progress)
+        request_id = controller_pool.enqueue(
+            str(load_path),
+            node,
+            hip_name=hip_path.as_posix() if load_path != hip_path else None,
+            env=env,
+            fingerprint=fingerprint,
+        )
+    except OSError as exc:
+        print(f"Controller pool unavailable, submitting a job: {exc}", file=sys.stderr)
+        return None
+    message = f"Queued cook on warm controller pool: {request_id}"
+    if progress is not None:
+        message += f" (progress: {progress})"
+    return {
+        "message": message,
+        "request_id": request_id,
+        "progress_path": str(progress) if progress is not None else None,
+    }
+
+
+def _parse_env_field(text: str) -> dict:
+    # "KEY=VAL;KEY2=VAL2" -> dict
+    env = {}
+    for item in (text or "").split(";"):
+        key, sep, value = item.strip().partition("=")
+        if sep and key.strip():
+            env[key.strip()] = value.strip()
+    return env
+
+
+def load_batch_manifest(path: Path) -> list[dict]:
+    """
+    Read batch rows of {"hip", "node", "env"}.
+
+    CSV/TSV files need ``hip`` and ``node`` columns; an ``env`` column holds
+    ``KEY=VAL;KEY2=VAL2`` and any other column is taken as an env override
+    (e.g. ``OOM_SHOT_ID``). YAML/JSON files hold a list of mappings with an
+    optional ``env`` mapping.
+    """
+    text = path.read_text()
+    if path.suffix.lower() in (".csv", ".tsv"):
+        delimiter = "\t" if path.suffix.lower() == ".tsv" else ","
+        raw_rows = []
+        for record in csv.DictReader(text.splitlines(), delimiter=delimiter):
+            row = {k.strip(): (v or "").strip() for k, v in record.items() if k}
+            env = _parse_env_field(row.pop("env", ""))
+            hip = row.pop("hip", "")
+            node = row.pop("node", "")
+            env.update({k: v for k, v in row.items() if v})
+            raw_rows.append({"hip": hip, "node": node, "env": env})
+    else:
+        raw_rows = yaml.safe_load(text) or []
+        if not isinstance(raw_rows, list):
+            raise ValueError("Batch manifest must be a list of rows")
+
+    rows = []
+    for idx, row in enumerate(raw_rows, start=1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {idx}: expected a mapping")
+        hip = str(row.get("hip") or "").strip()
+        node = str(row.get("node") or "").strip()
+        if not hip or not node:
+            raise ValueError(f"Row {idx}: 'hip' and 'node' are required")
+        env = row.get("env") or {}
+        if not isinstance(env, dict):
+            raise ValueError(f"Row {idx}: 'env' must be a mapping")
+        for key in env:
+            if not str(key).isidentifier():
+                raise ValueError(f"Row {idx}: invalid env variable name {key!r}")
+        rows.append(
+            {"hip": hip, "node": node, "env": {k: str(v) for k, v in env.items()}}
+        )
+    return rows
+
+
+def submit_batch(
+    rows: list[dict],
+    *,
+    namespace: str,
+    parallel: int = DEFAULT_BATCH_PARALLEL,
+    dry_run: bool = False,
+    allow_duplicates: bool = False,
+    snapshot: bool = True,
+) -> list[dict]:
+    """Render every controller manifest, then submit them concurrently."""
+    uid, gid = resolve_uid_gid()
+    username = getpass.getuser()
+    hfs = os.environ.get("HFS", DEFAULT_HFS).strip() or DEFAULT_HFS
+    hhp = os.environ.get("HHP", "")
+
+    results: list[dict] = []
+    pending: list[tuple[dict, dict]] = []
+    seen: dict[str, int] = {}
+    for idx, row in enumerate(rows, start=1):
+        result = {"row": idx, "hip": row["hip"], "node": row["node"], "job": ""}
+        results.append(result)
+        hip_path = Path(row["hip"]).expanduser().resolve()
+        if not hip_path.is_file():
+            result.update(ok=False, message=f"HIP file not found: {hip_path}")
+            continue
+        cook_id = new_cook_id()
+        progress = progress_path(hip_path.parent.as_posix(), cook_id)
+        # Dry runs never write to the snapshot store
+        load_path, content_digest = resolve_controller_hip(
+            hip_path, snapshot=snapshot and not dry_run
+        )
+        fingerprint = controller_fingerprint(content_digest, row["node"], row["env"])
+        job_name = controller_job_name(cook_id, fingerprint, unique=allow_duplicates)
+        command = build_controller_cmd(
+            load_path,
+            row["node"],
+            hfs=hfs,
+            hip_dir=hip_path.parent.as_posix(),
+            env={**row["env"], PROGRESS_ENV: str(progress)},
+            hip_name=hip_path.as_posix() if load_path != hip_path else None,
+        )
+        manifest = build_service_job_manifest(
+            name=job_name,
+            ns=namespace,
+            command=command,
+            uid=uid,
+            gid=gid,
+            username=username,
+            hhp=hhp,
+            env_overrides=row["env"],
+        )
+        apply_fingerprint(manifest, fingerprint)
+        if not allow_duplicates and fingerprint in seen:
+            result.update(ok=False, message=f"Duplicate of row {seen[fingerprint]}")
+            continue
+        seen[fingerprint] = idx
+        result["job"] = job_name
+        result["fingerprint"] = fingerprint
+        result["cook_id"] = cook_id
+        result["progress_path"] = str(progress)
+        pending.append((result, manifest))
+
+    if dry_run:
+        for result, _ in pending:
+            result.update(ok=True, message="rendered (dry run)")
+        return results
+    if not pending:
+        return results
+
+    from kubernetes import client
+
+    load_kube()
+    batch_api = client.BatchV1Api()
+
+    def _submit(item: tuple[dict, dict]) -> None:
+        result, manifest = item
+        started = time.monotonic()
+        try:
+            name, created = create_controller_job(batch_api, manifest)
+            if created:
+                result.update(ok=True, job=name, message="submitted")
+            else:
+                # The running job publishes under its own cook id
+                result.update(
+                    ok=True,
+                    job=name,
+                    message="already running",
+                    cook_id=None,
+                    progress_path=None,
+                )
+        except Exception as exc:
+            result.update(ok=False, message=f"Failed to submit: {exc}")
+        result["seconds"] = time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, int(parallel))) as pool:
+        list(pool.map(_submit, pending))
+    return results
+
+
+def _print_batch_summary(results: list[dict], elapsed: float, verb: str) -> None:
+    for result in results:
+        status = "OK  " if result.get("ok") else "FAIL"
+        print(
+            f"{status} #{result['row']:<3} {result['job'] or '-':<32} "
+            f"{result['hip']} {result['node']}  {result.get('message', '')}"
+        )
+    ok = sum(1 for result in results if result.get("ok"))
+    print(f"{ok}/{len(results)} controller jobs {verb} in {elapsed:.1f}s")
+
+
+def _batch_main(args) -> int:
+    try:
+        rows = load_batch_manifest(Path(args.batch).expanduser())
+    except (OSError, ValueError, yaml.YAMLError) as exc:
+        raise SystemExit(f"Invalid batch manifest: {exc}")
+    namespace = (
+        args.namespace or os.environ.get("OOM_PDG_NAMESPACE") or DEFAULT_NAMESPACE
+    ).strip() or DEFAULT_NAMESPACE
+
+    started = time.monotonic()
+    try:
+        results = submit_batch(
+            rows,
+            namespace=namespace,
+            parallel=args.parallel,
+            dry_run=args.dry_run,
+            allow_duplicates=args.force,
+            snapshot=not args.no_snapshot,
+        )
+    except ImportError as exc:
+        raise SystemExit(
+            "The 'kubernetes' Python package is required to submit jobs"
+        ) from exc
+    _print_batch_summary(
+        results,
+        time.monotonic() - started,
+        "rendered" if args.dry_run else "submitted",
+    )
+    return 0 if all(result.get("ok") for result in results) else 1
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(
         description="Submit headless PDG cook (controller job)"
     )
+    parser.add_argument("--hip", help="Absolute path to the .hip/.hiplc file")
+    parser.add_argument("--node", help="TOP/PDG node path (e.g. /obj/topnet1)")
     parser.add_argument(
-        "--hip", required=True, help="Absolute path to the .hip/.hiplc file"
+        "--batch",
+        default=None,
+        help="CSV/TSV/YAML/JSON manifest of hip,node,env rows to submit together",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_BATCH_PARALLEL,
+        help="Concurrent submissions in --batch mode",
     )
     parser.add_argument(
-        "--node", required=True, help="TOP/PDG node path (e.g. /obj/topnet1)"
+        "--no-pool",
+        action="store_true",
+        help="Always start a new controller job, even with a warm pool",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Cook the live hip path instead of an immutable snapshot",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Submit even if an identical controller job is already running",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --batch, render manifests without submitting",
     )
     parser.add_argument(
         "--cpu",
@@ -212,6 +653,11 @@ def main(argv: list[str]) -> int:
     parser.add_argument("--name", default=None, help="Optional job name override")
     args = parser.parse_args(argv)
 
+    if args.batch:
+        return _batch_main(args)
+    if not args.hip or not args.node:
+        parser.error("--hip and --node are required (or pass --batch)")
+
     hip_path = Path(args.hip).expanduser().resolve()
     if not hip_path.is_file():
         raise SystemExit(f"HIP file not found: {hip_path}")
@@ -220,7 +666,7 @@ def main(argv: list[str]) -> int:
     if not node_path:
         raise SystemExit("TOP node path is required")
 
-    cook_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    cook_id = new_cook_id()
     base_dir, scripts_dir = ensure_pdg_dirs(hip_path, cook_id)
 
     if args.cpu:
@@ -237,12 +683,22 @@ def main(argv: list[str]) -> int:
     if not namespace:
         namespace = DEFAULT_NAMESPACE
 
-    job_name_input = args.name or f"pdg-ctrl-{cook_id}"
-    job_name = sanitize_job_name(job_name_input)
-
     hfs = os.environ.get("HFS", DEFAULT_HFS).strip() or DEFAULT_HFS
+    load_path, content_digest = resolve_controller_hip(
+        hip_path, snapshot=not args.no_snapshot
+    )
+    fingerprint = controller_fingerprint(content_digest, node_path)
+    job_name = controller_job_name(
+        cook_id, fingerprint, name=args.name, unique=args.force
+    )
+    progress = progress_path(hip_path.parent.as_posix(), cook_id)
     command = build_controller_cmd(
-        hip_path, node_path, hfs=hfs, hip_dir=hip_path.parent.as_posix()
+        load_path,
+        node_path,
+        hfs=hfs,
+        hip_dir=hip_path.parent.as_posix(),
+        env={PROGRESS_ENV: str(progress)},
+        hip_name=hip_path.as_posix() if load_path != hip_path else None,
     )
 
     manifest = build_service_job_manifest(
@@ -266,11 +722,42 @@ def main(argv: list[str]) -> int:
             "The 'kubernetes' Python package is required to submit jobs"
         ) from exc
 
+    apply_fingerprint(manifest, fingerprint)
+
+    if not args.no_pool:
+        pooled = submit_to_pool(
+            load_path,
+            hip_path,
+            node_path,
+            fingerprint,
+            allow_duplicate=args.force,
+            progress=progress,
+        )
+        if pooled:
+            print(pooled["message"])
+            return 0
+
     load_kube()
     batch_api = client.BatchV1Api()
-    job = create_job(batch_api, manifest)
-    created_name = getattr(getattr(job, "metadata", None), "name", job_name)
-    print(f"Submitted controller job: {created_name} (namespace={namespace})")
+    if not args.force and args.name:
+        running = find_running_controller(batch_api, namespace, fingerprint)
+        if running:
+            print(
+                f"Identical controller job already running: {running} "
+                f"(namespace={namespace}); pass --force to submit anyway"
+            )
+            return 0
+    created_name, created = create_controller_job(batch_api, manifest)
+    if not created:
+        print(
+            f"Identical controller job already running: {created_name} "
+            f"(namespace={namespace}); pass --force to submit anyway"
+        )
+        return 0
+    print(
+        f"Submitted controller job: {created_name} (namespace={namespace}) "
+        f"(progress: {progress})"
+    )
     return 0
 
 
@@ -280,39 +767,88 @@ if __name__ == "__main__":
 
 # Function Defs
 def submit_controller_job(
-    hip: str, node: str, *, namespace: Optional[str] = None, name: Optional[str] = None
+    hip: str,
+    node: str,
+    *,
+    namespace: Optional[str] = None,
+    name: Optional[str] = None,
+    allow_duplicate: bool = False,
+    snapshot: bool = True,
+    cook_id: Optional[str] = None,
 ):
+    result = submit_controller(
+        hip,
+        node,
+        namespace=namespace,
+        name=name,
+        allow_duplicate=allow_duplicate,
+        snapshot=snapshot,
+        cook_id=cook_id,
+    )
+    return result["ok"], result["message"]
+
+
+def submit_controller(
+    hip: str,
+    node: str,
+    *,
+    namespace: Optional[str] = None,
+    name: Optional[str] = None,
+    allow_duplicate: bool = False,
+    snapshot: bool = True,
+    cook_id: Optional[str] = None,
+) -> dict:
+    """
+    Submit a controller cook; returns ``{"ok", "message", ...}``.
+
+    Successful submits add ``job`` or ``request_id`` (pool), and
+    ``cook_id``/``progress_path`` for the cook's progress file. Both are None
+    when the submit resolved to an identical cook that is already running.
+    """
     # Validate inputs
     hip_path = Path(hip).expanduser().resolve()
     if not hip_path.is_file():
-        return False, f"HIP file not found: {hip_path}"
+        return {"ok": False, "message": f"HIP file not found: {hip_path}"}
 
     node_path = (node or "").strip()
     if not node_path:
-        return False, "TOP node path is required"
+        return {"ok": False, "message": "TOP node path is required"}
 
-    # Prepare PDG temp dirs
-    cook_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    # Prepare PDG temp dirs; progress is published under the cook dir
+    cook_id = cook_id or new_cook_id()
+    progress = progress_path(hip_path.parent.as_posix(), cook_id)
     # Resolve IDs
     try:
         uid, gid = resolve_uid_gid()
     except Exception as e:
-        return False, f"Failed resolving UID/GID: {e}"
+        return {"ok": False, "message": f"Failed resolving UID/GID: {e}"}
 
     # Namespace + job name
     ns = (
         namespace or os.environ.get("OOM_PDG_NAMESPACE") or DEFAULT_NAMESPACE
     ).strip() or DEFAULT_NAMESPACE
-    job_name_input = name or f"pdg-ctrl-{cook_id}"
-    job_name = sanitize_job_name(job_name_input)
-
     # get submission username
     username = getpass.getuser()
 
+    # Snapshot the hip so later saves do not change what the farm cooks
+    try:
+        load_path, content_digest = resolve_controller_hip(hip_path, snapshot=snapshot)
+    except OSError as e:
+        return {"ok": False, "message": f"Failed reading HIP file: {e}"}
+    fingerprint = controller_fingerprint(content_digest, node_path)
+    job_name = controller_job_name(
+        cook_id, fingerprint, name=name, unique=allow_duplicate
+    )
+
     # Build controller command (runs hython in the pod)
     hfs = os.environ.get("HFS", DEFAULT_HFS).strip() or DEFAULT_HFS
     command = build_controller_cmd(
-        hip_path, node_path, hfs=hfs, hip_dir=hip_path.parent.as_posix()
+        load_path,
+        node_path,
+        hfs=hfs,
+        hip_dir=hip_path.parent.as_posix(),
+        env={PROGRESS_ENV: str(progress)},
+        hip_name=hip_path.as_posix() if load_path != hip_path else None,
     )
 
     # Build manifest
@@ -334,13 +870,58 @@ def submit_controller_job(
     try:
         from kubernetes import client
     except ImportError:
-        return False, "The 'kubernetes' Python package is required to submit jobs"
+        return {
+            "ok": False,
+            "message": "The 'kubernetes' Python package is required to submit jobs",
+        }
+
+    apply_fingerprint(manifest, fingerprint)
+
+    pooled = submit_to_pool(
+        load_path,
+        hip_path,
+        node_path,
+        fingerprint,
+        allow_duplicate=allow_duplicate,
+        progress=progress,
+    )
+    if pooled:
+        return {
+            "ok": True,
+            "message": pooled["message"],
+            "request_id": pooled["request_id"],
+            "cook_id": cook_id if pooled["progress_path"] else None,
+            "progress_path": pooled["progress_path"],
+        }
 
     try:
         load_kube()
         batch_api = client.BatchV1Api()
-        job = create_job(batch_api, manifest)
-        created_name = getattr(getattr(job, "metadata", None), "name", job_name)
-        return True, f"Submitted controller job: {created_name} (namespace={ns})"
+        # Double-clicked submit buttons and retried agent calls land here
+        # twice; the fingerprint job name turns the second into a conflict
+        running = None
+        if not allow_duplicate and name:
+            running = find_running_controller(batch_api, ns, fingerprint)
+        if running is None:
+            created_name, created = create_controller_job(batch_api, manifest)
+            if not created:
+                running = created_name
+        if running:
+            return {
+                "ok": True,
+                "message": f"Identical controller job already running: {running} "
+                f"(namespace={ns})",
+                "job": running,
+                "cook_id": None,
+                "progress_path": None,
+            }
+        return {
+            "ok": True,
+            "message": f"Submitted controller job: {created_name} (namespace={ns}) "
+            f"(progress: {progress})",
+            "job": created_name,
+            "cook_id": cook_id,
+            "progress_path": str(progress),
+        }
     except Exception as e:
-        return False, f"Failed to submit controller job: {e}"
+        return {"ok": False, "message": f"Failed to submit controller job: {e}"}
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Per-artist compute usage ledger for farm jobs.
+
+The PDG scheduler records one row per finished work item job: who ran it,
+for which shot and TOP node, what it requested and what it actually used
+(sampled from the Kubernetes metrics API while it ran). Rows live in a local
+SQLite database so the ledger survives Houdini sessions. Jobs the sampler
+never saw (metrics API unreachable, or finished between samples) keep NULL
+usage and are left out of the waste figures.
+
+This module does not import Houdini/PDG so the query CLI runs under plain
+Python:
+
+    python -m oom_houdini.usage_ledger summary --by artist --since 7d
+    python -m oom_houdini.usage_ledger summary --by top_node --sort waste
+    python -m oom_houdini.usage_ledger jobs --artist jdoe --limit 20
+
+Environment:
+    OOM_USAGE_DB    path of the SQLite database (default ~/.oom/usage.sqlite)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_DB = "~/.oom/usage.sqlite"
+SAMPLE_INTERVAL = 30.0
+GROUP_COLUMNS = ("artist", "shot", "top_node", "workload")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_usage (
+    job_name TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    artist TEXT,
+    shot TEXT,
+    top_node TEXT,
+    workload TEXT,
+    state TEXT,
+    started_at REAL,
+    finished_at REAL,
+    wall_seconds REAL,
+    cpu_request REAL,
+    mem_request_gib REAL,
+    gpu_request REAL,
+    cpu_seconds_requested REAL,
+    cpu_seconds_used REAL,
+    gib_hours_requested REAL,
+    gib_hours_used REAL,
+    gpu_hours REAL,
+    PRIMARY KEY (namespace, job_name)
+);
+CREATE INDEX IF NOT EXISTS job_usage_finished ON job_usage (finished_at);
+"""
+
+
+def _env_truthy(value):
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "on")
+
+
+_DEV_VERBOSE = _env_truthy(os.environ.get("OOM_DEV", ""))
+
+
+def _dprint(*parts):
+    if not _DEV_VERBOSE:
+        return None
+    try:
+        print("[OOM_DEV][usage_ledger]", *parts)
+    except Exception:
+        pass
+    return None
+
+
+def _log_exception(context: str, exc: Exception) -> None:
+    _dprint(context, "error", repr(exc))
+    return None
+
+
+def default_db_path() -> Path:
+    return Path(os.environ.get("OOM_USAGE_DB") or DEFAULT_DB).expanduser()
+
+
+def _parse_since(value: Optional[str]) -> Optional[float]:
+    # "7d", "12h", "30m" or an epoch timestamp
+    if not value:
+        return None
+    text = value.strip().lower()
+    units = {"d": 86400, "h": 3600, "m": 60}
+    if text[-1:] in units:
+        return time.time() - float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+class UsageSampler:
+    """
+    Integrates actual CPU and memory use of running jobs from metrics.k8s.io.
+
+    One list call per interval covers every scheduler-managed pod; usage is
+    accumulated per job (via the ``oom-bubble-job`` pod label) until the job
+    finishes and :meth:`pop` hands the totals to the ledger.
+    """
+
+    def __init__(
+        self,
+        custom_api_factory: Callable[[], object],
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        self._custom_api_factory = custom_api_factory
+        self._interval = interval
+        self._last_sample = 0.0
+        # job name -> {"cpu_seconds", "gib_seconds", "peak_gib", "last_ts"}
+        self._totals: Dict[str, dict] = {}
+
+    def sample(self, namespace: str = "dcc") -> None:
+        from oom_kube.helpers import parse_quantity
+
+        now = time.monotonic()
+        if now - self._last_sample < self._interval:
+            return None
+        self._last_sample = now
+
+        custom_api = self._custom_api_factory()
+        if custom_api is None:
+            return None
+        try:
+            metrics = custom_api.list_namespaced_custom_object(
+                "metrics.k8s.io",
+                "v1beta1",
+                namespace,
+                "pods",
+                label_selector="managed-by=oom-scheduler",
+            )
+        except Exception as exc:
+            _log_exception("sample:list", exc)
+            return None
+
+        for item in (metrics or {}).get("items", []):
+            labels = (item.get("metadata") or {}).get("labels") or {}
+            job_name = labels.get("oom-bubble-job")
+            if not job_name:
+                continue
+            cpu = 0.0
+            mem_gib = 0.0
+            for container in item.get("containers") or []:
+                usage = container.get("usage") or {}
+                cpu += parse_quantity(usage.get("cpu", "0"))
+                mem_gib += parse_quantity(usage.get("memory", "0")) / 1024**3
+
+            totals = self._totals.setdefault(
+                job_name,
+                {
+                    "cpu_seconds": 0.0,
+                    "gib_seconds": 0.0,
+                    "peak_gib": 0.0,
+                    "last_ts": now,
+                },
+            )
+            # Cap the step so a missed interval is not billed at full rate
+            step = min(now - totals["last_ts"], self._interval * 2) or self._interval
+            totals["cpu_seconds"] += cpu * step
+            totals["gib_seconds"] += mem_gib * step
+            totals["peak_gib"] = max(totals["peak_gib"], mem_gib)
+            totals["last_ts"] = now
+        return None
+
+    def pop(self, job_name: str) -> dict:
+        """Usage totals for ``job_name``; empty if it was never sampled."""
+        totals = self._totals.pop(job_name, None)
+        if not totals:
+            return {}
+        return {
+            "cpu_seconds": float(totals.get("cpu_seconds", 0.0)),
+            "gib_seconds": float(totals.get("gib_seconds", 0.0)),
+            "peak_gib": float(totals.get("peak_gib", 0.0)),
+        }
+
+
+class UsageLedger:
+    def __init__(self, path: Optional[Path] = None):
+        self._path = Path(path) if path else default_db_path()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._path), timeout=10.0)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        return None
+
+    def record(
+        self,
+        *,
+        job_name: str,
+        namespace: str,
+        artist: str,
+        shot: str,
+        top_node: str,
+        workload: str,
+        state: str,
+        started_at: Optional[float],
+        finished_at: Optional[float],
+        cpu_request: float,
+        mem_request_gib: float,
+        gpu_request: float,
+        used: Optional[dict] = None,
+    ) -> None:
+        finished = finished_at if finished_at is not None else time.time()
+        started = started_at if started_at is not None else finished
+        wall = max(0.0, finished - started)
+        # No samples means unknown usage, not zero: store NULL
+        sampled = bool(used)
+        used = used or {}
+        row = {
+            "job_name": job_name,
+            "namespace": namespace,
+            "artist": artist,
+            "shot": shot,
+            "top_node": top_node,
+            "workload": workload,
+            "state": state,
+            "started_at": started,
+            "finished_at": finished,
+            "wall_seconds": wall,
+            "cpu_request": cpu_request,
+            "mem_request_gib": mem_request_gib,
+            "gpu_request": gpu_request,
+            "cpu_seconds_requested": cpu_request * wall,
+            "cpu_seconds_used": (
+                float(used.get("cpu_seconds", 0.0)) if sampled else None
+            ),
+            "gib_hours_requested": mem_request_gib * wall / 3600.0,
+            "gib_hours_used": (
+                float(used.get("gib_seconds", 0.0)) / 3600.0 if sampled else None
+            ),
+            "gpu_hours": gpu_request * wall / 3600.0,
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{key}" for key in row)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO job_usage ({columns}) VALUES ({placeholders})",
+                row,
+            )
+        return None
+
+    def summary(
+        self,
+        group_by: str = "artist",
+        *,
+        since: Optional[float] = None,
+        sort: str = "waste",
+        limit: int = 20,
+    ) -> List[dict]:
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_COLUMNS)}")
+        order = {
+            "waste": "cpu_hours_wasted DESC",
+            "cpu": "cpu_hours_requested DESC",
+            "gpu": "gpu_hours DESC",
+            "jobs": "jobs DESC",
+        }.get(sort)
+        if order is None:
+            raise ValueError("sort must be one of waste, cpu, gpu, jobs")
+
+        sql = f"""
+            SELECT {group_by} AS name,
+                   COUNT(*) AS jobs,
+                   SUM(state = 'failed') AS failed,
+                   SUM(cpu_seconds_requested) / 3600.0 AS cpu_hours_requested,
+                   COUNT(cpu_seconds_used) AS sampled,
+                   SUM(cpu_seconds_used) / 3600.0 AS cpu_hours_used,
+                   SUM(CASE WHEN cpu_seconds_used IS NOT NULL
+                            THEN cpu_seconds_requested - cpu_seconds_used END)
+                       / 3600.0 AS cpu_hours_wasted,
+                   SUM(gib_hours_requested) AS gib_hours_requested,
+                   SUM(gib_hours_used) AS gib_hours_used,
+                   SUM(gpu_hours) AS gpu_hours
+            FROM job_usage
+            WHERE (:since IS NULL OR finished_at >= :since)
+            GROUP BY {group_by}
+            ORDER BY {order}
+            LIMIT :limit
+        """
+        rows = self._connect().execute(sql, {"since": since, "limit": int(limit)})
+        return [dict(row) for row in rows]
+
+    def jobs(
+        self,
+        *,
+        artist: Optional[str] = None,
+        shot: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        sql = """
+            SELECT * FROM job_usage
+            WHERE (:artist IS NULL OR artist = :artist)
+              AND (:shot IS NULL OR shot = :shot)
+              AND (:since IS NULL OR finished_at >= :since)
+            ORDER BY finished_at DESC
+            LIMIT :limit
+        """
+        params = {"artist": artist, "shot": shot, "since": since, "limit": int(limit)}
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+
+def _print_table(rows: List[dict], columns: List[str]) -> None:
+    if not rows:
+        print("No usage recorded")
+        return None
+
+    def _fmt(value) -> str:
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return "" if value is None else str(value)
+
+    cells = [[_fmt(row.get(col)) for col in columns] for row in rows]
+    widths = [
+        max(len(col), *(len(line[idx]) for line in cells))
+        for idx, col in enumerate(columns)
+    ]
+    for line in [columns, *cells]:
+        print("  ".join(c.ljust(widths[idx]) for idx, c in enumerate(line)).rstrip())
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the farm usage ledger")
+    parser.add_argument("--db", default=None, help="SQLite path (env OOM_USAGE_DB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    summary = sub.add_parser("summary", help="Aggregate usage per group")
+    summary.add_argument("--by", default="artist", choices=GROUP_COLUMNS)
+    summary.add_argument("--since", default=None, help="e.g. 7d, 12h or epoch")
+    summary.add_argument(
+        "--sort", default="waste", choices=("waste", "cpu", "gpu", "jobs")
+    )
+    summary.add_argument("--limit", type=int, default=20)
+
+    jobs = sub.add_parser("jobs", help="List individual finished jobs")
+    jobs.add_argument("--artist", default=None)
+    jobs.add_argument("--shot", default=None)
+    jobs.add_argument("--since", default=None, help="e.g. 7d, 12h or epoch")
+    jobs.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args(argv)
+    ledger = UsageLedger(Path(args.db).expanduser() if args.db else None)
+    try:
+        if args.command == "summary":
+            rows = ledger.summary(
+                args.by,
+                since=_parse_since(args.since),
+                sort=args.sort,
+                limit=args.limit,
+            )
+            _print_table(
+                rows,
+                [
+                    "name",
+                    "jobs",
+                    "failed",
+                    "sampled",
+                    "cpu_hours_requested",
+                    "cpu_hours_used",
+                    "cpu_hours_wasted",
+                    "gib_hours_requested",
+                    "gib_hours_used",
+                    "gpu_hours",
+                ],
+            )
+        else:
+            rows = ledger.jobs(
+                artist=args.artist,
+                shot=args.shot,
+                since=_parse_since(args.since),
+                limit=args.limit,
+            )
+            _print_table(
+                rows,
+                [
+                    "job_name",
+                    "artist",
+                    "shot",
+                    "top_node",
+                    "state",
+                    "wall_seconds",
+                    "cpu_seconds_requested",
+                    "cpu_seconds_used",
+                    "gpu_hours",
+                ],
+            )
+    finally:
+        ledger.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -54,6 +54,16 @@ def normalize_cpu(cpu_str: str) -> str:
     raise ValueError("CPU must be a number (e.g. 16 or 2.5)")
 
 
+def parse_quantity(value) -> float:
+    # Kubernetes quantity ("500m", "32Gi", "8") as a plain float; 0 when invalid
+    from kubernetes.utils import parse_quantity as _parse_quantity
+
+    try:
+        return float(_parse_quantity(value))
+    except (TypeError, ValueError):
+        return 0.0
+
+
 # loads kubeconfig from local, or in-cluster
 def load_kube():
     try:
@@ -0,0 +1,207 @@
+"""
+Warm farm nodes with a dcc-runtime image before artists submit.
+
+Renders a DaemonSet (templates/prepull-daemonset.yaml) whose init container
+pulls ``dcc-runtime:<tag>`` on every farm node, then reports per-node pull
+progress from its pods. Run it right after publishing a pipeline release:
+
+    python -m oom_kube.prepull render --tag 1a2b3c4
+    python -m oom_kube.prepull apply --tag 1a2b3c4 --wait
+    python -m oom_kube.prepull status --tag 1a2b3c4
+    python -m oom_kube.prepull delete --tag 1a2b3c4
+
+``--tag`` defaults to OOM_TAG, like the PDG job templates.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+
+import yaml
+from kubernetes import client
+
+from oom_kube.helpers import load_environment, load_kube
+
+TEMPLATE = "prepull-daemonset.yaml"
+DEFAULT_NAMESPACE = "dcc"
+DEFAULT_PRIORITY_CLASS = "farm-default"
+PULL_ERRORS = ("ErrImagePull", "ImagePullBackOff", "InvalidImageName")
+
+
+def _default_tag() -> str:
+    # Same rule as the PDG job builder: dirty or unset trees run "latest"
+    tag = (os.environ.get("OOM_TAG") or "").strip()
+    if not tag or "dirty" in tag:
+        return "latest"
+    return tag
+
+
+def _tag_label(tag: str) -> str:
+    # Label values: <=63 chars of [A-Za-z0-9_.-], alphanumeric at both ends
+    text = re.sub(r"[^A-Za-z0-9_.-]", "-", tag)[:63]
+    return text.strip("-_.") or "latest"
+
+
+def daemonset_name(tag: str) -> str:
+    suffix = re.sub(r"[^a-z0-9-]", "-", tag.lower()).strip("-")
+    return f"dcc-runtime-prepull-{suffix}"[:63].rstrip("-")
+
+
+def build_prepull_manifest(
+    tag: str,
+    namespace: str = DEFAULT_NAMESPACE,
+    priority_class: str = DEFAULT_PRIORITY_CLASS,
+) -> dict:
+    env = load_environment(TEMPLATE)
+    tpl = env.get_template(TEMPLATE)
+    rendered = tpl.render(
+        name=daemonset_name(tag),
+        namespace=namespace,
+        tag_label=_tag_label(tag),
+        priority_class=priority_class,
+        OOM_TAG=tag,
+    )
+    return yaml.safe_load(rendered)
+
+
+def apply_prepull(apps_api: client.AppsV1Api, manifest: dict):
+    namespace = manifest["metadata"]["namespace"]
+    name = manifest["metadata"]["name"]
+    try:
+        return apps_api.create_namespaced_daemon_set(namespace=namespace, body=manifest)
+    except client.exceptions.ApiException as exc:
+        if exc.status != 409:
+            raise
+    return apps_api.replace_namespaced_daemon_set(
+        name=name, namespace=namespace, body=manifest
+    )
+
+
+def delete_prepull(apps_api: client.AppsV1Api, tag: str, namespace: str):
+    try:
+        apps_api.delete_namespaced_daemon_set(
+            name=daemonset_name(tag), namespace=namespace
+        )
+    except client.exceptions.ApiException as exc:
+        if exc.status != 404:
+            raise
+
+
+def _pod_pull_state(pod) -> Dict[str, str]:
+    status = pod.status
+    for cstatus in getattr(status, "init_container_statuses", None) or []:
+        if cstatus.name != "pull":
+            continue
+        state = cstatus.state
+        if state.terminated is not None:
+            if state.terminated.exit_code == 0:
+                return {"state": "pulled", "detail": ""}
+            return {"state": "error", "detail": state.terminated.reason or ""}
+        if state.waiting is not None:
+            reason = state.waiting.reason or ""
+            if reason in PULL_ERRORS:
+                return {"state": "error", "detail": state.waiting.message or reason}
+            return {"state": "pulling", "detail": reason}
+        if state.running is not None:
+            return {"state": "pulled", "detail": ""}
+    return {"state": "pending", "detail": getattr(status, "phase", "") or ""}
+
+
+def pull_status(
+    core_api: client.CoreV1Api, tag: str, namespace: str = DEFAULT_NAMESPACE
+) -> Dict[str, Dict[str, str]]:
+    """Return {node name: {"state", "detail"}} for every farm node."""
+    nodes = core_api.list_node(label_selector="oom/farm=true")
+    report = {
+        node.metadata.name: {"state": "no-pod", "detail": ""}
+        for node in nodes.items
+        if not getattr(node.spec, "unschedulable", False)
+    }
+    pods = core_api.list_namespaced_pod(
+        namespace=namespace,
+        label_selector=f"app=dcc-runtime-prepull,oom/prepull={_tag_label(tag)}",
+    )
+    for pod in pods.items:
+        node_name = pod.spec.node_name
+        if node_name:
+            report[node_name] = _pod_pull_state(pod)
+    return report
+
+
+def _print_report(report: Dict[str, Dict[str, str]]) -> None:
+    width = max([len(name) for name in report] + [4])
+    for name in sorted(report):
+        entry = report[name]
+        print(f"{name.ljust(width)}  {entry['state']:<8}  {entry['detail']}".rstrip())
+    done = sum(1 for entry in report.values() if entry["state"] == "pulled")
+    print(f"{done}/{len(report)} nodes pulled")
+
+
+def wait_for_pull(
+    core_api: client.CoreV1Api,
+    tag: str,
+    namespace: str,
+    timeout: float,
+    interval: float = 10.0,
+) -> bool:
+    deadline = time.monotonic() + timeout
+    last: Optional[str] = None
+    while True:
+        report = pull_status(core_api, tag, namespace)
+        states = [entry["state"] for entry in report.values()]
+        done = states.count("pulled")
+        line = f"{done}/{len(states)} nodes pulled"
+        if line != last:
+            print(line, flush=True)
+            last = line
+        if states and done == len(states):
+            return True
+        if time.monotonic() >= deadline:
+            _print_report(report)
+            return False
+        time.sleep(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-pull dcc-runtime images")
+    parser.add_argument(
+        "command", choices=("render", "apply", "status", "wait", "delete")
+    )
+    parser.add_argument("--tag", default=None, help="Image tag (default OOM_TAG)")
+    parser.add_argument("--namespace", default=DEFAULT_NAMESPACE)
+    parser.add_argument("--priority-class", default=DEFAULT_PRIORITY_CLASS)
+    parser.add_argument(
+        "--wait", action="store_true", help="After apply, wait for every node"
+    )
+    parser.add_argument("--timeout", type=float, default=1800.0)
+    args = parser.parse_args(argv)
+
+    tag = args.tag or _default_tag()
+    manifest = build_prepull_manifest(tag, args.namespace, args.priority_class)
+    if args.command == "render":
+        print(yaml.safe_dump(manifest, sort_keys=False), end="")
+        return 0
+
+    load_kube()
+    if args.command == "delete":
+        delete_prepull(client.AppsV1Api(), tag, args.namespace)
+        print(f"Deleted {daemonset_name(tag)}")
+        return 0
+
+    core_api = client.CoreV1Api()
+    if args.command == "apply":
+        apply_prepull(client.AppsV1Api(), manifest)
+        print(f"Applied {daemonset_name(tag)} for dcc-runtime:{tag}")
+        if not args.wait:
+            return 0
+    if args.command == "status":
+        _print_report(pull_status(core_api, tag, args.namespace))
+        return 0
+    return 0 if wait_for_pull(core_api, tag, args.namespace, args.timeout) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
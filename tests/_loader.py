@@ -0,0 +1,25 @@
+"""Load repository modules by file path for the unit tests.
+
+Importing through the packages would pull in pdg, hou or Toolkit via their
+``__init__`` modules, and src/ is kept off sys.path. Test modules add this
+directory to sys.path and import ``load_module`` from here.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).parent.parent
+
+
+def load_module(name: str, relative: str) -> ModuleType:
+    """Execute ``ROOT / relative`` as module ``name`` and return it."""
+    spec = importlib.util.spec_from_file_location(name, ROOT / relative)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look the module up in sys.modules while it executes
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
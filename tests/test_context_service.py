@@ -0,0 +1,104 @@
+"""Unit tests keeping the MCP context client in step with the context service.
+
+oom_agent.context carries its own copy of the oom_context_service client
+(the MCP interpreter cannot import src/). These tests load both and check
+that they agree on the socket path and the request/reply framing, using a
+real Unix socket server with a stub service behind it.
+
+Run with:
+    python3 -m unittest tests/test_context_service.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import ROOT, load_module  # noqa: E402
+
+_MCP_SERVER_DIR = str(ROOT / "mcp-server")
+if _MCP_SERVER_DIR not in sys.path:
+    sys.path.insert(0, _MCP_SERVER_DIR)
+
+from oom_agent import context as mcp_context  # noqa: E402
+
+
+# Standard library only; loaded by path so src/ stays off sys.path
+service = load_module("oom_context_service", "src/oom_context_service.py")
+
+
+class _StubService:
+    def __init__(self):
+        self.requests = []
+
+    def handle(self, request: dict) -> dict:
+        self.requests.append(request)
+        if request.get("project") == "missing":
+            return {"ok": False, "error": "ContextError: Not a project"}
+        return {"ok": True, "env": {"OOM_PROJECT_ID": 7, "OOM_SHOT_PATH": "/s"}}
+
+
+class TestSocketPath(unittest.TestCase):
+    def test_explicit_socket(self):
+        with patch.dict(os.environ, {"OOM_CONTEXT_SERVICE_SOCKET": "/tmp/x.sock"}):
+            self.assertEqual(mcp_context._service_socket(), service.socket_path())
+
+    def test_runtime_dir_default(self):
+        env = {"OOM_CONTEXT_SERVICE_SOCKET": "", "XDG_RUNTIME_DIR": "/run/user/1"}
+        with patch.dict(os.environ, env):
+            self.assertEqual(mcp_context._service_socket(), service.socket_path())
+
+    def test_tmp_default(self):
+        with patch.dict(os.environ, {"OOM_CONTEXT_SERVICE_SOCKET": ""}):
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+            self.assertEqual(mcp_context._service_socket(), service.socket_path())
+
+
+class TestRequestFraming(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.sock = str(Path(self._tmp.name) / "ctx.sock")
+        self.stub = _StubService()
+        self.server = service._Server(self.sock, service._Handler)
+        self.server.service = self.stub
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        self._env = patch.dict(os.environ, {"OOM_CONTEXT_SERVICE_SOCKET": self.sock})
+        self._env.start()
+
+    def tearDown(self):
+        self._env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def test_mcp_client_resolves(self):
+        env = mcp_context._resolve_via_service("py", "pp", "Proj", "SQ", "SH", 5.0)
+        self.assertEqual(env, {"OOM_PROJECT_ID": "7", "OOM_SHOT_PATH": "/s"})
+        self.assertEqual(
+            self.stub.requests[-1],
+            {"command": "resolve", "project": "Proj", "sequence": "SQ", "shot": "SH"},
+        )
+
+    def test_service_client_matches(self):
+        env = service.resolve("Proj", "SQ", "SH")
+        self.assertEqual(env, {"OOM_PROJECT_ID": 7, "OOM_SHOT_PATH": "/s"})
+
+    def test_errors_surface(self):
+        with self.assertRaises(RuntimeError):
+            mcp_context._resolve_via_service("py", "pp", "missing", None, None, 5.0)
+        with self.assertRaises(RuntimeError):
+            service.resolve("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
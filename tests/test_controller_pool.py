@@ -0,0 +1,165 @@
+"""Unit tests for the warm controller pool's file queue.
+
+Exercises enqueue, claim, finish and the reaping of claims left by dead
+workers against a temporary pool root. controller_pool imports Houdini and
+kubernetes only inside worker and deployment code, so it is loaded by path.
+
+Run with:
+    python3 -m unittest tests/test_controller_pool.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+pool = load_module("controller_pool", "src/oom_houdini/controller_pool.py")
+
+
+class TestControllerPoolQueue(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._env = patch.dict(os.environ, {"OOM_CONTROLLER_POOL_ROOT": self._tmp.name})
+        self._env.start()
+        self.root = pool.pool_root("artist")
+
+    def tearDown(self):
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def _enqueue(self, fingerprint="fp-1"):
+        return pool.enqueue(
+            "/snap/a.hip",
+            "/obj/topnet1",
+            env={"OOM_SHOT_ID": 7},
+            fingerprint=fingerprint,
+            user="artist",
+        )
+
+    def _heartbeat(self, worker_id, updated):
+        path = self.root / "workers" / f"{worker_id}.json"
+        path.write_text(json.dumps({"worker": worker_id, "updated": updated}))
+
+    def test_enqueue_then_claim_in_order(self):
+        first = self._enqueue("fp-1")
+        time.sleep(0.002)
+        second = self._enqueue("fp-2")
+        self.assertEqual(pool.request_status(first, "artist")["state"], "queued")
+
+        claimed = pool.claim_next(self.root, "worker-a")
+        self.assertEqual(claimed["id"], first)
+        self.assertEqual(claimed["worker"], "worker-a")
+        self.assertEqual(claimed["env"], {"OOM_SHOT_ID": 7})
+        self.assertEqual(pool.request_status(first, "artist")["state"], "cooking")
+        self.assertEqual(pool.claim_next(self.root, "worker-b")["id"], second)
+        self.assertIsNone(pool.claim_next(self.root, "worker-c"))
+
+    def test_finish_publishes_result(self):
+        request_id = self._enqueue()
+        pool.claim_next(self.root, "worker-a")
+        pool.finish_request(
+            self.root, request_id, {"id": request_id, "state": "succeeded"}
+        )
+        self.assertEqual(
+            pool.request_status(request_id, "artist")["state"], "succeeded"
+        )
+        self.assertEqual(list((self.root / "claimed").glob("*.json")), [])
+
+    def test_find_request_matches_queued_and_claimed(self):
+        request_id = self._enqueue("fp-9")
+        self.assertEqual(pool.find_request("fp-9", "artist"), request_id)
+        self._heartbeat("worker-a", time.time())
+        pool.claim_next(self.root, "worker-a")
+        self.assertEqual(pool.find_request("fp-9", "artist"), request_id)
+        self.assertIsNone(pool.find_request("other", "artist"))
+
+    def test_dead_worker_claim_is_requeued_then_failed(self):
+        request_id = self._enqueue()
+        self._heartbeat("worker-a", time.time() - 10 * pool.STALE_SECONDS)
+        pool.claim_next(self.root, "worker-a")
+
+        # Requeued until MAX_ATTEMPTS claims have died, then failed
+        self.assertEqual(pool.reap_stale_claims(self.root), 1)
+        self.assertEqual(pool.request_status(request_id, "artist")["state"], "queued")
+
+        pool.claim_next(self.root, "worker-a")
+        pool.reap_stale_claims(self.root)
+        status = pool.request_status(request_id, "artist")
+        self.assertEqual(status["state"], "failed")
+
+    def test_live_worker_claim_is_kept(self):
+        request_id = self._enqueue()
+        self._heartbeat("worker-a", time.time())
+        pool.claim_next(self.root, "worker-a")
+        self.assertEqual(pool.reap_stale_claims(self.root), 0)
+        self.assertEqual(pool.request_status(request_id, "artist")["state"], "cooking")
+
+    def _age_queue(self, request_id):
+        # A request that waited in the queue longer than STALE_SECONDS
+        old = time.time() - 2 * pool.STALE_SECONDS
+        os.utime(self.root / "queue" / f"{request_id}.json", (old, old))
+
+    def _before_claim_write(self, action):
+        # Run ``action`` between claim_next's rename and its claim write
+        original = pool._write_json_atomic
+
+        def write(path, data, **kwargs):
+            if path.parent.name == "claimed" and "worker" in data:
+                action()
+            return original(path, data, **kwargs)
+
+        return patch.object(pool, "_write_json_atomic", side_effect=write)
+
+    def test_reaper_leaves_a_claim_being_recorded(self):
+        request_id = self._enqueue()
+        self._age_queue(request_id)
+        reaped = []
+        with self._before_claim_write(
+            lambda: reaped.append(pool.reap_stale_claims(self.root))
+        ):
+            claimed = pool.claim_next(self.root, "worker-a")
+        self.assertEqual(reaped, [0])
+        self.assertEqual(claimed["id"], request_id)
+        self.assertEqual(list((self.root / "queue").glob("*.json")), [])
+        self.assertIsNone(pool.claim_next(self.root, "worker-b"))
+
+    def test_requeued_claim_is_not_written_back(self):
+        request_id = self._enqueue()
+        name = f"{request_id}.json"
+
+        def requeue():
+            os.rename(self.root / "claimed" / name, self.root / "queue" / name)
+
+        with self._before_claim_write(requeue):
+            self.assertIsNone(pool.claim_next(self.root, "worker-a"))
+        self.assertEqual(list((self.root / "claimed").glob("*.json")), [])
+        # The requeued request is claimed once, by the next worker
+        self.assertEqual(pool.claim_next(self.root, "worker-b")["id"], request_id)
+        self.assertEqual(len(list((self.root / "claimed").glob("*.json"))), 1)
+
+    def test_prune_done_drops_old_results(self):
+        request_id = self._enqueue()
+        pool.claim_next(self.root, "worker-a")
+        pool.finish_request(self.root, request_id, {"id": request_id, "state": "ok"})
+        done = self.root / "done" / f"{request_id}.json"
+        old = time.time() - pool.DONE_TTL - 60
+        os.utime(done, (old, old))
+        self.assertEqual(pool.prune_done(self.root), 1)
+        self.assertEqual(pool.request_status(request_id, "artist")["state"], "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
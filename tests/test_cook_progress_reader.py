@@ -0,0 +1,97 @@
+"""Unit tests keeping the MCP progress reader in step with cook_progress.
+
+oom_agent.cook_progress carries its own copy of the progress reader (the
+MCP interpreter cannot import src/). These tests check that it formats
+progress like oom_houdini.cook_progress, reads the files that module writes
+and refuses paths outside a pdgtemp cook directory.
+
+Run with:
+    python3 -m unittest tests/test_cook_progress_reader.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import ROOT, load_module  # noqa: E402
+
+_MCP_SERVER_DIR = str(ROOT / "mcp-server")
+if _MCP_SERVER_DIR not in sys.path:
+    sys.path.insert(0, _MCP_SERVER_DIR)
+
+from oom_agent import cook_progress as reader  # noqa: E402
+
+cook_progress = load_module("cook_progress", "src/oom_houdini/cook_progress.py")
+
+SAMPLES = [
+    None,
+    {},
+    {"state": "loading"},
+    {"state": "cooking", "generated": 40, "scheduled": 8, "cooked": 12, "eta": 75},
+    {"state": "cooking", "generated": 9, "cooked": 1, "eta": 7322.4},
+    {"state": "failed", "generated": 3, "cooked": 2, "failed": 1, "eta": None},
+]
+
+
+class TestFormatProgress(unittest.TestCase):
+    def test_matches_cook_progress(self):
+        for data in SAMPLES:
+            with self.subTest(data=data):
+                self.assertEqual(
+                    reader.format_progress(data), cook_progress.format_progress(data)
+                )
+
+
+class TestProgressFile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.hip_dir = Path(self._tmp.name).resolve()
+        self.path = cook_progress.progress_path(str(self.hip_dir), "abc123")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_reads_what_the_controller_writes(self):
+        data = {"state": "cooking", "generated": 4, "cooked": 1}
+        cook_progress._write_json_atomic(self.path, data)
+        target = reader.progress_file(str(self.path))
+        self.assertEqual(target, self.path)
+        self.assertEqual(reader.read_progress(target), data)
+        self.assertEqual(reader.progress_file(str(self.path.parent)), self.path)
+
+    def test_missing_file_reads_as_none(self):
+        self.assertIsNone(reader.read_progress(reader.progress_file(str(self.path))))
+
+    def test_other_files_are_refused(self):
+        secret = self.hip_dir / "secret.json"
+        secret.write_text(json.dumps({"token": "x"}))
+        for path in (
+            secret,
+            self.hip_dir / "progress.json",
+            self.hip_dir / "pdgtemp_" / "progress.json",
+            self.path.parent / ".." / "secret.json",
+        ):
+            with self.subTest(path=path):
+                with self.assertRaises(ValueError):
+                    reader.progress_file(str(path))
+
+    def test_links_out_of_a_cook_dir_are_refused(self):
+        secret = self.hip_dir / "secret.json"
+        secret.write_text("{}")
+        self.path.parent.mkdir(parents=True)
+        os.symlink(secret, self.path)
+        with self.assertRaises(ValueError):
+            reader.progress_file(str(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for loading snapshot hips in the headless controller cook.
+
+cook_top needs Houdini, so a fake ``hou`` module and a stub oom_cache stand
+in while it is loaded by path; cook_progress and hip_snapshot are the real
+modules.
+
+Run with:
+    python3 -m unittest tests/test_cook_top.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+class _FakeHipFile:
+    def __init__(self):
+        self.name = "untitled.hip"
+
+    def load(self, path):
+        self.name = path
+
+    def path(self):
+        return self.name
+
+    def setName(self, name):
+        self.name = name
+
+
+class _FakeHou(ModuleType):
+    def __init__(self):
+        super().__init__("hou")
+        self.hipFile = _FakeHipFile()
+        self.commands = []
+        self.env = {}
+
+    def hscript(self, command):
+        self.commands.append(command)
+        return ("", "")
+
+    def putenv(self, key, value):
+        self.env[key] = value
+
+    def unsetenv(self, key):
+        self.env.pop(key, None)
+
+
+def _stub(name, **attrs):
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+_package = _stub("oom_houdini", __path__=[])
+with patch.dict(
+    sys.modules,
+    {
+        "hou": _FakeHou(),
+        "oom_houdini": _package,
+        "oom_houdini.oom_cache": _stub("oom_houdini.oom_cache"),
+    },
+):
+    _package.cook_progress = load_module(
+        "oom_houdini.cook_progress", "src/oom_houdini/cook_progress.py"
+    )
+    _package.hip_snapshot = load_module(
+        "oom_houdini.hip_snapshot", "src/oom_houdini/hip_snapshot.py"
+    )
+    cook_top = load_module("cook_top", "src/oom_houdini/cook_top.py")
+
+SNAPSHOT = "/mnt/RAID/pdg_snapshots/blobs/ab/abcdef.hiplc"
+ARTIST_HIP = "/mnt/RAID/Projects/p/SQ010/SH010/tasks/fx/houdini/sim.v003.hiplc"
+
+
+class TestLoadAndCookSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.hou = _FakeHou()
+        self._patches = [
+            patch.object(cook_top, "hou", self.hou),
+            patch.dict(sys.modules, {"hou": self.hou}),
+            patch.dict(os.environ, {}),
+        ]
+        for patcher in self._patches:
+            patcher.start()
+        os.environ.pop(cook_top.CONTEXT_PATH_ENV, None)
+        os.environ.pop("OOM_COOK_PROGRESS", None)
+        self.at_cook = {}
+
+    def tearDown(self):
+        for patcher in reversed(self._patches):
+            patcher.stop()
+
+    def _record_cook(self, node_path, block, progress):
+        self.at_cook["hipfile"] = self.hou.hipFile.path()
+        self.at_cook["context"] = os.environ.get(cook_top.CONTEXT_PATH_ENV)
+
+    def test_hipfile_stays_on_snapshot_during_cook(self):
+        with patch.object(cook_top, "_cook_node", side_effect=self._record_cook):
+            cook_top.load_and_cook(SNAPSHOT, "/obj/topnet1/out", ARTIST_HIP)
+        self.assertEqual(self.at_cook["hipfile"], SNAPSHOT)
+        self.assertEqual(self.at_cook["context"], ARTIST_HIP)
+        self.assertEqual(
+            self.hou.commands,
+            [
+                "set -g HIP = '/mnt/RAID/Projects/p/SQ010/SH010/tasks/fx/houdini'",
+                "set -g HIPNAME = 'sim.v003'",
+                "varchange",
+            ],
+        )
+        # The override does not outlive the cook
+        self.assertNotIn(cook_top.CONTEXT_PATH_ENV, os.environ)
+        self.assertNotIn(cook_top.CONTEXT_PATH_ENV, self.hou.env)
+
+    def test_live_hip_leaves_variables_alone(self):
+        with patch.object(cook_top, "_cook_node", side_effect=self._record_cook):
+            cook_top.load_and_cook(ARTIST_HIP, "/obj/topnet1/out")
+        self.assertEqual(self.at_cook, {"hipfile": ARTIST_HIP, "context": None})
+        self.assertEqual(self.hou.commands, [])
+
+    def test_override_is_restored_after_a_failed_cook(self):
+        os.environ[cook_top.CONTEXT_PATH_ENV] = "/previous.hip"
+        with patch.object(cook_top, "_cook_node", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                cook_top.load_and_cook(SNAPSHOT, "/obj/topnet1/out", ARTIST_HIP)
+        self.assertEqual(os.environ[cook_top.CONTEXT_PATH_ENV], "/previous.hip")
+
+
+if __name__ == "__main__":
+    unittest.main()
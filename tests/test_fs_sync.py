@@ -0,0 +1,163 @@
+"""Unit tests for skipping Toolkit folder sync and creation when up to date.
+
+A fake Toolkit instance and ShotGrid connection stand in for tk-core;
+oom_fs_sync is loaded by path.
+
+Run with:
+    python3 -m unittest tests/test_fs_sync.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+fs_sync = load_module("oom_fs_sync", "src/oom_fs_sync.py")
+
+
+class _FakeShotgun:
+    def __init__(self):
+        self.event_id = 0
+        self.tasks = []
+
+    def find_one(self, entity_type, filters, fields, order=None):
+        assert entity_type == "EventLogEntry"
+        return {"id": self.event_id} if self.event_id else None
+
+    def find(self, entity_type, filters, fields):
+        assert entity_type == "Task"
+        return list(self.tasks)
+
+
+class _FakePipelineConfiguration:
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+
+    def get_path_cache_location(self):
+        return self.cache_path
+
+    def get_project_id(self):
+        return 1
+
+
+class _FakeToolkit:
+    def __init__(self, root):
+        self.shotgun = _FakeShotgun()
+        self.pipeline_configuration = _FakePipelineConfiguration(
+            os.path.join(root, "path_cache.db")
+        )
+        self.paths = {}
+        self.synced = 0
+        self.created = []
+
+    def synchronize_filesystem_structure(self):
+        self.synced += 1
+        Path(self.pipeline_configuration.cache_path).touch()
+
+    def paths_from_entity(self, entity_type, entity_id):
+        return list(self.paths.get((entity_type, entity_id), []))
+
+    def create_filesystem_structure(self, entity_type, entity_id):
+        self.created.append((entity_type, entity_id))
+
+
+class TestSynchronizeIfChanged(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tk = _FakeToolkit(self._tmp.name)
+        self.project = {"type": "Project", "id": 1}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_skips_until_a_folder_event_is_logged(self):
+        self.tk.shotgun.event_id = 10
+        self.assertTrue(fs_sync.synchronize_if_changed(self.tk, self.project))
+        self.assertFalse(fs_sync.synchronize_if_changed(self.tk, self.project))
+        self.tk.shotgun.event_id = 11
+        self.assertTrue(fs_sync.synchronize_if_changed(self.tk, self.project))
+        self.assertEqual(self.tk.synced, 2)
+
+    def test_missing_path_cache_forces_sync(self):
+        self.tk.shotgun.event_id = 10
+        fs_sync.synchronize_if_changed(self.tk, self.project)
+        os.remove(self.tk.pipeline_configuration.cache_path)
+        self.assertTrue(fs_sync.synchronize_if_changed(self.tk, self.project))
+
+    def test_force(self):
+        fs_sync.synchronize_if_changed(self.tk, self.project)
+        self.assertTrue(fs_sync.synchronize_if_changed(self.tk, self.project, True))
+
+
+class TestEnsureFilesystemStructure(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tk = _FakeToolkit(self._tmp.name)
+        self.shot_root = os.path.join(self._tmp.name, "SQ010", "SH010")
+        os.makedirs(self.shot_root)
+        self.tk.paths[("Shot", 5)] = [self.shot_root]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _step_folder(self, step_id, name, create=True):
+        path = os.path.join(self.shot_root, "tasks", name)
+        if create:
+            os.makedirs(path)
+        self.tk.paths[("Step", step_id)] = [path, f"/elsewhere/{name}"]
+        return path
+
+    def test_missing_shot_folder_is_created(self):
+        self.tk.paths[("Shot", 6)] = [os.path.join(self._tmp.name, "SH020")]
+        self.assertTrue(fs_sync.ensure_filesystem_structure(self.tk, "Shot", 6))
+        self.assertEqual(self.tk.created, [("Shot", 6)])
+
+    def test_existing_shot_with_step_folders_is_skipped(self):
+        self._step_folder(20, "fx")
+        self.tk.shotgun.tasks = [{"id": 100, "step": {"id": 20}}]
+        self.assertFalse(fs_sync.ensure_filesystem_structure(self.tk, "Shot", 5))
+        self.assertEqual(self.tk.created, [])
+
+    def test_new_step_on_existing_shot_is_created(self):
+        self._step_folder(20, "fx")
+        self._step_folder(21, "lighting", create=False)
+        self.tk.shotgun.tasks = [
+            {"id": 100, "step": {"id": 20}},
+            {"id": 101, "step": {"id": 21}},
+        ]
+        self.assertTrue(fs_sync.ensure_filesystem_structure(self.tk, "Shot", 5))
+        self.assertEqual(self.tk.created, [("Shot", 5)])
+
+    def test_new_task_folder_is_created(self):
+        done = os.path.join(self.shot_root, "tasks", "fx", "sim")
+        os.makedirs(done)
+        self.tk.paths[("Task", 100)] = [done]
+        self.tk.paths[("Task", 101)] = [
+            os.path.join(self.shot_root, "tasks", "fx", "fl")
+        ]
+        self.tk.shotgun.tasks = [
+            {"id": 100, "step": {"id": 20}},
+            {"id": 101, "step": {"id": 20}},
+        ]
+        self.assertTrue(fs_sync.ensure_filesystem_structure(self.tk, "Shot", 5))
+
+    def test_check_failure_falls_back_to_create(self):
+        def _broken(*args):
+            raise RuntimeError("ShotGrid down")
+
+        self.tk.shotgun.find = _broken
+        self.assertTrue(fs_sync.ensure_filesystem_structure(self.tk, "Shot", 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
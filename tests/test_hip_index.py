@@ -0,0 +1,113 @@
+"""Unit tests for the per-shot hip file index.
+
+hip_index is standard library only; it is loaded by path so src/ stays off
+sys.path. Each test gets its own shot folder and index directory.
+
+Run with:
+    python3 -m unittest tests/test_hip_index.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+hip_index = load_module("hip_index", "src/oom_houdini/hip_index.py")
+
+
+class TestParseHipName(unittest.TestCase):
+    def test_versioned(self):
+        self.assertEqual(
+            hip_index.parse_hip_name("fx_sim.v012.hiplc"), ("fx_sim", 12, ".hiplc")
+        )
+
+    def test_unversioned(self):
+        self.assertEqual(
+            hip_index.parse_hip_name("layout.hip"), ("layout", None, ".hip")
+        )
+
+    def test_other_files_are_ignored(self):
+        self.assertIsNone(hip_index.parse_hip_name("fx_sim.v012.hip.bak"))
+        self.assertIsNone(hip_index.parse_hip_name("notes.txt"))
+
+
+class TestShotIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.shot = base / "SH010"
+        self._env = patch.dict(os.environ, {"OOM_HIP_INDEX_DIR": str(base / "index")})
+        self._env.start()
+        hip_index._memory.clear()
+
+    def tearDown(self):
+        hip_index._memory.clear()
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def _save(self, step, filename, data=b"hip"):
+        folder = self.shot / "tasks" / step / "houdini"
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / filename
+        path.write_bytes(data)
+        return path
+
+    def _bump_mtime(self, path):
+        # Coarse filesystem timestamps would otherwise hide the change
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_find_latest_across_steps(self):
+        self._save("fx", "sim.v001.hip")
+        self._save("fx", "sim.v003.hiplc")
+        self._save("lighting", "sim.v002.hip")
+        latest = hip_index.find_latest(self.shot, "sim")
+        self.assertEqual((latest.step, latest.version, latest.ext), ("fx", 3, ".hiplc"))
+
+    def test_hip_wins_a_version_tie(self):
+        self._save("fx", "sim.v004.hiplc")
+        self._save("fx", "sim.v004.hip")
+        self.assertEqual(hip_index.find_latest(self.shot, "sim").ext, ".hip")
+
+    def test_unchanged_dir_is_not_rescanned(self):
+        self._save("fx", "sim.v001.hip")
+        hip_index.shot_index(self.shot)
+        with patch.object(hip_index, "_scan_dir", side_effect=AssertionError):
+            self.assertEqual(len(hip_index.shot_index(self.shot)), 1)
+
+    def test_new_file_triggers_rescan(self):
+        first = self._save("fx", "sim.v001.hip")
+        hip_index.shot_index(self.shot)
+        self._save("fx", "sim.v002.hip")
+        self._bump_mtime(first.parent)
+        self.assertEqual(hip_index.find_latest(self.shot, "sim").version, 2)
+
+    def test_index_file_survives_process(self):
+        self._save("fx", "sim.v001.hip")
+        hip_index.shot_index(self.shot)
+        hip_index._memory.clear()
+        with patch.object(hip_index, "_scan_dir", side_effect=AssertionError):
+            self.assertEqual(hip_index.find_latest(self.shot, "sim").version, 1)
+
+    def test_in_place_save_reports_current_size(self):
+        path = self._save("fx", "sim.v001.hip", b"small")
+        hip_index.shot_index(self.shot)
+        folder_stat = os.stat(path.parent)
+        path.write_bytes(b"a much larger save")
+        os.utime(path.parent, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+        self.assertEqual(hip_index.find_latest(self.shot, "sim").size, 18)
+
+
+if __name__ == "__main__":
+    unittest.main()
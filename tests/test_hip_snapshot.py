@@ -0,0 +1,81 @@
+"""Unit tests for the content-addressed hip snapshot store.
+
+hip_snapshot is standard library only; it is loaded by path so src/ stays
+off sys.path.
+
+Run with:
+    python3 -m unittest tests/test_hip_snapshot.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+hip_snapshot = load_module("hip_snapshot", "src/oom_houdini/hip_snapshot.py")
+
+
+class TestStoreSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.store = base / "store"
+        self.hip = base / "shot" / "fx_sim.v003.hiplc"
+        self.hip.parent.mkdir()
+        self.hip.write_bytes(b"hip contents v3")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_blob_named_by_content(self):
+        snap = hip_snapshot.store_snapshot(self.hip, self.store)
+        digest = hashlib.sha256(b"hip contents v3").hexdigest()
+        self.assertEqual(snap.digest, digest)
+        self.assertEqual(
+            snap.path, self.store / "blobs" / digest[:2] / f"{digest}.hiplc"
+        )
+        self.assertEqual(snap.path.read_bytes(), b"hip contents v3")
+        self.assertFalse(snap.reused)
+        self.assertEqual(snap.path.stat().st_mode & 0o777, 0o444)
+
+    def test_same_contents_are_deduplicated(self):
+        first = hip_snapshot.store_snapshot(self.hip, self.store)
+        copy = self.hip.with_name("fx_sim.v004.hiplc")
+        copy.write_bytes(b"hip contents v3")
+        second = hip_snapshot.store_snapshot(copy, self.store)
+        self.assertTrue(second.reused)
+        self.assertEqual(second.path, first.path)
+        blobs = list((self.store / "blobs").rglob("*.hiplc"))
+        self.assertEqual(len(blobs), 1)
+
+    def test_unchanged_source_is_not_rehashed(self):
+        hip_snapshot.store_snapshot(self.hip, self.store)
+        with patch.object(hip_snapshot, "file_digest", side_effect=AssertionError):
+            snap = hip_snapshot.store_snapshot(self.hip, self.store)
+        self.assertTrue(snap.reused)
+
+    def test_changed_source_gets_new_blob(self):
+        first = hip_snapshot.store_snapshot(self.hip, self.store)
+        self.hip.write_bytes(b"hip contents, saved again")
+        stat = self.hip.stat()
+        os.utime(self.hip, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = hip_snapshot.store_snapshot(self.hip, self.store)
+        self.assertFalse(second.reused)
+        self.assertNotEqual(second.digest, first.digest)
+        self.assertEqual(first.path.read_bytes(), b"hip contents v3")
+
+
+if __name__ == "__main__":
+    unittest.main()
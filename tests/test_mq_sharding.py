@@ -0,0 +1,74 @@
+"""Unit tests for relay shard selection in the PDG message queue manager.
+
+mq.py imports pdg only when connecting, so it is loaded by path without the
+oom_scheduler package (whose __init__ imports pdg).
+
+Run with:
+    python3 -m unittest tests/test_mq_sharding.py
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+mq = load_module("oom_mq", "src/oom_houdini/oom_scheduler/mq.py")
+
+
+def _shards(count):
+    return [
+        {"host": f"10.0.0.{idx}", "relay_port": 53000, "callback_port": 53001}
+        for idx in range(1, count + 1)
+    ]
+
+
+class TestShardOrder(unittest.TestCase):
+    def test_order_is_stable(self):
+        shards = _shards(4)
+        first = mq.shard_order("client-a", shards)
+        self.assertEqual(first, mq.shard_order("client-a", list(shards)))
+        # Configuration order does not change the ring
+        self.assertEqual(first, mq.shard_order("client-a", list(reversed(shards))))
+
+    def test_order_covers_every_shard_once(self):
+        shards = _shards(5)
+        order = mq.shard_order("client-b", shards)
+        self.assertEqual(len(order), 5)
+        self.assertCountEqual([s["host"] for s in order], [s["host"] for s in shards])
+
+    def test_removing_a_shard_keeps_failover_order(self):
+        shards = _shards(4)
+        full = mq.shard_order("client-c", shards)
+        owner = full[0]
+        remaining = [shard for shard in shards if shard != owner]
+        # Losing the owner hands the key to the next shard on the ring
+        self.assertEqual(mq.shard_order("client-c", remaining), full[1:])
+
+    def test_keys_spread_over_shards(self):
+        shards = _shards(4)
+        owners = {
+            mq.shard_order(f"client-{idx}", shards)[0]["host"] for idx in range(200)
+        }
+        self.assertEqual(len(owners), 4)
+
+    def test_no_shards(self):
+        self.assertEqual(mq.shard_order("client-d", []), [])
+
+    def test_parse_endpoints_defaults_ports(self):
+        endpoints = mq._parse_endpoints("a, b:6000, c:6000:6001", 53000, 53001)
+        self.assertEqual(
+            [(e["host"], e["relay_port"], e["callback_port"]) for e in endpoints],
+            [("a", 53000, 53001), ("b", 6000, 53001), ("c", 6000, 6001)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
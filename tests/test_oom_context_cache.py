@@ -0,0 +1,85 @@
+"""Unit tests for the oom_context resolution cache.
+
+oom_context imports ShotGrid and Toolkit only while resolving, so the cache
+helpers run under plain Python; the module is loaded by path.
+
+Run with:
+    python3 -m unittest tests/test_oom_context_cache.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+oom_context = load_module("oom_context", "src/oom_context.py")
+
+ENV = {"OOM_PROJECT_ID": "7", "OOM_SHOT_PATH": "/mnt/RAID/Projects/p/SQ/SH"}
+
+
+class TestContextCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._env = patch.dict(
+            os.environ,
+            {"OOM_CONTEXT_CACHE_DIR": self._tmp.name, "SG_HOST": "sg.example"},
+        )
+        self._env.start()
+        os.environ.pop("OOM_CONTEXT_TTL", None)
+
+    def tearDown(self):
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        oom_context.store_cached_context("Proj", "SQ010", "SH010", ENV)
+        self.assertEqual(oom_context.load_cached_context("Proj", "SQ010", "SH010"), ENV)
+
+    def test_keyed_by_names(self):
+        oom_context.store_cached_context("Proj", "SQ010", "SH010", ENV)
+        self.assertIsNone(oom_context.load_cached_context("Proj", "SQ010", "SH020"))
+        self.assertIsNone(oom_context.load_cached_context("Proj"))
+
+    def test_keyed_by_site(self):
+        oom_context.store_cached_context("Proj", None, None, ENV)
+        with patch.dict(os.environ, {"SG_HOST": "other.example"}):
+            self.assertIsNone(oom_context.load_cached_context("Proj"))
+
+    def test_expires_after_ttl(self):
+        oom_context.store_cached_context("Proj", None, None, ENV)
+        path = oom_context._context_cache_file("Proj", None, None)
+        data = json.loads(path.read_text())
+        data["resolved_at"] = time.time() - 120
+        path.write_text(json.dumps(data))
+        with patch.dict(os.environ, {"OOM_CONTEXT_TTL": "60"}):
+            self.assertIsNone(oom_context.load_cached_context("Proj"))
+        with patch.dict(os.environ, {"OOM_CONTEXT_TTL": "600"}):
+            self.assertEqual(oom_context.load_cached_context("Proj"), ENV)
+
+    def test_zero_ttl_disables_cache(self):
+        oom_context.store_cached_context("Proj", None, None, ENV)
+        with patch.dict(os.environ, {"OOM_CONTEXT_TTL": "0"}):
+            self.assertIsNone(oom_context.load_cached_context("Proj"))
+
+    def test_corrupt_file_is_a_miss(self):
+        path = oom_context._context_cache_file("Proj", None, None)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{not json")
+        self.assertIsNone(oom_context.load_cached_context("Proj"))
+
+
+if __name__ == "__main__":
+    unittest.main()
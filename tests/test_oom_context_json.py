@@ -0,0 +1,61 @@
+"""Unit tests for oom_context's --json option parsing and output.
+
+oom_context imports ShotGrid and Toolkit only while resolving, so the option
+helpers run under plain Python; the module is loaded by path.
+
+Run with:
+    python3 -m unittest tests/test_oom_context_json.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+oom_context = load_module("oom_context", "src/oom_context.py")
+
+ENV = {"OOM_PROJECT_ID": "7", "OOM_SHOT_PATH": "/mnt/RAID/Projects/p/SQ/SH"}
+
+
+class TestJsonOutputArg(unittest.TestCase):
+    def test_absent(self):
+        self.assertEqual(
+            oom_context._json_output_arg(["prog", "Proj"]),
+            (["prog", "Proj"], False, None),
+        )
+
+    def test_stdout(self):
+        self.assertEqual(
+            oom_context._json_output_arg(["prog", "--json", "Proj"]),
+            (["prog", "Proj"], True, None),
+        )
+        self.assertEqual(
+            oom_context._json_output_arg(["prog", "--json=-", "Proj"]),
+            (["prog", "Proj"], True, None),
+        )
+
+    def test_path(self):
+        self.assertEqual(
+            oom_context._json_output_arg(["prog", "Proj", "--json=/tmp/ctx.json"]),
+            (["prog", "Proj"], True, "/tmp/ctx.json"),
+        )
+
+    def test_write_json_output_to_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "ctx.json"
+            oom_context.write_json_output({"env": ENV}, target)
+            self.assertEqual(json.loads(target.read_text()), {"env": ENV})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Unit tests for resuming restarted work items from the last written frame.
+
+resume.py is standard library only; it is loaded by path without the
+oom_scheduler package (whose __init__ imports pdg).
+
+Run with:
+    python3 -m unittest tests/test_resume.py
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import ROOT, load_module  # noqa: E402
+
+
+resume = load_module("oom_resume", "src/oom_houdini/oom_scheduler/resume.py")
+
+
+def _expand(command: str, frame=None) -> list:
+    # Let a real shell expand the default so quoting is checked too
+    env = dict(os.environ)
+    env.pop(resume.RESUME_ENV, None)
+    if frame is not None:
+        env[resume.RESUME_ENV] = str(frame)
+    out = subprocess.check_output(
+        ["sh", "-c", f"for a in {command}; do printf '%s\\n' \"$a\"; done"],
+        env=env,
+        text=True,
+    )
+    return out.splitlines()
+
+
+class TestRewriteStartFrame(unittest.TestCase):
+    def setUp(self):
+        self._env = patch.dict(os.environ, {})
+        self._env.start()
+        os.environ.pop("OOM_RESUME_START_FLAGS", None)
+
+    def tearDown(self):
+        self._env.stop()
+
+    def test_start_flag_defaults_to_original(self):
+        command = "hython /tmp/cook.py --start 1001 --end 1100 --out '/a b/x.bgeo'"
+        rewritten, changed = resume.rewrite_start_frame(command)
+        self.assertTrue(changed)
+        self.assertIn('"${OOM_RESUME_FRAME:-1001}"', rewritten)
+        self.assertEqual(_expand(rewritten), shlex.split(command))
+
+    def test_resume_frame_replaces_start(self):
+        rewritten, _ = resume.rewrite_start_frame("render -fs 1 -fe 24")
+        self.assertEqual(_expand(rewritten, 17), ["render", "-fs", "17", "-fe", "24"])
+
+    def test_non_numeric_value_is_left_alone(self):
+        command = "render --start $F --end 24"
+        self.assertEqual(resume.rewrite_start_frame(command), (command, False))
+
+    def test_no_start_flag(self):
+        command = "hython /tmp/cook.py --end 24"
+        self.assertEqual(resume.rewrite_start_frame(command), (command, False))
+
+    def test_unbalanced_quotes(self):
+        command = "hython 'unterminated --start 1"
+        self.assertEqual(resume.rewrite_start_frame(command), (command, False))
+
+    def test_custom_flags(self):
+        with patch.dict(os.environ, {"OOM_RESUME_START_FLAGS": "--first"}):
+            rewritten, changed = resume.rewrite_start_frame("sim --first 5 --start 9")
+        self.assertTrue(changed)
+        self.assertEqual(_expand(rewritten), ["sim", "--first", "5", "--start", "9"])
+        self.assertIn('"${OOM_RESUME_FRAME:-5}"', rewritten)
+
+
+class TestLastCompleteFrame(unittest.TestCase):
+    def test_frame_from_path(self):
+        self.assertEqual(resume.frame_from_path("/c/name.1.0101.bgeo.sc"), 101)
+        self.assertIsNone(resume.frame_from_path("/c/name.bgeo.sc"))
+
+    def test_stops_at_first_gap(self):
+        frames = {1: ["a"], 2: ["b"], 3: ["c"]}
+        sizes = {"a": 10, "b": 0, "c": 10}
+        with patch.object(resume.os.path, "getsize", side_effect=sizes.__getitem__):
+            self.assertEqual(resume.last_complete_frame(frames), 1)
+
+
+class TestProbe(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pdg_dir = self._tmp.name
+        self.outputs = [
+            os.path.join(self.pdg_dir, f"sim.{frame:04d}.bgeo.sc")
+            for frame in range(1, 6)
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_frames(self, count):
+        for path in self.outputs[:count]:
+            Path(path).write_bytes(b"geo")
+
+    def _probe_script(self, manifest):
+        # Plain Python with src/ on the path, as in the job wrapper
+        env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+        out = subprocess.run(
+            [sys.executable, "-", manifest],
+            input=resume.PROBE_SCRIPT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+
+    def test_first_attempt_does_not_resume(self):
+        manifest = resume.write_manifest(self.pdg_dir, "job-a", self.outputs)
+        self._write_frames(3)
+        self.assertIsNone(resume.probe(manifest))
+        self.assertEqual(resume.probe(manifest), 3)
+
+    def test_resubmit_clears_the_attempt_marker(self):
+        manifest = resume.write_manifest(self.pdg_dir, "job-a", self.outputs)
+        resume.probe(manifest)
+        self._write_frames(3)
+        # Same job name submitted again: its first pod is not a retry
+        resume.write_manifest(self.pdg_dir, "job-a", self.outputs)
+        self.assertIsNone(resume.probe(manifest))
+
+    def test_probe_script_runs_without_pdg(self):
+        manifest = resume.write_manifest(self.pdg_dir, "job-a", self.outputs)
+        self._write_frames(4)
+        self.assertEqual(self._probe_script(manifest), "")
+        self.assertEqual(self._probe_script(manifest), "4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Unit tests for the farm usage ledger (record and rollups).
+
+usage_ledger is standard library only; it is loaded by path so src/ stays
+off sys.path.
+
+Run with:
+    python3 -m unittest tests/test_usage_ledger.py
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_TESTS_DIR = str(Path(__file__).parent)
+if _TESTS_DIR not in sys.path:
+    sys.path.insert(0, _TESTS_DIR)
+
+from _loader import load_module  # noqa: E402
+
+
+usage_ledger = load_module("usage_ledger", "src/oom_houdini/usage_ledger.py")
+
+
+def _record(ledger, job_name, **overrides):
+    row = {
+        "job_name": job_name,
+        "namespace": "dcc",
+        "artist": "ana",
+        "shot": "SH010",
+        "top_node": "/obj/topnet1/sim",
+        "workload": "cpu",
+        "state": "succeeded",
+        "started_at": 1000.0,
+        "finished_at": 1000.0 + 3600.0,
+        "cpu_request": 4.0,
+        "mem_request_gib": 8.0,
+        "gpu_request": 0.0,
+        "used": {"cpu_seconds": 3600.0, "gib_seconds": 4 * 3600.0},
+    }
+    row.update(overrides)
+    ledger.record(**row)
+
+
+class TestUsageLedger(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ledger = usage_ledger.UsageLedger(Path(self._tmp.name) / "usage.sqlite")
+
+    def tearDown(self):
+        self.ledger.close()
+        self._tmp.cleanup()
+
+    def test_record_derives_requested_and_used(self):
+        _record(self.ledger, "job-a")
+        (row,) = self.ledger.jobs()
+        self.assertEqual(row["wall_seconds"], 3600.0)
+        self.assertEqual(row["cpu_seconds_requested"], 4 * 3600.0)
+        self.assertEqual(row["cpu_seconds_used"], 3600.0)
+        self.assertAlmostEqual(row["gib_hours_requested"], 8.0)
+        self.assertAlmostEqual(row["gib_hours_used"], 4.0)
+        self.assertEqual(row["gpu_hours"], 0.0)
+
+    def test_record_replaces_same_job(self):
+        _record(self.ledger, "job-a", state="failed")
+        _record(self.ledger, "job-a", state="succeeded")
+        rows = self.ledger.jobs()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["state"], "succeeded")
+
+    def test_summary_groups_and_sorts_by_waste(self):
+        _record(self.ledger, "job-a", artist="ana")
+        _record(self.ledger, "job-b", artist="ana", state="failed")
+        _record(
+            self.ledger,
+            "job-c",
+            artist="ben",
+            used={"cpu_seconds": 4 * 3600.0, "gib_seconds": 0.0},
+        )
+        rows = self.ledger.summary("artist")
+        self.assertEqual([row["name"] for row in rows], ["ana", "ben"])
+        ana, ben = rows
+        self.assertEqual(ana["jobs"], 2)
+        self.assertEqual(ana["failed"], 1)
+        self.assertAlmostEqual(ana["cpu_hours_requested"], 8.0)
+        self.assertAlmostEqual(ana["cpu_hours_wasted"], 6.0)
+        self.assertAlmostEqual(ben["cpu_hours_wasted"], 0.0)
+
+    def test_unsampled_job_has_no_usage_or_waste(self):
+        _record(self.ledger, "job-a", artist="ana", used={})
+        _record(self.ledger, "job-b", artist="ben")
+        (row,) = self.ledger.jobs(artist="ana")
+        self.assertIsNone(row["cpu_seconds_used"])
+        self.assertIsNone(row["gib_hours_used"])
+
+        ben, ana = self.ledger.summary("artist")
+        self.assertEqual((ana["name"], ana["sampled"]), ("ana", 0))
+        self.assertIsNone(ana["cpu_hours_wasted"])
+        self.assertAlmostEqual(ana["cpu_hours_requested"], 4.0)
+        self.assertAlmostEqual(ben["cpu_hours_wasted"], 3.0)
+
+    def test_waste_counts_only_sampled_jobs(self):
+        _record(self.ledger, "job-a")
+        _record(self.ledger, "job-b", used=None)
+        (row,) = self.ledger.summary("artist")
+        self.assertEqual((row["jobs"], row["sampled"]), (2, 1))
+        self.assertAlmostEqual(row["cpu_hours_wasted"], 3.0)
+
+    def test_sampler_pop_of_unseen_job_is_empty(self):
+        sampler = usage_ledger.UsageSampler(lambda: None)
+        self.assertEqual(sampler.pop("never-sampled"), {})
+
+    def test_summary_since_filters_on_finish_time(self):
+        _record(self.ledger, "old", finished_at=2000.0)
+        _record(self.ledger, "new", finished_at=9000.0)
+        rows = self.ledger.summary("shot", since=5000.0)
+        self.assertEqual(rows[0]["jobs"], 1)
+
+    def test_summary_rejects_unknown_group(self):
+        with self.assertRaises(ValueError):
+            self.ledger.summary("job_name; DROP TABLE job_usage")
+
+
+if __name__ == "__main__":
+    unittest.main()